@@ -26,6 +26,8 @@ load_dotenv()
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
+# 그래프를 메모리 복제본으로 올려 이웃/경로 탐색을 서버 왕복 없이 처리
+USE_GRAPH_MIRROR = os.getenv("PKM_GRAPH_MIRROR", "0") == "1"
 
 # 전역 인스턴스 (lazy initialization)
 _graph_db = None
@@ -36,6 +38,8 @@ def get_graph_db() -> GraphDBManager:
     global _graph_db
     if _graph_db is None:
         _graph_db = GraphDBManager(NEO4J_URI, (NEO4J_USER, NEO4J_PASSWORD))
+        if USE_GRAPH_MIRROR:
+            _graph_db.load_mirror()
     return _graph_db
 
 
@@ -44,54 +48,85 @@ mcp = FastMCP("PKM Knowledge Graph")
 
 
 @mcp.tool()
-def search_entities(query: str, limit: int = 10) -> Dict[str, Any]:
+def search_entities(query: str, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
     """
-    Knowledge Graph에서 개념(Entity)을 검색합니다.
+    Knowledge Graph에서 개념(Entity)을 검색합니다. (이름 + 별칭, 관련도순)
     
     Args:
         query: 검색할 개념 이름
         limit: 반환할 최대 결과 수 (기본값: 10)
+        offset: 건너뛸 결과 수 - 다음 페이지 조회용 (기본값: 0)
     
     Returns:
-        검색된 개념 목록 (raw data)
+        검색된 개념 목록 (raw data, score 포함)
     """
     db = get_graph_db()
-    entities = db.search_entities(query, limit=limit)
+    entities = db.search_entities(query, limit=limit, skip=offset)
     
     return {
         "query": query,
+        "offset": offset,
         "count": len(entities),
         "entities": entities
     }
 
 
 @mcp.tool()
-def get_entity_graph(entity_name: str, depth: int = 2) -> Dict[str, Any]:
+def search_notes(query: str, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+    """
+    Atomic Note를 제목과 내용으로 검색합니다. (관련도순)
+    
+    Args:
+        query: 검색어
+        limit: 반환할 최대 노트 수 (기본값: 10)
+        offset: 건너뛸 결과 수 - 다음 페이지 조회용 (기본값: 0)
+    
+    Returns:
+        검색된 노트 목록 (raw data, score 포함)
+    """
+    db = get_graph_db()
+    notes = db.search_notes(query, limit=limit, skip=offset)
+    
+    return {
+        "query": query,
+        "offset": offset,
+        "count": len(notes),
+        "notes": notes
+    }
+
+
+@mcp.tool()
+def get_entity_graph(entity_name: str, depth: int = 2, fan_out: int = 20,
+                     include_notes: bool = True) -> Dict[str, Any]:
     """
     특정 개념(Entity) 주변의 그래프를 가져옵니다.
     
     Args:
         entity_name: 조회할 개념의 이름
         depth: 탐색할 이웃 노드의 깊이 (기본값: 2)
+        fan_out: 노드마다 확장할 최대 이웃 수 - 관계 가중치가 큰 이웃 우선 (기본값: 20)
+        include_notes: 개념을 언급한 Atomic Note도 포함 (기본값: True, False면 개념 간 관계만)
     
     Returns:
-        노드와 관계 정보 (raw data)
+        노드, 관계, 인접 목록 정보 (raw data)
     """
     db = get_graph_db()
-    graph = db.get_entity_graph(entity_name, depth=depth)
+    graph = db.get_entity_graph(entity_name, depth=depth, fan_out=fan_out, include_notes=include_notes)
     
     return {
         "entity": entity_name,
         "depth": depth,
         "nodes": graph.get("nodes", []),
-        "relationships": graph.get("relationships", [])
+        "relationships": graph.get("relationships", []),
+        "adjacency": graph.get("adjacency", {}),
+        "truncated": graph.get("truncated", False)
     }
 
 
 @mcp.tool()
 def find_related_notes(entity_name: str, limit: int = 5) -> Dict[str, Any]:
     """
-    특정 개념과 관련된 Atomic Notes를 찾습니다.
+    특정 개념과 관련된 Atomic Notes를 찾습니다. (중요한 개념을 많이 다루는 노트 우선)
     
     Args:
         entity_name: 검색할 개념의 이름
@@ -103,12 +138,12 @@ def find_related_notes(entity_name: str, limit: int = 5) -> Dict[str, Any]:
     db = get_graph_db()
     
     # Cypher 쿼리로 관련 노트 찾기
-    with db.driver.session() as session:
+    with db.session() as session:
         query = """
         MATCH (n:AtomicNote)-[:MENTIONS]->(e:Entity {name: $entity_name})
         RETURN n.id as id, n.title as title, n.content as content, 
                n.domain as domain, n.confidence as confidence
-        ORDER BY n.created_at DESC
+        ORDER BY coalesce(n.importance, 0) DESC, n.created_at DESC
         LIMIT $limit
         """
         
@@ -136,30 +171,7 @@ def find_entity_path(start_entity: str, end_entity: str, max_depth: int = 5) ->
         두 개념을 연결하는 경로들 (raw data)
     """
     db = get_graph_db()
-    
-    # Cypher 쿼리로 최단 경로 찾기
-    with db.driver.session() as session:
-        query = f"""
-        MATCH path = shortestPath(
-            (start:Entity {{name: $start_entity}})-[*1..{max_depth}]-(end:Entity {{name: $end_entity}})
-        )
-        WITH path, [node in nodes(path) | node.name] as entity_names,
-             [rel in relationships(path) | type(rel)] as rel_types,
-             length(path) as path_length
-        RETURN entity_names, rel_types, path_length
-        ORDER BY path_length
-        LIMIT 5
-        """
-        
-        result = session.run(query, start_entity=start_entity, end_entity=end_entity)
-        paths = []
-        
-        for record in result:
-            paths.append({
-                "entities": record["entity_names"],
-                "relationships": record["rel_types"],
-                "length": record["path_length"]
-            })
+    paths = db.find_entity_path(start_entity, end_entity, max_depth=max_depth)
     
     return {
         "start": start_entity,
@@ -175,7 +187,7 @@ def get_graph_stats() -> Dict[str, Any]:
     Knowledge Graph의 전체 통계를 가져옵니다.
     
     Returns:
-        노드 수, 관계 수, 도메인 분포 등 통계 정보 (raw data)
+        노드 수, 관계 수, 도메인 분포, 차수 분포 등 통계 정보 (raw data)
     """
     db = get_graph_db()
     stats = db.get_graph_stats()
@@ -184,7 +196,10 @@ def get_graph_stats() -> Dict[str, Any]:
         "total_nodes": stats.get("total_nodes", 0),
         "total_relationships": stats.get("total_relationships", 0),
         "nodes_by_label": stats.get("nodes", {}),
-        "relationships_by_type": stats.get("relationships", {})
+        "relationships_by_type": stats.get("relationships", {}),
+        "entities_by_domain": stats.get("entity_domains", {}),
+        "notes_by_domain": stats.get("note_domains", {}),
+        "entity_degree": stats.get("entity_degree", {})
     }
 
 
@@ -216,7 +231,7 @@ def run_cypher_query(query: str, limit: int = 100) -> Dict[str, Any]:
             }
     
     try:
-        with db.driver.session() as session:
+        with db.session() as session:
             result = session.run(query)
             records = []
             
@@ -252,6 +267,8 @@ def run_cypher_query(query: str, limit: int = 100) -> Dict[str, Any]:
 if __name__ == "__main__":
     print("🚀 PKM Knowledge Graph MCP Server (FastMCP) 시작...", file=sys.stderr)
     print(f"   Neo4j: {NEO4J_URI}", file=sys.stderr)
+    if USE_GRAPH_MIRROR:
+        print("   그래프 메모리 복제본: 사용", file=sys.stderr)
     print("   철학: Raw Data만 제공, Reasoning은 LLM이 담당", file=sys.stderr)
     print("   준비 완료! MCP 클라이언트 연결을 기다리는 중...", file=sys.stderr)
     
@@ -6,11 +6,13 @@ Google Gemini API 사용 (신형 SDK)
 
 from google import genai
 from google.genai import types
+import hashlib
 import json
 import os
 import time
 import re
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
@@ -18,8 +20,12 @@ from dotenv import load_dotenv
 # src 폴더 내 import
 try:
     from obsidian_loader import ObsidianNote, ObsidianVaultLoader
+    from serialization import artifact_exists, load_artifact, save_artifact, save_artifact_if_changed
+    from note_ids import assign_stable_ids, source_content_hash
 except ImportError:
     from src.obsidian_loader import ObsidianNote, ObsidianVaultLoader
+    from src.serialization import artifact_exists, load_artifact, save_artifact, save_artifact_if_changed
+    from src.note_ids import assign_stable_ids, source_content_hash
 
 # .env 파일 로드 (프로젝트 루트, 환경변수 덮어쓰기)
 env_path = Path(__file__).parent.parent / '.env'
@@ -46,7 +52,7 @@ Atomic Note 원칙:
 {
   "atomic_notes": [
     {
-      "id": "note_YYYYMMDD_001",
+      "id": "note_001",
       "title": "핵심 개념",
       "content": "1-2문장 핵심 설명",
       "detailed_content": "상세 내용",
@@ -66,6 +72,11 @@ Atomic Note 원칙:
   "summary": "전체 문서 요약"
 }
 
+ID 규칙:
+- "id"는 같은 문서 안에서만 구분되는 임시 번호 (note_001, note_002, ...)
+- 최종 ID는 시스템이 원본 경로와 제목으로 다시 부여함
+- "related_notes"에는 같은 문서의 임시 ID를 사용
+
 관계 타입:
 - "relates_to": 관련됨
 - "is_example_of": ~의 예시
@@ -174,9 +185,15 @@ JSON만 출력하고 다른 설명은 포함하지 마세요."""
                 result["source_note"] = {
                     "title": note.title,
                     "file_path": note.file_path,
-                    "created_date": note.created_date.isoformat() if note.created_date else None
+                    "relative_path": note.relative_path,
+                    "created_date": note.created_date.isoformat() if note.created_date else None,
+                    "modified_date": note.modified_date.isoformat() if note.modified_date else None,
+                    "content_hash": source_content_hash(note.content),
                 }
                 
+                # 결정적 ID 부여 (LLM이 만든 ID는 원본 간 충돌하고 실행마다 바뀜)
+                assign_stable_ids(result)
+                
                 print(f"✅ 완료: {len(result.get('atomic_notes', []))}개의 Atomic Notes 생성")
                 
                 return result
@@ -252,29 +269,35 @@ JSON만 출력하고 다른 설명은 포함하지 마세요."""
             safe_title = note.title.replace(' ', '_').replace('/', '_').replace('\\', '_')
             output_file = os.path.join(output_dir, f"{safe_title}_atomic.json")
             
-            # 이미 존재하는 파일 확인
-            if skip_existing and os.path.exists(output_file):
+            # 이미 존재하는 파일 확인 (압축 형식 포함)
+            if skip_existing and artifact_exists(output_file):
                 print("♻️  이미 처리됨 - JSON 로드 중...")
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    result = json.load(f)
+                # 이전 버전 결과에도 결정적 ID 적용 (이미 적용된 경우 동일한 결과)
+                # 원본 해시/수정 시각은 결과를 만든 시점의 값을 알 수 없으므로 채우지 않음
+                result = load_artifact(output_file)
+                result.setdefault("source_note", {}).setdefault("relative_path", note.relative_path)
+                assign_stable_ids(result)
+                # 갱신된 결과를 다시 저장 → Stage 2/3이 파일에서 읽어도 같은 경로 키와 ID 사용
+                saved_path, upgraded = save_artifact_if_changed(result, output_file)
+                if upgraded:
+                    print(f"💾 이전 버전 결과 갱신: {saved_path}")
                 all_atomic_notes.append(result)
                 skipped_count += 1
                 print(f"✅ 로드 완료: {len(result.get('atomic_notes', []))}개 Atomic Notes")
-            else:
+                continue
+            
             # Atomic Notes로 분해
-                print("🔍 분석 중...")
+            print("🔍 분석 중...")
             result = self.decompose_note(note)
             
             # 결과 저장
             if result.get("atomic_notes"):
                 all_atomic_notes.append(result)
                 
-                # JSON 파일로 저장
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
-                
-                    processed_count += 1
-                print(f"💾 저장: {output_file}")
+                # JSON 파일로 저장 (serialization 레이어: 코덱/압축 설정 적용)
+                saved_path = save_artifact(result, output_file)
+                processed_count += 1
+                print(f"💾 저장: {saved_path}")
             
             # Rate Limit 방지를 위한 대기 (마지막 노트는 제외)
             if i < len(notes):
@@ -296,38 +319,38 @@ JSON만 출력하고 다른 설명은 포함하지 마세요."""
         
         return all_atomic_notes
     
-    def save_as_markdown(self, atomic_notes_result: Dict, output_dir: str = "./atomic_notes_md"):
-        """
-        Atomic Notes를 마크다운 형식으로 저장
+    def markdown_filename(self, atomic_note: Dict) -> str:
+        """Atomic Note의 마크다운 파일명"""
+        # 파일명 생성 (특수문자 제거)
+        safe_title = atomic_note['title'].replace(' ', '_')
+        # 파일시스템에서 허용되지 않는 문자 제거
+        safe_title = re.sub(r'[<>:"/\\|?*]', '', safe_title)
+        # 연속된 언더스코어 제거
+        safe_title = re.sub(r'_+', '_', safe_title)
         
-        Args:
-            atomic_notes_result: decompose_note의 결과
-            output_dir: 출력 디렉토리
+        return f"{atomic_note['id']}_{safe_title}.md"
+    
+    def render_markdown(self, atomic_note: Dict, source_title: str, created_date: str) -> str:
         """
-        os.makedirs(output_dir, exist_ok=True)
-        
-        source_title = atomic_notes_result.get("source_note", {}).get("title", "Unknown")
+        Atomic Note 1개를 마크다운으로 렌더링 (메모리에서만 수행)
         
-        for atomic_note in atomic_notes_result.get("atomic_notes", []):
-            # 파일명 생성 (특수문자 제거)
-            safe_title = atomic_note['title'].replace(' ', '_')
-            # 파일시스템에서 허용되지 않는 문자 제거
-            safe_title = re.sub(r'[<>:"/\\|?*]', '', safe_title)
-            # 연속된 언더스코어 제거
-            safe_title = re.sub(r'_+', '_', safe_title)
-            
-            filename = f"{atomic_note['id']}_{safe_title}.md"
-            filepath = os.path.join(output_dir, filename)
+        Args:
+            atomic_note: Atomic Note 데이터
+            source_title: 원본 노트 제목
+            created_date: frontmatter에 기록할 생성일 (YYYY-MM-DD)
             
-            # 마크다운 생성
-            markdown = f"""---
+        Returns:
+            마크다운 내용
+        """
+        # 마크다운 생성
+        markdown = f"""---
 type: atomic_note
 source: {source_title}
 id: {atomic_note['id']}
 domain: {atomic_note.get('domain', 'general')}
 confidence: {atomic_note.get('confidence', 'medium')}
 entities: {json.dumps(atomic_note.get('extracted_entities', []), ensure_ascii=False)}
-created_date: {datetime.now().strftime('%Y-%m-%d')}
+created_date: {created_date}
 ---
 
 # {atomic_note['title']}
@@ -343,22 +366,101 @@ created_date: {datetime.now().strftime('%Y-%m-%d')}
 
 ## 관계
 """
+        
+        # 관계 추가
+        for rel in atomic_note.get('relationships', []):
+            markdown += f"- `{rel['from']}` --[{rel['type']}]--> `{rel['to']}`\n"
+        
+        # 관련 노트
+        if atomic_note.get('related_notes'):
+            markdown += "\n## 관련 노트\n"
+            for related in atomic_note['related_notes']:
+                markdown += f"- [[{related}]]\n"
+        
+        return markdown
+    
+    def _sync_markdown_file(self, atomic_note: Dict, source_title: str,
+                            default_date: str, output_dir: str) -> Tuple[str, bool]:
+        """
+        마크다운 파일 1개를 동기화 (내용이 바뀐 경우에만 원자적으로 쓰기)
+        
+        Returns:
+            (파일명, 실제로 썼는지 여부)
+        """
+        filename = self.markdown_filename(atomic_note)
+        filepath = os.path.join(output_dir, filename)
+        
+        existing = None
+        created_date = default_date
+        if os.path.exists(filepath):
+            with open(filepath, 'rb') as f:
+                existing = f.read()
+            # 기존 파일의 생성일 유지 (재실행 시 날짜 때문에 내용이 바뀌지 않도록)
+            match = re.search(rb'^created_date: (\S+)$', existing, re.MULTILINE)
+            if match:
+                created_date = match.group(1).decode('utf-8')
+        
+        content = self.render_markdown(atomic_note, source_title, created_date).encode('utf-8')
+        
+        # 해시 비교: 변경 없으면 쓰지 않음
+        if existing is not None and hashlib.sha256(existing).digest() == hashlib.sha256(content).digest():
+            return filename, False
+        
+        # 임시 파일에 쓴 뒤 교체 (Obsidian이 반쯤 쓰인 파일을 읽지 않도록)
+        tmp_path = filepath + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, filepath)
+        return filename, True
+    
+    def save_as_markdown(self, atomic_notes_result: Dict, output_dir: str = "./atomic_notes_md",
+                         max_workers: int = 8) -> Dict[str, int]:
+        """
+        Atomic Notes를 마크다운 형식으로 저장 (증분 방식)
+        
+        내용이 바뀐 파일만 다시 쓰므로 변경 없는 재실행 시 쓰기가 발생하지 않음
+        
+        Args:
+            atomic_notes_result: decompose_note의 결과
+            output_dir: 출력 디렉토리
+            max_workers: 병렬 쓰기 스레드 수
             
-            # 관계 추가
-            for rel in atomic_note.get('relationships', []):
-                markdown += f"- `{rel['from']}` --[{rel['type']}]--> `{rel['to']}`\n"
-            
-            # 관련 노트
-            if atomic_note.get('related_notes'):
-                markdown += "\n## 관련 노트\n"
-                for related in atomic_note['related_notes']:
-                    markdown += f"- [[{related}]]\n"
-            
-            # 저장
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(markdown)
-            
-            print(f"📝 생성: {filename}")
+        Returns:
+            {"written": 쓴 파일 수, "unchanged": 변경 없어 건너뛴 파일 수}
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        
+        source_note = atomic_notes_result.get("source_note", {})
+        source_title = source_note.get("title", "Unknown")
+        
+        # 새 파일의 생성일: 원본 노트 생성일 우선, 없으면 오늘
+        source_created = source_note.get("created_date")
+        default_date = source_created[:10] if source_created else datetime.now().strftime('%Y-%m-%d')
+        
+        # 같은 파일명이 여러 번 나오면 마지막 노트가 이김 (순차 저장과 동일한 결과)
+        notes_by_file = {
+            self.markdown_filename(atomic_note): atomic_note
+            for atomic_note in atomic_notes_result.get("atomic_notes", [])
+        }
+        stats = {"written": 0, "unchanged": 0}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._sync_markdown_file, atomic_note, source_title, default_date, output_dir)
+                for atomic_note in notes_by_file.values()
+            ]
+            for future in futures:
+                filename, written = future.result()
+                if written:
+                    stats["written"] += 1
+                    print(f"📝 생성: {filename}")
+                else:
+                    stats["unchanged"] += 1
+        
+        if stats["unchanged"]:
+            print(f"♻️  변경 없음: {stats['unchanged']}개 파일 스킵")
+        
+        return stats
 
 
 # CLI 인터페이스
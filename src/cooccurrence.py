@@ -0,0 +1,159 @@
+"""
+Corpus Co-occurrence Relationship Mining
+Vault 전체에서 같은 Atomic Note에 함께 등장하는 엔티티 쌍을 찾아 가중치 관계 생성
+- 엔티티 × 노트 희소 행렬(CSR)을 만들고 X·Xᵀ 한 번으로 모든 쌍의 동시 출현 수 계산
+- PMI / NPMI 점수를 벡터 연산으로 계산 (Python 루프 없음)
+- 임계값 이상인 쌍만 co_occurs_with 관계로 출력
+
+NumPy / SciPy 필요: pip install numpy scipy
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # 선택 의존성
+    np = None
+    sparse = None
+
+RELATION_TYPE = "co_occurs_with"
+
+
+def _require_scipy():
+    if np is None or sparse is None:
+        raise ImportError("동시 출현 분석에는 NumPy/SciPy가 필요합니다: pip install numpy scipy")
+
+
+def _note_entities(atomic_note: Dict) -> List[str]:
+    """Atomic Note의 엔티티 이름 목록 (Stage 2 결과 우선)"""
+    entities = atomic_note.get("entities_enhanced", atomic_note.get("extracted_entities", []))
+    return [entity if isinstance(entity, str) else entity.get("text", "") for entity in entities]
+
+
+def build_incidence_matrix(atomic_notes_results: Iterable[Dict]) -> Tuple["sparse.csr_matrix", List[str], List[str]]:
+    """
+    엔티티 × 노트 이진 희소 행렬 생성
+
+    Args:
+        atomic_notes_results: Stage 2 결과 리스트
+
+    Returns:
+        (incidence 행렬 [엔티티 수 × 노트 수], 엔티티 이름 리스트, 노트 ID 리스트)
+    """
+    _require_scipy()
+
+    entity_index: Dict[str, int] = {}
+    note_ids: List[str] = []
+    rows: List[int] = []
+    cols: List[int] = []
+
+    for result in atomic_notes_results:
+        for atomic_note in result.get("atomic_notes", []):
+            col = len(note_ids)
+            note_ids.append(atomic_note.get("id", str(col)))
+            for name in _note_entities(atomic_note):
+                if not name:
+                    continue
+                row = entity_index.setdefault(name, len(entity_index))
+                rows.append(row)
+                cols.append(col)
+
+    data = np.ones(len(rows), dtype=np.float32)
+    incidence = sparse.csr_matrix(
+        (data, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(len(entity_index), len(note_ids)),
+    )
+    # 한 노트에 같은 엔티티가 중복되어도 1로 취급
+    incidence.sum_duplicates()
+    incidence.data[:] = 1.0
+
+    entity_names = [None] * len(entity_index)
+    for name, index in entity_index.items():
+        entity_names[index] = name
+
+    return incidence, entity_names, note_ids
+
+
+def cooccurrence_scores(incidence: "sparse.csr_matrix", min_count: int = 2) -> Dict[str, "np.ndarray"]:
+    """
+    모든 엔티티 쌍의 동시 출현 수와 PMI / NPMI 계산 (벡터 연산)
+
+    Args:
+        incidence: 엔티티 × 노트 이진 행렬
+        min_count: 최소 동시 출현 노트 수
+
+    Returns:
+        {"row", "col", "count", "pmi", "npmi"} - 같은 길이의 배열 (row < col)
+    """
+    _require_scipy()
+
+    num_notes = incidence.shape[1]
+    doc_freq = np.asarray(incidence.sum(axis=1)).ravel()
+
+    # 동시 출현 행렬 (대칭) → 위쪽 삼각형만 사용
+    cooc = sparse.triu(incidence @ incidence.T, k=1).tocoo()
+    mask = cooc.data >= min_count
+    row = cooc.row[mask]
+    col = cooc.col[mask]
+    count = cooc.data[mask].astype(np.float64)
+
+    if num_notes == 0 or count.size == 0:
+        empty = np.zeros(0)
+        return {"row": row, "col": col, "count": count, "pmi": empty, "npmi": empty}
+
+    # PMI = log( p(a,b) / (p(a) p(b)) ),  NPMI = PMI / -log p(a,b)
+    p_joint = count / num_notes
+    p_row = doc_freq[row] / num_notes
+    p_col = doc_freq[col] / num_notes
+    pmi = np.log(p_joint / (p_row * p_col))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        npmi = np.where(p_joint < 1.0, pmi / -np.log(p_joint), 1.0)
+
+    return {"row": row, "col": col, "count": count, "pmi": pmi, "npmi": npmi}
+
+
+def mine_cooccurrence_relationships(atomic_notes_results: List[Dict],
+                                    min_count: int = 2,
+                                    min_npmi: float = 0.2,
+                                    max_relationships: Optional[int] = None) -> List[Dict]:
+    """
+    Vault 전체 동시 출현 관계 추출
+
+    Args:
+        atomic_notes_results: Stage 2 결과 리스트
+        min_count: 최소 동시 출현 노트 수
+        min_npmi: 최소 NPMI (-1 ~ 1, 0 = 독립)
+        max_relationships: 최대 관계 수 (NPMI 높은 순, None이면 제한 없음)
+
+    Returns:
+        관계 리스트 ({"from", "type": "co_occurs_with", "to", "confidence", "weight", "pmi", "npmi", "method"})
+    """
+    incidence, entity_names, _ = build_incidence_matrix(atomic_notes_results)
+    scores = cooccurrence_scores(incidence, min_count=min_count)
+
+    keep = np.flatnonzero(scores["npmi"] >= min_npmi)
+    # NPMI 높은 순, 같으면 동시 출현 수 많은 순
+    order = keep[np.lexsort((-scores["count"][keep], -scores["npmi"][keep]))]
+    if max_relationships is not None:
+        order = order[:max_relationships]
+
+    rows = scores["row"][order].tolist()
+    cols = scores["col"][order].tolist()
+    counts = scores["count"][order].astype(int).tolist()
+    pmis = np.round(scores["pmi"][order], 4).tolist()
+    npmis = np.round(scores["npmi"][order], 4).tolist()
+
+    return [
+        {
+            "from": entity_names[row],
+            "type": RELATION_TYPE,
+            "to": entity_names[col],
+            "confidence": max(npmi, 0.0),
+            "weight": count,
+            "pmi": pmi,
+            "npmi": npmi,
+            "method": "cooccurrence",
+        }
+        for row, col, count, pmi, npmi in zip(rows, cols, counts, pmis, npmis)
+    ]
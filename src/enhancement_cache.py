@@ -0,0 +1,149 @@
+"""
+Incremental Entity Enhancement Cache
+Stage 2 결과를 노트 단위로 스트리밍 저장하고, 입력이 같으면 재사용
+- 입력 해시: Atomic Note 내용 해시 + 노트에 매칭된 사전 엔티티 (사전 변경도 감지)
+- Extractor 버전이 바뀌면 전체 무효화
+- JSON Lines 추가 쓰기 (노트 1개 처리할 때마다 1줄) → 중간에 중단되어도 처리한 만큼 유지
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+try:
+    from note_ids import content_hash
+    from serialization import decode_json, encode_json
+except ImportError:
+    from src.note_ids import content_hash
+    from src.serialization import decode_json, encode_json
+
+# 캐시에 저장하는 Stage 2 결과 필드
+ENHANCED_FIELDS = ("entities_enhanced", "entity_records", "relationships_enhanced", "extraction_degraded")
+
+# 캐시하지 않는 성능 저하 결과 (실행 시점의 부하에 따라 달라짐 → 다음 실행에서 다시 계산)
+# 긴 노트(text_too_long)는 입력으로 결정되므로 캐시
+TRANSIENT_DEGRADED = ("time_budget",)
+
+# 오래된 레코드 비율이 이 값을 넘으면 로드 시 파일 압축(compaction)
+COMPACT_RATIO = 0.5
+
+
+def enhancement_input_hash(atomic_note: Dict, gazetteer_matches: Iterable[str] = ()) -> str:
+    """
+    Stage 2 입력 해시 (sha256 hex)
+
+    Args:
+        atomic_note: Stage 1 Atomic Note
+        gazetteer_matches: 이 노트 본문에 매칭된 사전 엔티티 (다른 노트 변경으로 결과가 바뀌는 부분)
+    """
+    payload = {
+        "content_hash": content_hash(atomic_note),
+        "gazetteer": sorted(set(gazetteer_matches)),
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class EnhancementCache:
+    """노트 ID → Stage 2 결과 (입력 해시 + Extractor 버전 일치 시 재사용)"""
+
+    def __init__(self, path: str, version: str):
+        """
+        Args:
+            path: 캐시 파일 경로 (JSON Lines)
+            version: Extractor 버전 키 - 다르면 기존 레코드 무시
+        """
+        self.path = Path(path)
+        self.version = version
+        self._records: Dict[str, Dict] = {}
+        self._file = None
+        self.stats = {"hits": 0, "misses": 0}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _load(self):
+        """캐시 파일 로드 (같은 ID는 마지막 레코드 우선, 잘린 마지막 줄은 무시)"""
+        if not self.path.exists():
+            return
+
+        lines = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                lines += 1
+                try:
+                    record = decode_json(line)
+                except ValueError:
+                    continue
+                if record.get("version") == self.version and record.get("id"):
+                    self._records[record["id"]] = record
+
+        if lines and (lines - len(self._records)) / lines > COMPACT_RATIO:
+            self.compact()
+
+    def get(self, note_id: str, input_hash: str) -> Optional[Dict]:
+        """입력 해시가 같은 캐시 레코드 (없으면 None, 일시적 성능 저하 레코드는 재계산 대상)"""
+        record = self._records.get(note_id)
+        if (record is not None and record.get("input_hash") == input_hash
+                and record.get("extraction_degraded") not in TRANSIENT_DEGRADED):
+            self.stats["hits"] += 1
+            return record
+        self.stats["misses"] += 1
+        return None
+
+    def apply(self, atomic_note: Dict, record: Dict) -> Dict:
+        """캐시된 Stage 2 결과를 Atomic Note에 적용"""
+        for field in ENHANCED_FIELDS:
+            if record.get(field) is not None:
+                atomic_note[field] = record[field]
+            else:
+                atomic_note.pop(field, None)
+        return atomic_note
+
+    def put(self, atomic_note: Dict, input_hash: str):
+        """Stage 2 결과 1개를 캐시 파일 끝에 추가 (시간 예산 초과로 단계를 건너뛴 결과는 저장하지 않음)"""
+        if atomic_note.get("extraction_degraded") in TRANSIENT_DEGRADED:
+            return
+        record = {"id": atomic_note["id"], "version": self.version, "input_hash": input_hash}
+        for field in ENHANCED_FIELDS:
+            if atomic_note.get(field) is not None:
+                record[field] = atomic_note[field]
+        self._records[record["id"]] = record
+
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+        self._file.write(encode_json(record) + b"\n")
+        self._file.flush()
+
+    def compact(self, keep_ids: Optional[Iterable[str]] = None):
+        """
+        최신 레코드만 남기고 캐시 파일 재작성
+
+        Args:
+            keep_ids: 주어지면 이 ID들만 유지 (삭제된 노트 정리)
+        """
+        self.close()
+        if keep_ids is not None:
+            keep_ids = set(keep_ids)
+            self._records = {k: v for k, v in self._records.items() if k in keep_ids}
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            for record in self._records.values():
+                f.write(encode_json(record) + b"\n")
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "EnhancementCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
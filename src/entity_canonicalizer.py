@@ -0,0 +1,300 @@
+"""
+Entity Canonicalization
+Graph import 전에 같은 개념의 여러 표기를 하나의 대표 이름으로 병합
+- 전각/반각, 공백 정규화 (NFKC)
+- 한글 조사 제거 ("머신러닝은", "지식그래프와" → "머신러닝", "지식그래프")
+- 별칭 테이블 (영문/한글 표기 등) + 본문의 "인공지능(AI)" 형태 병기
+- Union-Find로 표기 묶음을 병합하고 대표 이름 1개 + 별칭 맵 생성
+"""
+
+import json
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from entity_records import merge_entity_records
+except ImportError:
+    from src.entity_records import merge_entity_records
+
+# 명사에 거의 붙지 않는 조사 → 무조건 제거 (긴 것부터 검사)
+SAFE_PARTICLES = sorted([
+    "에서의", "으로의", "이라는", "에서는", "에서도", "으로는", "에게서",
+    "에서", "으로", "에게", "와의", "과의", "라는", "이란", "까지", "부터", "처럼", "보다",
+    "은", "는", "을", "를",
+], key=len, reverse=True)
+
+# 명사의 마지막 글자와 겹치는 조사 (예: 국가, 결과, 민주주의) → 조사를 뗀 형태가 이미 알려진 엔티티일 때만 제거
+AMBIGUOUS_PARTICLES = ["이", "가", "의", "와", "과", "에", "로", "도", "만"]
+
+# 조사 제거 후 남아야 하는 최소 글자 수
+MIN_STEM_LENGTH = 2
+
+# "인공지능(AI)", "AI(인공지능)" 형태의 병기
+PARENTHETICAL_PATTERN = re.compile(r'([^\s()]{2,})\s*\(([^()]{2,40})\)')
+
+_HANGUL = re.compile(r'[가-힣]$')
+
+
+def normalize_name(name: str) -> str:
+    """유니코드 NFKC (전각 → 반각), 공백 정리, 양끝 문장부호 제거"""
+    name = unicodedata.normalize("NFKC", name or "")
+    name = " ".join(name.split())
+    return name.strip(" \t\"'`.,;:!?·•-_")
+
+
+def strip_particles(name: str, known: Optional[Iterable[str]] = None) -> str:
+    """
+    한글 이름 끝의 조사 제거
+
+    Args:
+        name: 정규화된 이름
+        known: 이미 알려진 이름 집합 (소문자) - 모호한 조사는 이 집합에 있을 때만 제거
+
+    Returns:
+        조사가 제거된 이름
+    """
+    known = known or ()
+    changed = True
+    while changed and _HANGUL.search(name):
+        changed = False
+        for particle in SAFE_PARTICLES:
+            stem = name[:-len(particle)]
+            if name.endswith(particle) and len(stem) >= MIN_STEM_LENGTH and _HANGUL.search(stem):
+                name = stem
+                changed = True
+                break
+        if changed:
+            continue
+        for particle in AMBIGUOUS_PARTICLES:
+            stem = name[:-len(particle)]
+            if name.endswith(particle) and len(stem) >= MIN_STEM_LENGTH and stem.lower() in known:
+                name = stem
+                changed = True
+                break
+    return name
+
+
+class EntityCanonicalizer:
+    """엔티티 표기 → 대표 이름 매핑 (Union-Find 기반)"""
+
+    def __init__(self, alias_table: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            alias_table: {대표 이름: [별칭, ...]} - 항상 같은 개념으로 묶을 표기
+        """
+        self.alias_table = alias_table or {}
+        self._counts: Counter = Counter()
+        self._first_seen: Dict[str, int] = {}
+        self._links: List[tuple] = []
+        self._canonical: Dict[str, str] = {}
+        self._aliases: Dict[str, List[str]] = {}
+        self._built = False
+
+    @classmethod
+    def from_file(cls, path: str) -> "EntityCanonicalizer":
+        """
+        JSON 별칭 테이블 파일에서 생성 (파일이 없으면 빈 테이블)
+
+        파일 형식: {"인공지능": ["AI", "Artificial Intelligence"], ...}
+        """
+        alias_path = Path(path)
+        if not alias_path.exists():
+            return cls()
+        with open(alias_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def key(name: str) -> str:
+        """비교용 키 (정규화 + 소문자, 조사 제거 전)"""
+        return normalize_name(name).lower()
+
+    def add(self, name: str, count: int = 1):
+        """표기 1개 등록 (출현 횟수 누적)"""
+        name = normalize_name(name)
+        if not name:
+            return
+        self._counts[name] += count
+        self._first_seen.setdefault(name, len(self._first_seen))
+        self._built = False
+
+    def link(self, name: str, other: str):
+        """두 표기를 같은 개념으로 지정 (예: 본문의 "인공지능(AI)" 병기)"""
+        name, other = normalize_name(name), normalize_name(other)
+        if name and other and name != other:
+            self._links.append((name, other))
+            self._built = False
+
+    def add_text(self, text: str, entities: Iterable[str]):
+        """본문에서 "A(B)" 병기 중 A와 B가 모두 엔티티인 경우 같은 개념으로 연결"""
+        keys = {self.key(entity) for entity in entities}
+        for outer, inner in PARENTHETICAL_PATTERN.findall(text or ""):
+            outer = strip_particles(normalize_name(outer), keys)
+            inner = normalize_name(inner)
+            if self.key(outer) in keys and self.key(inner) in keys:
+                self.link(outer, inner)
+
+    def build(self):
+        """Union-Find로 표기 묶음 계산 및 대표 이름 선택"""
+        names = list(self._counts)
+        known = {name.lower() for name in names}
+        for canonical, aliases in self.alias_table.items():
+            known.add(normalize_name(canonical).lower())
+            known.update(normalize_name(alias).lower() for alias in aliases)
+
+        parent: Dict[str, str] = {}
+
+        def find(node: str) -> str:
+            parent.setdefault(node, node)
+            root = node
+            while parent[root] != root:
+                root = parent[root]
+            while parent[node] != root:
+                parent[node], node = root, parent[node]
+            return root
+
+        def union(a: str, b: str):
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        def concept_key(name: str) -> str:
+            # 조사 제거 + 소문자 + 공백 제거 ("머신 러닝은" → "머신러닝")
+            return strip_particles(normalize_name(name), known).lower().replace(" ", "")
+
+        # 1. 같은 키 (대소문자, 공백, 전각/반각, 조사 차이)
+        for name in names:
+            union(name.lower(), concept_key(name))
+
+        # 2. 별칭 테이블
+        for canonical, aliases in self.alias_table.items():
+            for alias in aliases:
+                union(concept_key(canonical), concept_key(alias))
+
+        # 3. 본문 병기
+        for name, other in self._links:
+            union(concept_key(name), concept_key(other))
+
+        # 묶음별 대표 이름: 별칭 테이블의 대표 이름 > 조사 없는 표기 > 출현 횟수 > 먼저 등장
+        table_roots = {}
+        for canonical in self.alias_table:
+            table_roots.setdefault(find(concept_key(canonical)), normalize_name(canonical))
+        groups: Dict[str, List[str]] = {}
+        for name in names:
+            groups.setdefault(find(name.lower()), []).append(name)
+
+        self._canonical = {}
+        self._aliases = {}
+        for root, members in groups.items():
+            canonical = table_roots.get(root) or min(members, key=lambda m: (
+                strip_particles(m, known) != m,
+                -self._counts[m],
+                self._first_seen[m],
+            ))
+            for member in members:
+                self._canonical[member] = canonical
+            self._aliases[canonical] = sorted({m for m in members if m != canonical})
+
+        self._built = True
+
+    def canonical(self, name: str) -> str:
+        """표기에 대한 대표 이름 (등록되지 않은 표기는 정규화만 적용)"""
+        if not self._built:
+            self.build()
+        normalized = normalize_name(name)
+        return self._canonical.get(normalized, normalized)
+
+    def alias_map(self) -> Dict[str, str]:
+        """{별칭: 대표 이름} (대표 이름과 다른 표기만)"""
+        if not self._built:
+            self.build()
+        return {name: canonical for name, canonical in self._canonical.items() if name != canonical}
+
+    def aliases_of(self, canonical: str) -> List[str]:
+        """대표 이름의 별칭 목록"""
+        if not self._built:
+            self.build()
+        return self._aliases.get(canonical, [])
+
+    def canonicalize(self, names: Iterable[str]) -> List[str]:
+        """이름 목록을 대표 이름 목록으로 변환 (순서 유지, 중복 제거)"""
+        seen = set()
+        result = []
+        for name in names:
+            canonical = self.canonical(name)
+            if canonical and canonical not in seen:
+                seen.add(canonical)
+                result.append(canonical)
+        return result
+
+    # ------------------------------------------------------------------
+    # Stage 2 결과 단위 처리
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _note_entities(atomic_note: Dict) -> List[str]:
+        entities = atomic_note.get("entities_enhanced", atomic_note.get("extracted_entities", []))
+        return [entity if isinstance(entity, str) else entity.get("text", "") for entity in entities]
+
+    def fit_results(self, atomic_notes_results: Iterable[Dict]):
+        """Stage 2 결과 전체의 엔티티 표기와 병기 정보를 수집"""
+        for result in atomic_notes_results:
+            for atomic_note in result.get("atomic_notes", []):
+                entities = self._note_entities(atomic_note)
+                for entity in entities:
+                    self.add(entity)
+                for rel in atomic_note.get("relationships_enhanced", atomic_note.get("relationships", [])):
+                    self.add(rel.get("from", ""))
+                    self.add(rel.get("to", ""))
+                text = f"{atomic_note.get('content', '')} {atomic_note.get('detailed_content', '')}"
+                self.add_text(text, entities)
+        self.build()
+
+    def apply_to_note(self, atomic_note: Dict) -> Dict:
+        """
+        Atomic Note의 엔티티/관계를 대표 이름으로 변환
+
+        결과 필드:
+            entities_enhanced: 대표 이름 목록
+            entity_records: 대표 이름 기준으로 병합한 엔티티 레코드 (있는 경우)
+            relationships_enhanced: 양 끝을 대표 이름으로 바꾼 관계 (자기 자신 관계 제거)
+            entity_aliases: {대표 이름: [이 노트에 등장한 다른 표기]}
+        """
+        entities = self._note_entities(atomic_note)
+        note_aliases: Dict[str, List[str]] = {}
+        for entity in entities:
+            canonical = self.canonical(entity)
+            normalized = normalize_name(entity)
+            if canonical and normalized != canonical:
+                aliases = note_aliases.setdefault(canonical, [])
+                if normalized not in aliases:
+                    aliases.append(normalized)
+
+        atomic_note["entities_enhanced"] = self.canonicalize(entities)
+        if "entity_records" in atomic_note:
+            rename = {record["text"]: self.canonical(record["text"]) for record in atomic_note["entity_records"]}
+            atomic_note["entity_records"] = merge_entity_records(atomic_note["entity_records"], rename)
+
+        relationships = []
+        seen = set()
+        for rel in atomic_note.get("relationships_enhanced", atomic_note.get("relationships", [])):
+            from_entity = self.canonical(rel.get("from", ""))
+            to_entity = self.canonical(rel.get("to", ""))
+            triple = (from_entity, rel.get("type"), to_entity)
+            if not from_entity or not to_entity or from_entity == to_entity or triple in seen:
+                continue
+            seen.add(triple)
+            relationships.append({**rel, "from": from_entity, "to": to_entity})
+        atomic_note["relationships_enhanced"] = relationships
+        atomic_note["entity_aliases"] = note_aliases
+
+        return atomic_note
+
+    def apply_results(self, atomic_notes_results: List[Dict]) -> List[Dict]:
+        """Stage 2 결과 전체에 대표 이름 적용 (제자리 수정)"""
+        for result in atomic_notes_results:
+            for atomic_note in result.get("atomic_notes", []):
+                self.apply_to_note(atomic_note)
+        return atomic_notes_results
@@ -4,17 +4,139 @@ Gemini API 결과 + Regex 패턴 매칭 기반
 spaCy 없이 동작하는 경량 버전
 """
 
+import os
 import re
 import json
-from typing import List, Dict
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+# src 폴더 내 import
+try:
+    from entity_matcher import AhoCorasickMatcher, EntityGazetteer, Span
+    from entity_canonicalizer import normalize_name, strip_particles
+    from enhancement_cache import EnhancementCache, enhancement_input_hash
+    from entity_records import (
+        SOURCE_ACRONYM, SOURCE_GAZETTEER, SOURCE_KOREAN_NOUN, SOURCE_LLM, SOURCE_PROPER_NOUN,
+        make_entity_record,
+    )
+except ImportError:
+    from src.entity_matcher import AhoCorasickMatcher, EntityGazetteer, Span
+    from src.entity_canonicalizer import normalize_name, strip_particles
+    from src.enhancement_cache import EnhancementCache, enhancement_input_hash
+    from src.entity_records import (
+        SOURCE_ACRONYM, SOURCE_GAZETTEER, SOURCE_KOREAN_NOUN, SOURCE_LLM, SOURCE_PROPER_NOUN,
+        make_entity_record,
+    )
+
+
+# 관계 단서: (두 엔티티 사이 패턴, 두 번째 엔티티 뒤 패턴)
+# 예: "A가 B를 지지" → 사이 "가 ", 뒤 "를 지지"
+_RELATION_CUE_PATTERNS = {
+    "supports": [
+        # 한글
+        (r"(?:이|가)\s+", r"(?:을|를)\s+지지"),
+        (r"(?:은|는)\s+", r"(?:을|를)\s+옹호"),
+        # 영문
+        (r" supports? ", r""),
+    ],
+    "contradicts": [
+        (r"(?:이|가)\s+", r"(?:와|과)\s+모순"),
+        (r"(?:은|는)\s+", r"(?:와|과)\s+반대"),
+        (r" contradicts? ", r""),
+    ],
+    "is_example_of": [
+        (r"(?:은|는)\s+", r"의\s+예시"),
+        (r"(?:은|는)\s+", r"의\s+사례"),
+        (r" is an? example of ", r""),
+    ],
+    "causes": [
+        (r"(?:이|가)\s+", r"(?:을|를)\s+야기"),
+        (r"(?:은|는)\s+", r"(?:을|를)\s+초래"),
+        (r" causes? ", r""),
+    ],
+    "implements": [
+        (r"(?:이|가)\s+", r"(?:을|를)\s+구현"),
+        (r"(?:은|는)\s+", r"(?:을|를)\s+실현"),
+        (r" implements? ", r""),
+    ],
+    "uses": [
+        (r"(?:이|가)\s+", r"(?:을|를)\s+사용"),
+        (r"(?:은|는)\s+", r"(?:을|를)\s+활용"),
+        (r" uses? ", r""),
+    ],
+    "based_on": [
+        (r"(?:은|는)\s+", r"에?\s+기반"),
+        (r"(?:은|는)\s+", r"를?\s+바탕"),
+        (r" is based on ", r""),
+    ],
+}
+
+# 모듈 로드 시 한 번만 컴파일 (엔티티 이름을 패턴에 삽입하지 않으므로 재사용 가능)
+RELATION_CUES: Dict[str, List[Tuple[re.Pattern, re.Pattern]]] = {
+    relation_type: [
+        (re.compile(between, re.IGNORECASE), re.compile(after, re.IGNORECASE))
+        for between, after in cues
+    ]
+    for relation_type, cues in _RELATION_CUE_PATTERNS.items()
+}
+
+# 추가 엔티티 추출 패턴 (모듈 로드 시 한 번 컴파일 - 프로세스 풀 워커마다 1회)
+# 한글 명사 길이 상한: 띄어쓰기 없는 긴 한글 구간에서 역추적이 O(n²)이 되는 것을 방지
+MAX_KOREAN_NOUN_LENGTH = 20
+KOREAN_PARTICLES = "이가은는을를의에와과"
+
+PROPER_NOUN_PATTERN = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+KOREAN_NOUN_PATTERN = re.compile(r'([가-힣]{1,%d})[%s]' % (MAX_KOREAN_NOUN_LENGTH, KOREAN_PARTICLES))
+ACRONYM_PATTERN = re.compile(r'\b[A-Z]{2,}\b')
+
+# 성능 저하 모드(degraded)용: 토큰 단위 선형 스캔
+TOKEN_PATTERN = re.compile(r'[가-힣]+|[A-Za-z][A-Za-z0-9]*')
+
+# 성능 저하 사유 (Atomic Note의 extraction_degraded 필드 값)
+DEGRADED_TEXT_TOO_LONG = "text_too_long"
+DEGRADED_TIME_BUDGET = "time_budget"
+
+# 추출 로직(패턴, 중복 제거, 관계 규칙)이 바뀌면 올림 → 증분 캐시 전체 무효화
+EXTRACTOR_VERSION = "2"
+
+# 병렬 배치 처리 시 워커 프로세스별 Extractor (initializer에서 생성)
+_worker_extractor = None
+
+
+def _init_worker(gazetteer: Optional[EntityGazetteer] = None,
+                 time_budget: Optional[float] = 0.5, max_text_length: int = 20000):
+    """프로세스 풀 워커 초기화: Extractor 1회 생성 (사전은 워커당 1회 전달)"""
+    global _worker_extractor
+    _worker_extractor = SimpleEntityExtractor(gazetteer=gazetteer, verbose=False,
+                                              time_budget=time_budget, max_text_length=max_text_length)
+
+
+def _enhance_in_worker(atomic_note: Dict) -> Dict:
+    """워커에서 Atomic Note 1개 개선 (결과는 pickle로 부모 프로세스에 반환)"""
+    return _worker_extractor.enhance_gemini_entities(atomic_note)
 
 
 class SimpleEntityExtractor:
     """간단한 엔티티와 관계 추출기 (Gemini 결과 기반)"""
     
-    def __init__(self):
-        """초기화"""
-        print("✅ Simple Entity Extractor 초기화 완료")
+    def __init__(self, gazetteer: Optional[EntityGazetteer] = None, verbose: bool = True,
+                 time_budget: Optional[float] = 0.5, max_text_length: int = 20000):
+        """
+        Args:
+            gazetteer: Vault 전체 엔티티 사전 (있으면 다른 노트에서 나온 엔티티도 인식)
+            verbose: 초기화 메시지 출력 여부
+            time_budget: 노트당 시간 예산 (초) - 초과하면 남은 단계를 저렴한 방식으로 처리
+            max_text_length: 이보다 긴 노트는 처음부터 저렴한 방식으로 처리
+        """
+        self.gazetteer = gazetteer
+        self.time_budget = time_budget
+        self.max_text_length = max_text_length
+        self.guard_stats = self._empty_guard_stats()
+        # 결과에 영향을 주는 설정까지 포함한 캐시 버전 키
+        self.version = f"{EXTRACTOR_VERSION}:{time_budget}:{max_text_length}"
+        if verbose:
+            print("✅ Simple Entity Extractor 초기화 완료")
     
     def enhance_gemini_entities(self, atomic_note: Dict) -> Dict:
         """
@@ -34,23 +156,99 @@ class SimpleEntityExtractor:
         detailed_content = atomic_note.get("detailed_content", "")
         full_text = f"{content} {detailed_content}"
         
-        # 추가 엔티티 추출 (간단한 패턴 기반)
-        additional_entities = self._extract_additional_entities(full_text)
+        started = time.perf_counter()
+        degraded = DEGRADED_TEXT_TOO_LONG if len(full_text) > self.max_text_length else None
+        
+        # 추가 엔티티 추출 (간단한 패턴 기반, 성능 저하 모드에서는 토큰 단위 스캔)
+        if degraded:
+            additional_entities = self._extract_additional_entities_fast(full_text)
+        else:
+            additional_entities = self._extract_additional_entities(full_text)
+            if self._over_budget(started):
+                degraded = DEGRADED_TIME_BUDGET
+        
+        # Vault 전체 사전 매칭 (다른 노트에서 추출된 엔티티)
+        gazetteer_entities = self.gazetteer.match(full_text) if self.gazetteer else []
         
         # 중복 제거
-        all_entities = gemini_entities + additional_entities
+        all_entities = gemini_entities + gazetteer_entities + additional_entities
         unique_entities = self._deduplicate_entities(all_entities)
         
-        # 관계 추출
+        # 엔티티 위치 검색 + 관계 추출 (성능 저하 모드에서는 LLM/사전 엔티티만 사용 - 매칭 구간 수 축소)
         gemini_relationships = atomic_note.get("relationships", [])
-        additional_relationships = self.extract_relationships(full_text, unique_entities)
+        relation_entities = unique_entities
+        if degraded or self._over_budget(started):
+            degraded = degraded or DEGRADED_TIME_BUDGET
+            relation_entities = self._deduplicate_entities(gemini_entities + gazetteer_entities)
+        spans = AhoCorasickMatcher(relation_entities).find_longest(full_text) if relation_entities else []
+        additional_relationships = self._relationships_from_spans(full_text, spans)
         
         # 결과 저장
         atomic_note["entities_enhanced"] = unique_entities
+        atomic_note["entity_records"] = self._build_entity_records(
+            unique_entities, spans, gemini_entities, gazetteer_entities)
         atomic_note["relationships_enhanced"] = gemini_relationships + additional_relationships
         
+        # 단계를 건너뛴 경우에만 표시 (전체 경로를 끝까지 실행했으면 늦어도 결과는 같음)
+        elapsed = time.perf_counter() - started
+        if degraded:
+            atomic_note["extraction_degraded"] = degraded
+        else:
+            atomic_note.pop("extraction_degraded", None)
+        self._record_guard(atomic_note, elapsed)
+        
         return atomic_note
     
+    def input_hash(self, atomic_note: Dict) -> str:
+        """증분 처리용 입력 해시 (노트 내용 + 이 노트에 매칭되는 사전 엔티티)"""
+        if self.gazetteer is None:
+            return enhancement_input_hash(atomic_note)
+        text = f"{atomic_note.get('content', '')} {atomic_note.get('detailed_content', '')}"
+        return enhancement_input_hash(atomic_note, self.gazetteer.match(text))
+    
+    def enhance_incremental(self, atomic_note: Dict, cache: EnhancementCache) -> Tuple[Dict, bool]:
+        """
+        입력 해시와 Extractor 버전이 같으면 캐시 결과를 재사용, 아니면 개선 후 캐시에 추가
+        
+        Returns:
+            (개선된 Atomic Note, 캐시 재사용 여부)
+        """
+        input_hash = self.input_hash(atomic_note)
+        record = cache.get(atomic_note.get("id"), input_hash)
+        if record is not None:
+            return cache.apply(atomic_note, record), True
+        
+        enhanced_note = self.enhance_gemini_entities(atomic_note)
+        cache.put(enhanced_note, input_hash)
+        return enhanced_note, False
+    
+    @staticmethod
+    def _empty_guard_stats() -> Dict:
+        return {
+            "notes": 0,
+            "degraded": 0,
+            "over_budget": 0,
+            "slowest_seconds": 0.0,
+            "slowest_note": None,
+        }
+    
+    def _over_budget(self, started: float) -> bool:
+        """노트당 시간 예산 초과 여부"""
+        return self.time_budget is not None and time.perf_counter() - started > self.time_budget
+    
+    def _record_guard(self, atomic_note: Dict, elapsed: Optional[float] = None):
+        """시간 예산 카운터 갱신"""
+        stats = self.guard_stats
+        stats["notes"] += 1
+        degraded = atomic_note.get("extraction_degraded")
+        if degraded:
+            stats["degraded"] += 1
+        if degraded == DEGRADED_TIME_BUDGET:
+            stats["over_budget"] += 1
+        if elapsed is not None and elapsed > stats["slowest_seconds"]:
+            stats["slowest_seconds"] = elapsed
+            stats["slowest_note"] = atomic_note.get("id")
+    
     def _extract_additional_entities(self, text: str) -> List[str]:
         """
         간단한 패턴으로 추가 엔티티 추출
@@ -58,29 +256,94 @@ class SimpleEntityExtractor:
         entities = []
         
         # 대문자로 시작하는 단어 (고유명사 추정)
-        proper_nouns = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', text)
+        proper_nouns = PROPER_NOUN_PATTERN.findall(text)
         entities.extend(proper_nouns)
         
         # 한글 고유명사 패턴 (조사 앞의 명사)
-        korean_nouns = re.findall(r'([가-힣]+)(?:이|가|은|는|을|를|의|에|와|과)', text)
+        korean_nouns = KOREAN_NOUN_PATTERN.findall(text)
         entities.extend(korean_nouns)
         
         # 기술 용어 패턴 (대문자 약어)
-        acronyms = re.findall(r'\b[A-Z]{2,}\b', text)
+        acronyms = ACRONYM_PATTERN.findall(text)
         entities.extend(acronyms)
         
         return list(set(entities))  # 중복 제거
     
+    def _extract_additional_entities_fast(self, text: str) -> List[str]:
+        """
+        토큰 단위 선형 스캔으로 추가 엔티티 추출 (시간 예산 초과/긴 노트용 저렴한 방식)
+        
+        - 영문: 대문자로 시작하는 토큰, 대문자 약어
+        - 한글: 조사로 끝나는 토큰의 어간
+        """
+        entities = set()
+        
+        for token in TOKEN_PATTERN.findall(text):
+            if token[0].isascii():
+                if token[0].isupper() and (token.isupper() or token[1:].islower()) and len(token) >= 2:
+                    entities.add(token)
+            elif 2 <= len(token) <= MAX_KOREAN_NOUN_LENGTH + 1 and token[-1] in KOREAN_PARTICLES:
+                entities.add(token[:-1])
+        
+        return list(entities)
+    
+    def _entity_source(self, name: str, llm_keys: set, gazetteer_keys: set) -> str:
+        """엔티티 출처 판별 (LLM > 사전 > 영문 약어 > 영문 고유명사 > 한글 명사)"""
+        key = name.lower().replace(" ", "")
+        if key in llm_keys:
+            return SOURCE_LLM
+        if key in gazetteer_keys:
+            return SOURCE_GAZETTEER
+        if ACRONYM_PATTERN.fullmatch(name):
+            return SOURCE_ACRONYM
+        if name[:1].isascii():
+            return SOURCE_PROPER_NOUN
+        return SOURCE_KOREAN_NOUN
+    
+    def _build_entity_records(self, entities: List[str], spans: List[Span],
+                              gemini_entities: List[str], gazetteer_entities: List[str]) -> List[Dict]:
+        """
+        엔티티별 구조화 레코드 생성 (출처, 출현 횟수, 위치, 점수)
+        
+        Args:
+            entities: 중복 제거된 엔티티 (entities_enhanced)
+            spans: 본문 내 엔티티 위치 (관계 추출에 사용한 매칭 결과 재사용)
+            gemini_entities: LLM 추출 엔티티
+            gazetteer_entities: 사전 매칭 엔티티
+        """
+        known = {normalize_name(entity).lower() for entity in gemini_entities + gazetteer_entities}
+        
+        def keys(names: List[str]) -> set:
+            return {strip_particles(normalize_name(n), known).lower().replace(" ", "") for n in names}
+        
+        llm_keys = keys(gemini_entities)
+        gazetteer_keys = keys(gazetteer_entities)
+        
+        offsets: Dict[str, List[Tuple[int, int]]] = {}
+        for start, end, value in spans:
+            offsets.setdefault(value, []).append((start, end))
+        
+        return [
+            make_entity_record(name, self._entity_source(name, llm_keys, gazetteer_keys), offsets.get(name, ()))
+            for name in entities
+        ]
+    
     def _deduplicate_entities(self, entities: List[str]) -> List[str]:
-        """엔티티 중복 제거 (대소문자 무시)"""
+        """
+        엔티티 중복 제거 (대소문자, 띄어쓰기, 전각/반각, 조사 차이 무시)
+        
+        예: "머신러닝", "머신러닝은", "머신 러닝" 중 첫 표기만 유지 (조사는 제거)
+        """
+        known = {normalize_name(entity).lower() for entity in entities}
         seen = set()
         unique = []
         
         for entity in entities:
-            entity_lower = entity.lower()
-            if entity_lower not in seen:
-                seen.add(entity_lower)
-                unique.append(entity)
+            name = strip_particles(normalize_name(entity), known)
+            key = name.lower().replace(" ", "")
+            if name and key not in seen:
+                seen.add(key)
+                unique.append(name)
         
         return unique
     
@@ -88,6 +351,9 @@ class SimpleEntityExtractor:
         """
         엔티티 간 관계 추출 (패턴 기반)
         
+        Aho-Corasick 오토마톤으로 텍스트를 한 번만 스캔하여 엔티티 위치를 찾고,
+        인접한 두 엔티티 사이/뒤의 관계 단서(조사, 동사)만 검사
+        
         Args:
             text: 원본 텍스트
             entities: 엔티티 리스트
@@ -95,96 +361,121 @@ class SimpleEntityExtractor:
         Returns:
             관계 리스트
         """
-        relationships = []
-        
-        # 한글 관계 패턴
-        korean_patterns = {
-            "supports": [
-                r"({})(?:이|가)\s+({})(?:을|를)\s+지지",
-                r"({})(?:은|는)\s+({})(?:을|를)\s+옹호"
-            ],
-            "contradicts": [
-                r"({})(?:이|가)\s+({})(?:와|과)\s+모순",
-                r"({})(?:은|는)\s+({})(?:와|과)\s+반대"
-            ],
-            "is_example_of": [
-                r"({})(?:은|는)\s+({})의\s+예시",
-                r"({})(?:은|는)\s+({})의\s+사례"
-            ],
-            "causes": [
-                r"({})(?:이|가)\s+({})(?:을|를)\s+야기",
-                r"({})(?:은|는)\s+({})(?:을|를)\s+초래"
-            ],
-            "implements": [
-                r"({})(?:이|가)\s+({})(?:을|를)\s+구현",
-                r"({})(?:은|는)\s+({})(?:을|를)\s+실현"
-            ],
-            "uses": [
-                r"({})(?:이|가)\s+({})(?:을|를)\s+사용",
-                r"({})(?:은|는)\s+({})(?:을|를)\s+활용"
-            ],
-            "based_on": [
-                r"({})(?:은|는)\s+({})에?\s+기반",
-                r"({})(?:은|는)\s+({})를?\s+바탕"
-            ]
-        }
-        
-        # 영문 관계 패턴
-        english_patterns = {
-            "supports": [r"({}) supports? ({})"],
-            "contradicts": [r"({}) contradicts? ({})"],
-            "is_example_of": [r"({}) is an? example of ({})"],
-            "causes": [r"({}) causes? ({})"],
-            "implements": [r"({}) implements? ({})"],
-            "uses": [r"({}) uses? ({})"],
-            "based_on": [r"({}) is based on ({})"]
-        }
+        if not entities:
+            return []
         
-        # 엔티티 리스트를 regex 패턴으로 변환
-        entity_pattern = "|".join(re.escape(e) for e in entities)
+        matcher = AhoCorasickMatcher(entities)
+        return self._relationships_from_spans(text, matcher.find_longest(text))
+    
+    def _relationships_from_spans(self, text: str, spans: List[Span]) -> List[Dict]:
+        """
+        인접한 엔티티 쌍마다 관계 단서 검사
         
-        # 모든 패턴 적용
-        all_patterns = {**korean_patterns, **english_patterns}
+        Args:
+            text: 원본 텍스트
+            spans: 겹치지 않는 엔티티 위치 (start 기준 정렬)
+            
+        Returns:
+            관계 리스트
+        """
+        relationships = []
         
-        for relation_type, patterns in all_patterns.items():
-            for pattern_template in patterns:
-                # 엔티티 위치에 실제 엔티티 패턴 삽입
-                pattern = pattern_template.format(entity_pattern, entity_pattern)
-                
-                try:
-                    matches = re.finditer(pattern, text, re.IGNORECASE)
-                    for match in matches:
+        for (from_start, from_end, from_entity), (to_start, to_end, to_entity) in zip(spans, spans[1:]):
+            for relation_type, cues in RELATION_CUES.items():
+                for between, after in cues:
+                    if between.fullmatch(text, from_end, to_start) and after.match(text, to_end):
                         relationships.append({
-                            "from": match.group(1).strip(),
+                            "from": from_entity,
                             "type": relation_type,
-                            "to": match.group(2).strip(),
+                            "to": to_entity,
                             "confidence": 0.7,
                             "method": "pattern_matching"
                         })
-                except:
-                    pass  # 패턴 매칭 실패 시 무시
         
         return relationships
     
-    def process_atomic_notes_batch(self, atomic_notes_results: List[Dict]) -> List[Dict]:
+    def process_atomic_notes_batch(self, atomic_notes_results: List[Dict],
+                                   workers: Optional[int] = 1,
+                                   chunk_size: int = 64,
+                                   build_gazetteer: bool = False,
+                                   cache: Optional[EnhancementCache] = None) -> List[Dict]:
         """
         여러 Atomic Notes 배치 처리
         
         Args:
             atomic_notes_results: Gemini의 Atomic Notes 결과 리스트
+            workers: 프로세스 수 (1이면 현재 프로세스에서 순차 처리, None이면 CPU 코어 수)
+            chunk_size: 워커에 한 번에 전달할 노트 수
+            build_gazetteer: True면 배치 전체의 엔티티로 사전을 만들거나 기존 사전에 추가
+            cache: 증분 캐시 (입력이 바뀌지 않은 노트는 건너뛰고, 새 결과는 캐시에 추가)
             
         Returns:
-            개선된 Atomic Notes 리스트
+            개선된 Atomic Notes 리스트 (입력 순서 유지)
         """
-        enhanced_results = []
+        if workers is None:
+            workers = os.cpu_count() or 1
+        
+        if build_gazetteer:
+            if self.gazetteer is None:
+                self.gazetteer = EntityGazetteer()
+            for result in atomic_notes_results:
+                for note in result.get("atomic_notes", []):
+                    self.gazetteer.add_from_note(note)
+        
+        all_notes = [
+            note
+            for result in atomic_notes_results
+            for note in result.get("atomic_notes", [])
+        ]
+        
+        # 증분 처리: 캐시가 유효한 노트는 바로 적용하고 나머지만 개선
+        enhanced_notes = list(all_notes)
+        pending = list(range(len(all_notes)))
+        input_hashes = {}
+        if cache is not None:
+            pending = []
+            for index, note in enumerate(all_notes):
+                input_hash = self.input_hash(note)
+                record = cache.get(note.get("id"), input_hash)
+                if record is not None:
+                    cache.apply(note, record)
+                else:
+                    input_hashes[index] = input_hash
+                    pending.append(index)
+        pending_notes = [all_notes[index] for index in pending]
         
+        use_pool = workers > 1 and len(pending_notes) > chunk_size
+        executor = None
+        if use_pool:
+            # 프로세스 풀: 청크 단위 전달, map은 입력 순서대로 결과 반환
+            initargs = (self.gazetteer, self.time_budget, self.max_text_length)
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=initargs)
+            results = executor.map(_enhance_in_worker, pending_notes, chunksize=chunk_size)
+        else:
+            # 순차 처리 (노트를 제자리에서 개선)
+            results = (self.enhance_gemini_entities(note) for note in pending_notes)
+        
+        try:
+            # 완료되는 대로 캐시에 스트리밍 기록
+            for index, note in zip(pending, results):
+                enhanced_notes[index] = note
+                if use_pool:
+                    # 워커의 카운터는 부모로 돌아오지 않으므로 결과 필드로 집계
+                    self._record_guard(note)
+                if cache is not None:
+                    cache.put(note, input_hashes[index])
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        # 결과를 원래 위치에 다시 배치
+        enhanced_results = []
+        position = 0
         for result in atomic_notes_results:
-            atomic_notes = result.get("atomic_notes", [])
-            
-            for note in atomic_notes:
-                enhanced_note = self.enhance_gemini_entities(note)
-                
-            result["atomic_notes"] = atomic_notes
+            count = len(result.get("atomic_notes", []))
+            result["atomic_notes"] = enhanced_notes[position:position + count]
+            position += count
             enhanced_results.append(result)
         
         return enhanced_results
@@ -0,0 +1,258 @@
+"""
+Aho-Corasick Entity Matcher
+여러 엔티티 이름을 텍스트에서 한 번의 스캔으로 모두 찾는 다중 패턴 오토마톤
+- 엔티티 수와 무관하게 텍스트 길이에 선형 (거대한 regex alternation 대체)
+- 대소문자 무시 매칭, 매칭 결과는 원문 위치(offset) 기준
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (start, end, value) - text[start:end]가 value에 해당하는 엔티티
+Span = Tuple[int, int, str]
+
+
+class AhoCorasickMatcher:
+    """다중 패턴 문자열 매칭 오토마톤"""
+
+    def __init__(self, patterns: Optional[Iterable[str]] = None, case_insensitive: bool = True):
+        """
+        Args:
+            patterns: 초기 패턴 (엔티티 이름) 목록
+            case_insensitive: 대소문자 무시 여부
+        """
+        self.case_insensitive = case_insensitive
+        # 트라이: 노드별 전이 테이블, 종료 패턴 (길이, 값), 실패 링크, 병합된 출력
+        self._goto: List[Dict[str, int]] = [{}]
+        self._terminal: List[Optional[Tuple[int, str]]] = [None]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]
+        self._patterns: Dict[str, str] = {}
+        self._built = True
+
+        for pattern in patterns or []:
+            self.add(pattern)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def __contains__(self, pattern: str) -> bool:
+        return self._fold(pattern) in self._patterns
+
+    def _fold(self, text: str) -> str:
+        return text.lower() if self.case_insensitive else text
+
+    def get(self, pattern: str) -> Optional[str]:
+        """패턴에 연결된 값 (없으면 None)"""
+        return self._patterns.get(self._fold(pattern.strip()))
+
+    def add(self, pattern: str, value: Optional[str] = None):
+        """
+        패턴 추가 (다음 검색 시 실패 링크를 자동으로 다시 계산)
+
+        Args:
+            pattern: 찾을 문자열
+            value: 매칭 시 반환할 값 (기본값: pattern 그대로 - 별칭 → 대표 이름 매핑에 사용)
+        """
+        pattern = pattern.strip()
+        if not pattern:
+            return
+
+        key = self._fold(pattern)
+        if key in self._patterns:
+            return
+        self._patterns[key] = value if value is not None else pattern
+
+        node = 0
+        for char in key:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._terminal.append(None)
+            node = next_node
+        self._terminal[node] = (len(key), self._patterns[key])
+        self._built = False
+
+    def build(self):
+        """실패 링크 계산 (BFS) 및 출력 병합"""
+        self._fail = [0] * len(self._goto)
+        self._output = [[terminal] if terminal else [] for terminal in self._terminal]
+
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                if self._output[self._fail[child]]:
+                    self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+        self._built = True
+
+    def _prepare_text(self, text: str) -> str:
+        """오프셋이 원문과 일치하도록 대소문자 변환"""
+        if not self.case_insensitive:
+            return text
+        folded = text.lower()
+        if len(folded) == len(text):
+            return folded
+        # 길이가 바뀌는 특수 문자(예: 'İ')는 변환하지 않음
+        return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+    def find_all(self, text: str) -> List[Span]:
+        """
+        텍스트에서 모든 패턴 출현 위치 찾기 (겹침 포함)
+
+        Returns:
+            (start, end, value) 리스트 - end 기준 오름차순
+        """
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        spans = []
+        node = 0
+
+        for index, char in enumerate(self._prepare_text(text)):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                end = index + 1
+                for length, value in output[node]:
+                    spans.append((end - length, end, value))
+
+        return spans
+
+    def find_longest(self, text: str) -> List[Span]:
+        """
+        겹치지 않는 매칭만 반환 (가장 왼쪽 + 가장 긴 매칭 우선)
+
+        Returns:
+            (start, end, value) 리스트 - start 기준 오름차순
+        """
+        return _longest_spans(self.find_all(text))
+
+
+def _longest_spans(spans: List[Span]) -> List[Span]:
+    """겹치지 않는 매칭만 선택 (가장 왼쪽 + 가장 긴 매칭 우선)"""
+    selected = []
+    last_end = 0
+    for span in sorted(spans, key=lambda s: (s[0], -(s[1] - s[0]))):
+        if span[0] >= last_end:
+            selected.append(span)
+            last_end = span[1]
+    return selected
+
+
+def _is_ascii_word_char(char: str) -> bool:
+    return char.isascii() and (char.isalnum() or char == "_")
+
+
+class EntityGazetteer:
+    """
+    Vault 전체 엔티티 사전 (대표 이름 + 별칭)
+    한 번 만들어 두고 노트마다 선형 시간으로 매칭 → 노트 A에서 나온 엔티티를 노트 B에서도 인식
+    """
+
+    def __init__(self, min_length: int = 2):
+        """
+        Args:
+            min_length: 사전에 넣을 최소 이름 길이 (너무 짧은 이름은 오탐이 많음)
+        """
+        self.min_length = min_length
+        self.matcher = AhoCorasickMatcher()
+        self.aliases: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.aliases)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.matcher
+
+    def add(self, name: str, aliases: Iterable[str] = ()):
+        """
+        엔티티 추가 (이미 만든 사전에 점진적으로 추가 가능)
+
+        Args:
+            name: 대표 이름
+            aliases: 같은 개념의 다른 표기
+        """
+        name = name.strip()
+        if len(name) < self.min_length:
+            return
+
+        if name not in self.matcher:
+            self.matcher.add(name)
+            self.aliases.setdefault(name, [])
+
+        # 별칭은 매칭 시 대표 이름으로 반환
+        canonical = self.matcher.get(name)
+        for alias in aliases:
+            alias = alias.strip()
+            if len(alias) >= self.min_length and alias not in self.matcher:
+                self.matcher.add(alias, value=canonical)
+                self.aliases.setdefault(canonical, []).append(alias)
+
+    def add_from_note(self, atomic_note: Dict):
+        """Atomic Note의 LLM 추출 엔티티를 사전에 추가"""
+        for entity in atomic_note.get("extracted_entities", []):
+            if isinstance(entity, str):
+                self.add(entity)
+
+    @classmethod
+    def from_results(cls, atomic_notes_results: Iterable[Dict], min_length: int = 2) -> "EntityGazetteer":
+        """
+        Stage 1 결과 전체에서 사전 생성
+
+        Args:
+            atomic_notes_results: decompose_vault 결과 리스트
+            min_length: 최소 이름 길이
+        """
+        gazetteer = cls(min_length=min_length)
+        for result in atomic_notes_results:
+            for atomic_note in result.get("atomic_notes", []):
+                gazetteer.add_from_note(atomic_note)
+        return gazetteer
+
+    def find(self, text: str) -> List[Span]:
+        """
+        텍스트에서 사전 엔티티 위치 찾기 (겹치지 않는 가장 긴 매칭)
+
+        영문 이름은 단어 중간 매칭을 제외 (예: "AI"가 "MAIL"에 매칭되지 않도록).
+        한글은 조사가 붙으므로 경계 검사를 하지 않음.
+
+        Returns:
+            (start, end, 대표 이름) 리스트
+        """
+        # 경계 검사를 먼저 해야 긴 매칭이 제외될 때 같은 위치의 짧은 매칭이 남음
+        spans = []
+        for start, end, value in self.matcher.find_all(text):
+            if start > 0 and _is_ascii_word_char(text[start]) and _is_ascii_word_char(text[start - 1]):
+                continue
+            if end < len(text) and _is_ascii_word_char(text[end - 1]) and _is_ascii_word_char(text[end]):
+                continue
+            spans.append((start, end, value))
+        return _longest_spans(spans)
+
+    def match(self, text: str) -> List[str]:
+        """텍스트에 등장하는 대표 이름 목록 (등장 순서, 중복 제거)"""
+        seen = set()
+        names = []
+        for _, _, value in self.find(text):
+            if value not in seen:
+                seen.add(value)
+                names.append(value)
+        return names
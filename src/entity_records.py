@@ -0,0 +1,116 @@
+"""
+Entity Records
+Stage 2 엔티티별 구조화 레코드 (대표 이름, 타입, 출처, 출현 횟수, 위치, 점수)
+- Graph import에서 점수가 낮은 엔티티(패턴 매칭 잡음)를 걸러내는 기준
+- 레코드 형식: {"text", "label", "source", "mentions", "offsets": [[start, end], ...], "confidence"}
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 엔티티 출처
+SOURCE_LLM = "llm"
+SOURCE_GAZETTEER = "gazetteer"
+SOURCE_ACRONYM = "acronym"
+SOURCE_PROPER_NOUN = "proper_noun"
+SOURCE_KOREAN_NOUN = "korean_noun"
+
+# 여러 출처에서 나온 경우 앞쪽 출처를 대표로 사용
+SOURCE_PRIORITY = (SOURCE_LLM, SOURCE_GAZETTEER, SOURCE_ACRONYM, SOURCE_PROPER_NOUN, SOURCE_KOREAN_NOUN)
+
+# 출처별 기본 점수 (LLM/사전 엔티티 > 영문 패턴 > 조사 앞 한글 명사)
+SOURCE_SCORES = {
+    SOURCE_LLM: 1.0,
+    SOURCE_GAZETTEER: 0.9,
+    SOURCE_ACRONYM: 0.6,
+    SOURCE_PROPER_NOUN: 0.5,
+    SOURCE_KOREAN_NOUN: 0.3,
+}
+
+# 출처별 엔티티 타입
+SOURCE_LABELS = {
+    SOURCE_ACRONYM: "ACRONYM",
+    SOURCE_PROPER_NOUN: "PROPER_NOUN",
+}
+DEFAULT_LABEL = "CONCEPT"
+
+# 반복 출현 1회당 가산점
+MENTION_BONUS = 0.1
+
+# 레코드에 저장하는 최대 위치 수 (출현 횟수는 전체 기준)
+MAX_OFFSETS = 10
+
+# Graph import 기본 최소 점수
+DEFAULT_MIN_SCORE = 0.5
+
+
+def entity_score(source: str, mentions: int) -> float:
+    """출처 기본 점수 + 반복 출현 가산점 (최대 1.0)"""
+    score = SOURCE_SCORES.get(source, 0.0) + MENTION_BONUS * max(mentions - 1, 0)
+    return round(min(score, 1.0), 3)
+
+
+def make_entity_record(name: str, source: str, offsets: Iterable[Tuple[int, int]] = (),
+                       mentions: Optional[int] = None) -> Dict:
+    """
+    엔티티 레코드 생성
+
+    Args:
+        name: 대표 이름
+        source: 출처 (SOURCE_*)
+        offsets: 본문 내 위치 (start, end) - 본문은 "content detailed_content"
+        mentions: 출현 횟수 (None이면 위치 수, 최소 1)
+    """
+    offsets = [list(offset) for offset in offsets]
+    if mentions is None:
+        mentions = len(offsets)
+    mentions = max(mentions, 1)
+    return {
+        "text": name,
+        "label": SOURCE_LABELS.get(source, DEFAULT_LABEL),
+        "source": source,
+        "mentions": mentions,
+        "offsets": offsets[:MAX_OFFSETS],
+        "confidence": entity_score(source, mentions),
+    }
+
+
+def merge_entity_records(records: Iterable[Dict], rename: Optional[Dict[str, str]] = None) -> List[Dict]:
+    """
+    같은 이름의 레코드 병합 (출현 횟수 합산, 위치 합집합, 우선순위 높은 출처 사용)
+
+    Args:
+        records: 엔티티 레코드 목록
+        rename: {이름: 대표 이름} - 병합 전에 적용 (Entity 정규화 결과)
+
+    Returns:
+        병합된 레코드 목록 (처음 등장한 순서 유지)
+    """
+    rename = rename or {}
+    merged: Dict[str, Dict] = {}
+
+    for record in records:
+        name = rename.get(record["text"], record["text"])
+        if not name:
+            continue
+        current = merged.get(name)
+        if current is None:
+            merged[name] = {**record, "text": name, "offsets": [list(o) for o in record.get("offsets", [])]}
+            continue
+
+        current["mentions"] += record.get("mentions", 1)
+        offsets = {tuple(o) for o in current["offsets"]} | {tuple(o) for o in record.get("offsets", [])}
+        current["offsets"] = [list(o) for o in sorted(offsets)]
+        if SOURCE_PRIORITY.index(record["source"]) < SOURCE_PRIORITY.index(current["source"]):
+            current["source"] = record["source"]
+            current["label"] = record["label"]
+
+    for record in merged.values():
+        record["offsets"] = record["offsets"][:MAX_OFFSETS]
+        record["confidence"] = entity_score(record["source"], record["mentions"])
+
+    return list(merged.values())
+
+
+def filter_entity_records(records: Iterable[Dict], min_score: float = DEFAULT_MIN_SCORE) -> List[Dict]:
+    """점수가 min_score 이상인 레코드만 반환"""
+    return [record for record in records if record.get("confidence", 1.0) >= min_score]
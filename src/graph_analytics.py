@@ -0,0 +1,208 @@
+"""
+Graph Analytics
+엔티티 그래프 오프라인 분석 (NumPy/SciPy 희소 행렬) → 노드 속성으로 일괄 기록
+- pagerank / importance: 관계 weight 기반 PageRank (importance = 최댓값 기준 0~1 정규화)
+- degree: 엔티티 간 관계 수 (방향 무시)
+- community: 라벨 전파(label propagation) 커뮤니티 번호 (0 = 가장 큰 커뮤니티)
+- note_count: 엔티티를 언급한 Atomic Note 수
+- AtomicNote.importance: 노트가 언급한 엔티티 importance 평균
+
+검색/이웃 탐색/관련 노트 쿼리는 이 값으로 정렬만 하고 쿼리 시점에는 계산하지 않음
+import가 끝난 뒤 1번 실행 (tests/test_graph_analytics.py)
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+try:
+    from graph_mirror import ENTITY, NOTE, GraphMirror
+except ImportError:
+    from src.graph_mirror import ENTITY, NOTE, GraphMirror
+
+DAMPING = 0.85
+PAGERANK_MAX_ITER = 100
+PAGERANK_TOL = 1e-6
+LABEL_PROPAGATION_MAX_ITER = 20
+LABEL_PROPAGATION_SEED = 0
+
+
+def pagerank(adjacency: sparse.csr_matrix, damping: float = DAMPING,
+             max_iter: int = PAGERANK_MAX_ITER, tol: float = PAGERANK_TOL) -> np.ndarray:
+    """
+    가중 PageRank (거듭제곱법, 나가는 관계가 없는 노드의 점수는 전체에 균등 분배)
+
+    Args:
+        adjacency: (n, n) 가중 인접 행렬 (행 = 시작 노드)
+
+    Returns:
+        합이 1인 점수 배열
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+
+    out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inverse = np.divide(1.0, out_weight, out=np.zeros_like(out_weight, dtype=float), where=~dangling)
+    # 열 = 시작 노드인 전이 행렬 (rank를 곱하면 들어오는 점수 합)
+    transition = (sparse.diags(inverse) @ adjacency).T.tocsr()
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        updated = damping * (transition @ rank + rank[dangling].sum() / n) + (1 - damping) / n
+        converged = np.abs(updated - rank).sum() < tol
+        rank = updated
+        if converged:
+            break
+    return rank
+
+
+def label_propagation(adjacency: sparse.csr_matrix, max_iter: int = LABEL_PROPAGATION_MAX_ITER,
+                      seed: int = LABEL_PROPAGATION_SEED) -> np.ndarray:
+    """
+    라벨 전파 커뮤니티 (비동기식, 고정된 무작위 순서로 노드를 1개씩 갱신)
+
+    각 노드는 이웃 라벨 중 관계 weight 합이 가장 큰 라벨을 채택하고, 같은 라운드의 뒤 노드는
+    이미 바뀐 라벨을 봄. 모든 노드를 한꺼번에 갱신하는 동기식은 이분 구조(경로, 스타)에서 라벨이
+    번갈아 뒤집혀 이웃끼리 갈라지므로 사용하지 않음. 현재 라벨이 최대 동점이면 유지하고, 아니면
+    동점 중 가장 작은 라벨 (seed가 같으면 결과가 같음, 고립 노드는 자기 커뮤니티)
+
+    Args:
+        adjacency: (n, n) 대칭 가중 인접 행렬
+        seed: 갱신 순서 난수 시드
+
+    Returns:
+        커뮤니티 번호 배열 (크기가 큰 순서로 0, 1, 2, ...)
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    adjacency = adjacency.tocsr()
+    indptr = adjacency.indptr.tolist()
+    indices = adjacency.indices.tolist()
+    data = adjacency.data.tolist()
+    order = np.random.default_rng(seed).permutation(n).tolist()
+    labels = list(range(n))
+
+    for _ in range(max_iter):
+        changed = False
+        for node in order:
+            scores: Dict[int, float] = {}
+            for position in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[position]
+                if neighbor != node:
+                    label = labels[neighbor]
+                    scores[label] = scores.get(label, 0.0) + data[position]
+            if not scores:
+                continue
+            best = max(scores.values())
+            if scores.get(labels[node], 0.0) >= best:
+                continue
+            labels[node] = min(label for label, score in scores.items() if score >= best)
+            changed = True
+        if not changed:
+            break
+    labels = np.asarray(labels)
+
+    _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    community = np.empty_like(order)
+    community[order] = np.arange(len(order))
+    return community[inverse]
+
+
+def compute_analytics(mirror: GraphMirror) -> Dict[str, List[Dict]]:
+    """
+    복제본의 엔티티 그래프 분석
+
+    Returns:
+        {"entities": [{"name", "pagerank", "importance", "degree", "community", "note_count"}],
+         "notes": [{"id", "importance"}]}
+    """
+    src, dst, types, weights = mirror.edge_arrays()
+    kinds = np.asarray(mirror.kinds, dtype=np.int8)
+
+    entity_nodes = np.nonzero(kinds == ENTITY)[0]
+    note_nodes = np.nonzero(kinds == NOTE)[0]
+    position = np.full(mirror.num_nodes, -1, dtype=np.int64)
+    position[entity_nodes] = np.arange(len(entity_nodes))
+    position[note_nodes] = np.arange(len(note_nodes))
+    num_entities = len(entity_nodes)
+
+    # 엔티티 간 관계 (자기 자신으로의 관계 제외, 같은 쌍의 여러 타입은 weight 합)
+    relations = (types != 0) & (src != dst)
+    rel_src, rel_dst = position[src[relations]], position[dst[relations]]
+    adjacency = sparse.csr_matrix(
+        (weights[relations].astype(float), (rel_src, rel_dst)), shape=(num_entities, num_entities))
+
+    rank = pagerank(adjacency)
+    importance = rank / rank.max() if num_entities and rank.max() > 0 else rank
+    degree = np.bincount(np.concatenate([rel_src, rel_dst]), minlength=num_entities)
+    community = label_propagation((adjacency + adjacency.T).tocsr())
+
+    # 노트 → 엔티티 MENTIONS
+    mentions = types == 0
+    mention_notes, mention_entities = position[src[mentions]], position[dst[mentions]]
+    note_count = np.bincount(mention_entities, minlength=num_entities)
+    note_entities = sparse.csr_matrix(
+        (np.ones(len(mention_notes)), (mention_notes, mention_entities)),
+        shape=(len(note_nodes), num_entities))
+    mentioned = np.asarray(note_entities.sum(axis=1)).ravel()
+    note_importance = np.divide(note_entities @ importance, mentioned,
+                                out=np.zeros(len(note_nodes)), where=mentioned > 0)
+
+    keys = mirror.keys
+    return {
+        "entities": [
+            {
+                "name": keys[node],
+                "pagerank": float(rank[index]),
+                "importance": float(importance[index]),
+                "degree": int(degree[index]),
+                "community": int(community[index]),
+                "note_count": int(note_count[index]),
+            }
+            for index, node in enumerate(entity_nodes.tolist())
+        ],
+        "notes": [
+            {"id": keys[node], "importance": float(note_importance[index])}
+            for index, node in enumerate(note_nodes.tolist())
+        ],
+    }
+
+
+def run_analytics(graph, mirror: Optional[GraphMirror] = None) -> Dict:
+    """
+    분석 실행 후 Neo4j에 일괄 기록
+
+    Args:
+        graph: GraphDBManager
+        mirror: 사용할 복제본 (없으면 최신 상태로 확인한 graph.mirror, 그것도 없으면 Neo4j에서 로드)
+
+    Returns:
+        {"entities", "notes": 기록한 행 수, "communities": 커뮤니티 수, "seconds": 단계별 시간}
+    """
+    seconds = {}
+
+    start = time.perf_counter()
+    mirror = mirror or graph.current_mirror() or GraphMirror.from_neo4j(graph)
+    seconds["load"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    analytics = compute_analytics(mirror)
+    seconds["compute"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    written = graph.write_analytics(analytics["entities"], analytics["notes"])
+    seconds["write"] = round(time.perf_counter() - start, 3)
+
+    return {
+        **written,
+        "communities": len({row["community"] for row in analytics["entities"]}),
+        "seconds": seconds,
+        "top_entities": sorted(analytics["entities"], key=lambda row: -row["pagerank"])[:10],
+    }
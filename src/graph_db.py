@@ -4,24 +4,652 @@ Atomic Notes와 Entity를 Knowledge Graph로 변환
 """
 
 from neo4j import GraphDatabase
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import json
+import re
+import time
 import uuid
+import zlib
+
+try:
+    from graph_import import aggregate_relationships
+    from graph_schema import (CONSTRAINTS, ENTITY_SEARCH_INDEX, FULLTEXT_INDEXES, GRAPH_META_LABEL, INDEXES,
+                              LEGACY_INDEXES, NOTE_SEARCH_INDEX, RELATIONSHIP_TYPES, relationship_type)
+    from note_ids import stable_entity_id
+except ImportError:
+    from src.graph_import import aggregate_relationships
+    from src.graph_schema import (CONSTRAINTS, ENTITY_SEARCH_INDEX, FULLTEXT_INDEXES, GRAPH_META_LABEL, INDEXES,
+                                  LEGACY_INDEXES, NOTE_SEARCH_INDEX, RELATIONSHIP_TYPES, relationship_type)
+    from src.note_ids import stable_entity_id
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from graph_mirror import GraphMirror
+
+# 배치 import 시 트랜잭션 1개에 담는 행 수
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _batches(rows: List[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    """행 목록을 batch_size 단위로 분할"""
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+def _partition(rows: List[Dict], key: str, partitions: int) -> List[List[Dict]]:
+    """key 값의 해시로 행을 partitions개로 분할 (같은 key는 항상 같은 번호의 파티션, 빈 파티션 포함)"""
+    buckets: List[List[Dict]] = [[] for _ in range(partitions)]
+    for row in rows:
+        buckets[zlib.crc32(row[key].encode("utf-8")) % partitions].append(row)
+    return buckets
+
+
+# 업서트 쿼리: 모두 `UNWIND $rows` 단일 MERGE 문 (항목별 메서드는 1행, 배치 메서드는 N행 전달)
+# 확인 후 생성/수정하는 2단계 왕복이 없고, 유니크 제약조건과 함께 동시 실행에도 안전
+
+# content_hash가 같으면 속성 쓰기 생략 (멱등 재import)
+NOTE_UPSERT_QUERY = """
+UNWIND $rows AS row
+MERGE (n:AtomicNote {id: row.id})
+ON CREATE SET n.created_at = timestamp()
+WITH n, row,
+     (row.content_hash IS NULL OR n.content_hash IS NULL OR n.content_hash <> row.content_hash) AS changed
+FOREACH (_ IN CASE WHEN changed THEN [1] ELSE [] END |
+    SET n.title = row.title,
+        n.content = row.content,
+        n.detailed_content = row.detailed_content,
+        n.domain = row.domain,
+        n.confidence = row.confidence,
+        n.source_note = row.source_note,
+        n.content_hash = row.content_hash,
+        n.updated_at = timestamp()
+)
+// 출처 연결은 content_hash와 무관하게 보장 (이전 버전에서 import한 노트도 재import 시 연결)
+// ID는 소문자 경로로 만들므로 대소문자만 바뀐 경로는 같은 노트 → 다른 경로로 가는 기존 연결 삭제
+// 이전 버전은 출처를 엔티티 관계 타입과 같은 DERIVED_FROM으로 연결했으므로 함께 삭제 (FROM_SOURCE로 교체)
+WITH n, row
+CALL {
+    WITH n, row
+    OPTIONAL MATCH (n)-[old:FROM_SOURCE|DERIVED_FROM]->(other:SourceNote)
+    WHERE row.source_path IS NOT NULL AND (type(old) = "DERIVED_FROM" OR other.path <> row.source_path)
+    WITH collect(old) AS stale
+    FOREACH (r IN stale | DELETE r)
+}
+FOREACH (_ IN CASE WHEN row.source_path IS NULL THEN [] ELSE [1] END |
+    MERGE (s:SourceNote {path: row.source_path})
+    MERGE (n)-[:FROM_SOURCE]->(s)
+)
+RETURN n.id AS id
+"""
+
+# 원본 노트(출처) - 경로가 MERGE 키 (source_note_path_unique)
+SOURCE_UPSERT_QUERY = """
+UNWIND $rows AS row
+MERGE (s:SourceNote {path: row.path})
+ON CREATE SET s.created_at = timestamp()
+SET s.title = row.title,
+    s.content_hash = row.content_hash,
+    s.mtime = row.mtime,
+    s.import_hash = row.import_hash,
+    s.updated_at = timestamp()
+"""
+
+# 별칭은 기존 값과 합집합
+ENTITY_UPSERT_QUERY = """
+UNWIND $rows AS row
+MERGE (e:Entity {name: row.name})
+ON CREATE SET e.id = row.id,
+              e.aliases = row.aliases,
+              e.created_at = timestamp()
+ON MATCH SET e.aliases = reduce(acc = [], a IN coalesce(e.aliases, []) + row.aliases |
+                                CASE WHEN a IN acc THEN acc ELSE acc + a END)
+SET e.label = row.label,
+    e.domain = row.domain,
+    e.confidence = row.confidence,
+    e.updated_at = timestamp()
+RETURN e.id AS id
+"""
+
+MENTION_UPSERT_QUERY = """
+UNWIND $rows AS row
+MATCH (n:AtomicNote {id: row.note_id})
+MATCH (e:Entity {name: row.entity})
+MERGE (n)-[r:MENTIONS]->(e)
+ON CREATE SET r.created_at = timestamp()
+"""
+
+
+def _build_relationship_upsert_query(rel_type: str) -> str:
+    return f"""
+    UNWIND $rows AS row
+    MATCH (from:Entity {{name: row.from}})
+    MATCH (to:Entity {{name: row.to}})
+    MERGE (from)-[r:{rel_type}]->(to)
+    ON CREATE SET r.created_at = timestamp()
+    SET r.confidence = row.confidence,
+        r.method = row.method,
+        r.weight = row.weight,
+        r.support = row.support,
+        r.original_type = row.original_type,
+        r.updated_at = timestamp()
+    """
+
+
+# 관계 타입은 파라미터로 전달할 수 없으므로 화이트리스트 타입별로 쿼리 1개를 미리 만들어 둠
+# (쿼리 문자열 수가 고정 → 서버 쿼리 플랜 캐시 재사용)
+RELATIONSHIP_UPSERT_QUERIES = {rel_type: _build_relationship_upsert_query(rel_type) for rel_type in RELATIONSHIP_TYPES}
+
+
+def _relationship_upsert_query(rel_type: str) -> str:
+    """관계 타입별 업서트 쿼리 (화이트리스트에 없는 타입은 RELATES_TO)"""
+    return RELATIONSHIP_UPSERT_QUERIES[relationship_type(rel_type)]
+
+
+def _note_row(note_data: Dict) -> Dict:
+    return {
+        "id": note_data.get("id") or str(uuid.uuid4()),
+        "title": note_data.get("title", ""),
+        "content": note_data.get("content", ""),
+        "detailed_content": note_data.get("detailed_content", ""),
+        "domain": note_data.get("domain", "general"),
+        "confidence": note_data.get("confidence", "medium"),
+        "source_note": note_data.get("source_note", ""),
+        "source_path": note_data.get("source_path"),
+        "content_hash": note_data.get("content_hash"),
+    }
+
+
+def _graph_mirror_class():
+    """GraphMirror 클래스 (NumPy는 선택 의존성 - 없으면 None)"""
+    try:
+        from graph_mirror import GraphMirror
+    except ImportError:
+        try:
+            from src.graph_mirror import GraphMirror
+        except ImportError:
+            return None
+    return GraphMirror
+
+
+def _folder_prefix(folder: str) -> str:
+    """폴더 경로 → SourceNote.path 접두어 ("AI" → "AI/", 다른 폴더 "AI2/" 제외, 빈 값은 전체)"""
+    folder = (folder or "").replace("\\", "/").strip("/")
+    return f"{folder}/" if folder else ""
+
+
+def _source_row(source: Dict) -> Dict:
+    return {
+        "path": source["path"],
+        "title": source.get("title", ""),
+        "content_hash": source.get("content_hash"),
+        "mtime": source.get("mtime"),
+        "import_hash": source.get("import_hash"),
+    }
+
+
+def _entity_row(name: str, entity_data: Dict) -> Dict:
+    return {
+        # 이름 기반 결정적 ID (Neo4j 구버전 호환, bulk export와 동일) - 새로 만들 때만 사용
+        "id": stable_entity_id(name),
+        "name": name,
+        "label": entity_data.get("label", "CONCEPT"),
+        "domain": entity_data.get("domain", "general"),
+        "confidence": entity_data.get("confidence", 1.0),
+        "aliases": entity_data.get("aliases", []),
+    }
+
+
+def _relationship_row(rel: Dict) -> Dict:
+    return {
+        "from": rel["from"],
+        "to": rel["to"],
+        "confidence": rel.get("confidence", 0.7),
+        "method": rel.get("method", "extracted"),
+        "weight": rel.get("weight", 1),
+        "support": rel.get("support", 1),
+        "original_type": rel.get("original_type"),
+    }
+
+
+def _group_relationships(relationships: Iterable[Dict]) -> Dict[str, List[Dict]]:
+    """같은 (from, 타입, to)를 병합한 뒤 타입별 행 목록으로 분류"""
+    by_type: Dict[str, List[Dict]] = {}
+    for rel in aggregate_relationships(relationships):
+        by_type.setdefault(rel["type"], []).append(_relationship_row(rel))
+    return by_type
+
+
+# 엔티티 그래프 탐색: 노드당 이웃 수 상한 / 결과 노드 수 상한
+DEFAULT_FAN_OUT = 20
+DEFAULT_MAX_NODES = 200
+
+ENTITY_ROOT_QUERY = """
+MATCH (e:Entity {name: $name})
+RETURN e.id AS id, e.name AS name, e.label AS label, e.domain AS domain,
+       e.importance AS importance, e.community AS community, COUNT { (e)--() } AS degree
+"""
+
+# BFS 한 단계: frontier 엔티티마다 가중치(관계 weight 합) → importance → degree(graph_analytics가 기록한
+# 속성) 순으로 이웃 fan_out개만 확장
+# - 순위는 e의 관계와 이웃 노드 속성만으로 계산 (이웃마다 하위 그래프를 세지 않음)
+# - LIMIT 뒤에 남은 fan_out개 이웃에 대해서만 관계 목록을 모으고 차수(노드 차수 조회)를 계산
+# 허브 엔티티 1개의 비용은 그 노드의 관계 수 1번 읽기 (가변 길이 경로를 펼치지 않음)
+ENTITY_NEIGHBORS_QUERY = """
+UNWIND $names AS name
+MATCH (e:Entity {name: name})
+CALL {
+    WITH e
+    MATCH (e)-[r]-(n:Entity)
+    WHERE n <> e
+    WITH n, sum(coalesce(r.weight, 1)) AS weight
+    ORDER BY weight DESC, coalesce(n.importance, 0) DESC, coalesce(n.degree, 0) DESC, n.name
+    LIMIT $fan_out
+    RETURN n, weight
+}
+CALL {
+    WITH e, n
+    MATCH (e)-[r]-(n)
+    RETURN collect(r) AS rels
+}
+RETURN e.name AS source, n.id AS id, n.name AS name, n.label AS label, n.domain AS domain,
+       n.importance AS importance, n.community AS community,
+       COUNT { (n)--() } AS degree, weight,
+       [r IN rels | {type: type(r), outgoing: startNode(r) = e,
+                     weight: coalesce(r.weight, 1), confidence: r.confidence}] AS rels
+"""
+
+# 엔티티마다 언급한 노트 상위 fan_out개 (importance → 최신 순) + 전체 언급 수 (생략 여부 판단)
+ENTITY_NOTES_QUERY = """
+UNWIND $names AS name
+MATCH (e:Entity {name: name})
+WITH e, COUNT { (:AtomicNote)-[:MENTIONS]->(e) } AS mentions
+CALL {
+    WITH e
+    MATCH (n:AtomicNote)-[:MENTIONS]->(e)
+    RETURN n
+    ORDER BY coalesce(n.importance, 0) DESC, n.created_at DESC
+    LIMIT $fan_out
+}
+RETURN e.name AS entity, mentions, n.id AS id, n.title AS title, n.content AS content,
+       n.domain AS domain, n.importance AS importance
+"""
+
+
+# Lucene 쿼리 구문에서 특수한 의미가 있는 문자 (사용자 입력은 리터럴로 검색)
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+
+# 전체 텍스트 점수 상위 $window개를 importance(graph_analytics)로 보정해 다시 정렬한 뒤 페이지 선택
+# (window는 페이지 끝의 몇 배로 고정 → 같은 검색어의 페이지 간 순서가 일관됨)
+SEARCH_RERANK_FACTOR = 3
+
+ENTITY_SEARCH_QUERY = f"""
+CALL db.index.fulltext.queryNodes('{ENTITY_SEARCH_INDEX}', $search_query, {{limit: $window}})
+YIELD node, score
+WITH node, score * (1 + coalesce(node.importance, 0)) AS score
+ORDER BY score DESC
+SKIP $skip
+LIMIT $limit
+RETURN node, score
+"""
+
+NOTE_SEARCH_QUERY = f"""
+CALL db.index.fulltext.queryNodes('{NOTE_SEARCH_INDEX}', $search_query, {{skip: $skip, limit: $limit}})
+YIELD node, score
+RETURN node.id AS id, node.title AS title, node.content AS content, node.domain AS domain,
+       node.source_note AS source_note, score
+"""
+
+
+# import 세대 번호: import가 끝날 때마다 1 증가 → 통계 캐시 무효화 (다른 프로세스의 import도 감지)
+GENERATION_QUERY = f"""
+MATCH (m:{GRAPH_META_LABEL} {{key: 'graph'}})
+RETURN m.generation AS generation
+"""
+
+GENERATION_BUMP_QUERY = f"""
+MERGE (m:{GRAPH_META_LABEL} {{key: 'graph'}})
+SET m.generation = coalesce(m.generation, 0) + 1,
+    m.updated_at = timestamp()
+RETURN m.generation AS generation
+"""
+
+# 통계: 라벨/관계 타입별 개수는 count store에서 바로 읽음 (전체 스캔 없음)
+# 라벨/타입은 파라미터로 전달할 수 없으므로 db.labels()/db.relationshipTypes() 결과를 쿼리에 넣음
+LABELS_QUERY = "CALL db.labels() YIELD label RETURN label"
+RELATIONSHIP_TYPES_QUERY = "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType"
+
+# import마다 1번만 계산하는 집계 (노드 수에 비례하지만 관계는 펼치지 않음 - 차수는 degree store)
+DOMAIN_COUNTS_QUERY = """
+MATCH (n:{label})
+RETURN coalesce(n.domain, 'unknown') AS domain, count(*) AS count
+ORDER BY count DESC
+"""
+
+ENTITY_DEGREE_QUERY = """
+MATCH (e:Entity)
+WITH COUNT { (e)--() } AS degree
+RETURN percentileDisc(degree, 0.5) AS p50,
+       percentileDisc(degree, 0.9) AS p90,
+       percentileDisc(degree, 0.99) AS p99,
+       max(degree) AS max,
+       avg(degree) AS avg
+"""
+
+
+def _escape_name(name: str) -> str:
+    """라벨/관계 타입 이름을 Cypher 식별자로 (백틱 이스케이프)"""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def fulltext_query(text: str) -> str:
+    """
+    사용자 검색어 → Lucene 쿼리 (특수문자 이스케이프, 토큰 OR 결합)
+
+    영문/숫자 토큰은 접두어 검색도 포함 (예: "neo" → neo4j). 한글은 cjk 분석기의 2-gram이
+    부분 일치를 처리하므로 그대로 사용 (와일드카드는 분석되지 않아 2-gram과 맞지 않음)
+    """
+    terms = []
+    for token in text.split():
+        escaped = _LUCENE_SPECIAL.sub(r"\\\1", token)
+        if token.isascii() and token.isalnum():
+            # 소문자로 바꿔 AND/OR/NOT이 연산자로 해석되지 않게 함 (인덱스도 소문자 토큰,
+            # 분석되지 않는 접두어 검색도 대소문자 무관하게 일치)
+            escaped = escaped.lower()
+            terms.append(f"({escaped} OR {escaped}*)")
+        else:
+            terms.append(escaped)
+    return " ".join(terms)
+
+
+ENTITY_NEXT_HOP_QUERY = """
+UNWIND $names AS name
+MATCH (:Entity {name: name})--(n:Entity)
+RETURN DISTINCT n.name AS name
+"""
+
+
+# 일괄 삭제: 내부 트랜잭션당 행 수 / 쿼리 1번(진행 상황 출력 1번)에 처리할 내부 트랜잭션 수
+DEFAULT_DELETE_BATCH_SIZE = 10000
+DELETE_CHUNK_BATCHES = 10
+
+COUNT_RELATIONSHIPS_QUERY = "MATCH ()-[r]->() RETURN count(r) AS count"
+COUNT_NODES_QUERY = f"MATCH (n) WHERE NOT n:{GRAPH_META_LABEL} RETURN count(n) AS count"
+
+CLEAR_RELATIONSHIPS_QUERY = """
+MATCH ()-[r]->()
+WITH r LIMIT $chunk_size
+CALL { WITH r DELETE r } IN TRANSACTIONS OF $batch_size ROWS
+RETURN count(*) AS deleted
+"""
+
+CLEAR_NODES_QUERY = f"""
+MATCH (n) WHERE NOT n:{GRAPH_META_LABEL}
+WITH n LIMIT $chunk_size
+CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF $batch_size ROWS
+RETURN count(*) AS deleted
+"""
+
+# 원본 노트 단위 조회/삭제 - SourceNote 경로 인덱스에서 FROM_SOURCE를 따라감 (노트 전체 스캔 없음)
+SOURCE_NOTE_IDS_QUERY = """
+MATCH (:SourceNote {path: $path})<-[:FROM_SOURCE]-(n:AtomicNote)
+RETURN n.id AS id
+"""
+
+SOURCE_NOTE_ENTITIES_QUERY = """
+MATCH (:SourceNote {path: $path})<-[:FROM_SOURCE]-(:AtomicNote)-[:MENTIONS]->(e:Entity)
+RETURN DISTINCT e.name AS name
+"""
+
+SOURCE_DELETE_QUERY = """
+UNWIND $rows AS row
+MATCH (s:SourceNote {path: row.path})
+DETACH DELETE s
+"""
+
+# import_hash가 같은 원본 경로 (재import 시 건너뛸 원본)
+UNCHANGED_SOURCES_QUERY = """
+UNWIND $rows AS row
+MATCH (s:SourceNote {path: row.path})
+WHERE s.import_hash = row.import_hash
+RETURN s.path AS path
+"""
+
+# 경로 접두어(폴더)로 원본 노트 목록 - 경로 인덱스의 범위 조회 (빈 접두어면 전체)
+SOURCES_QUERY = """
+MATCH (s:SourceNote)
+WHERE s.path STARTS WITH $prefix
+RETURN s.path AS path, s.title AS title, s.mtime AS mtime, s.content_hash AS content_hash,
+       COUNT { (s)<-[:FROM_SOURCE]-(:AtomicNote) } AS notes
+ORDER BY s.path
+"""
+
+SOURCE_ATOMIC_NOTES_QUERY = """
+MATCH (s:SourceNote {path: $path})<-[:FROM_SOURCE]-(n:AtomicNote)
+RETURN s.path AS source_path, n.id AS id, n.title AS title, n.content AS content, n.domain AS domain
+ORDER BY n.title
+"""
+
+FOLDER_ATOMIC_NOTES_QUERY = """
+MATCH (s:SourceNote)
+WHERE s.path STARTS WITH $prefix
+MATCH (s)<-[:FROM_SOURCE]-(n:AtomicNote)
+RETURN s.path AS source_path, n.id AS id, n.title AS title, n.content AS content, n.domain AS domain
+ORDER BY s.path, n.title
+"""
+
+# 한쪽 끝이라도 언급하는 노트가 없는 관계 삭제 → 삭제 수와 반대쪽 엔티티 이름
+UNREFERENCED_RELATIONSHIPS_DELETE_QUERY = """
+UNWIND $rows AS row
+MATCH (e:Entity {name: row.name})-[r]-(other:Entity)
+WHERE NOT (e)<-[:MENTIONS]-(:AtomicNote) OR NOT (other)<-[:MENTIONS]-(:AtomicNote)
+WITH collect(DISTINCT r) AS rels, collect(DISTINCT other.name) AS others
+FOREACH (r IN rels | DELETE r)
+RETURN size(rels) AS deleted, others
+"""
+
+# 노트 언급도 관계도 없는 엔티티 삭제
+ORPHAN_ENTITIES_DELETE_QUERY = """
+UNWIND $rows AS row
+MATCH (e:Entity {name: row.name})
+WHERE NOT (e)--()
+DELETE e
+RETURN count(e) AS deleted
+"""
+
+# 동기화(graph_sync)용 현재 상태 조회 - fetch_size 단위 스트리밍
+STATE_NOTES_QUERY = """
+MATCH (n:AtomicNote)
+OPTIONAL MATCH (n)-[:FROM_SOURCE]->(s:SourceNote)
+RETURN n.id AS id, n.source_note AS source_note, s.path AS source_path, n.content_hash AS content_hash
+"""
+
+STATE_SOURCES_QUERY = """
+MATCH (s:SourceNote)
+RETURN s.path AS path, s.title AS title, s.content_hash AS content_hash, s.mtime AS mtime,
+       s.import_hash AS import_hash
+"""
+
+STATE_ENTITIES_QUERY = """
+MATCH (e:Entity)
+RETURN e.name AS name, e.label AS label, e.domain AS domain, e.confidence AS confidence, e.aliases AS aliases
+"""
+
+STATE_MENTIONS_QUERY = """
+MATCH (n:AtomicNote)-[:MENTIONS]->(e:Entity)
+RETURN n.id AS note_id, e.name AS entity
+"""
+
+STATE_RELATIONSHIPS_QUERY = """
+MATCH (a:Entity)-[r]->(b:Entity)
+RETURN a.name AS from, type(r) AS type, b.name AS to,
+       r.weight AS weight, r.support AS support, r.confidence AS confidence, r.method AS method
+"""
+
+# 삭제 쿼리 (`UNWIND $rows` 배치)
+NOTE_DELETE_QUERY = """
+UNWIND $rows AS row
+MATCH (n:AtomicNote {id: row.id})
+DETACH DELETE n
+"""
+
+ENTITY_DELETE_QUERY = """
+UNWIND $rows AS row
+MATCH (e:Entity {name: row.name})
+DETACH DELETE e
+"""
+
+MENTION_DELETE_QUERY = """
+UNWIND $rows AS row
+MATCH (:AtomicNote {id: row.note_id})-[r:MENTIONS]->(:Entity {name: row.entity})
+DELETE r
+"""
+
+
+def _relationship_delete_query(rel_type: str) -> str:
+    """관계 삭제 쿼리 (그래프에 있는 타입 그대로 - 화이트리스트 이전에 만든 타입 포함)"""
+    return f"""
+    UNWIND $rows AS row
+    MATCH (:Entity {{name: row.from}})-[r:{_escape_name(rel_type)}]->(:Entity {{name: row.to}})
+    DELETE r
+    """
+
+
+# graph_analytics 결과 기록
+ENTITY_ANALYTICS_QUERY = """
+UNWIND $rows AS row
+MATCH (e:Entity {name: row.name})
+SET e.pagerank = row.pagerank,
+    e.importance = row.importance,
+    e.degree = row.degree,
+    e.community = row.community,
+    e.note_count = row.note_count,
+    e.analytics_updated_at = timestamp()
+"""
+
+NOTE_ANALYTICS_QUERY = """
+UNWIND $rows AS row
+MATCH (n:AtomicNote {id: row.id})
+SET n.importance = row.importance
+"""
+
+
+def _phase_report(rows: int, seconds: float) -> Dict:
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds) if seconds > 0 else 0,
+    }
+
+
+class GraphUnitOfWork:
+    """
+    세션 1개를 유지하며 쓰기 작업을 모아 관리형 트랜잭션(execute_write)으로 커밋하는 작업 단위
+    
+    - 항목별 쓰기를 버퍼에 모았다가 batch_size마다 쿼리 종류별 UNWIND 1회로 전송
+    - 커밋 순서는 의존 순서 고정: 노트 → 엔티티 → MENTIONS → 관계
+    - 일시적 오류(교착 상태, 리더 변경 등)는 드라이버가 트랜잭션 전체를 재시도
+    - 쓰기는 지연되므로 create_* 메서드는 ID를 반환하지 않음
+    """
+    
+    def __init__(self, session, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.session = session
+        self.batch_size = batch_size
+        self.written = 0
+        self._pending: Dict[str, List[Dict]] = {}
+        self._pending_count = 0
+    
+    def _add(self, query: str, row: Dict):
+        self._pending.setdefault(query, []).append(row)
+        self._pending_count += 1
+        if self._pending_count >= self.batch_size:
+            self.flush()
+    
+    def create_atomic_note_node(self, note_data: Dict):
+        self._add(NOTE_UPSERT_QUERY, _note_row(note_data))
+    
+    def create_entity_node(self, entity: str, entity_data: Optional[Dict] = None):
+        self._add(ENTITY_UPSERT_QUERY, _entity_row(entity, entity_data or {}))
+    
+    def link_note_to_entity(self, note_id: str, entity: str):
+        self._add(MENTION_UPSERT_QUERY, {"note_id": note_id, "entity": entity})
+    
+    def create_relationship(self, from_entity: str, rel_type: str,
+                            to_entity: str, confidence: float = 0.7,
+                            metadata: Optional[Dict] = None):
+        for rel in aggregate_relationships([{
+            "from": from_entity,
+            "type": rel_type,
+            "to": to_entity,
+            "confidence": confidence,
+            "method": (metadata or {}).get("method", "extracted"),
+        }]):
+            self._add(_relationship_upsert_query(rel["type"]), _relationship_row(rel))
+    
+    def flush(self) -> int:
+        """버퍼의 쓰기를 트랜잭션 1개로 커밋 (재시도 시 같은 작업 전체를 다시 실행)"""
+        if not self._pending:
+            return 0
+        
+        order = [NOTE_UPSERT_QUERY, ENTITY_UPSERT_QUERY, MENTION_UPSERT_QUERY]
+        groups = [(query, self._pending[query]) for query in order if query in self._pending]
+        groups += [(query, rows) for query, rows in self._pending.items() if query not in order]
+        
+        def work(tx):
+            for query, rows in groups:
+                tx.run(query, rows=rows).consume()
+        
+        self.session.execute_write(work)
+        count = self._pending_count
+        self.written += count
+        self._pending = {}
+        self._pending_count = 0
+        return count
+
 
 class GraphDBManager:
     """Neo4j Graph Database 관리 클래스"""
     
     def __init__(self, uri: str = "bolt://localhost:7687", 
-                 auth: tuple = ("neo4j", "password")):
+                 auth: tuple = ("neo4j", "password"),
+                 database: Optional[str] = None,
+                 max_connection_pool_size: int = 100,
+                 connection_acquisition_timeout: float = 60.0,
+                 max_transaction_retry_time: float = 30.0,
+                 fetch_size: int = 1000,
+                 mirror_check_interval: float = 30.0):
         """
         Args:
             uri: Neo4j 서버 주소
             auth: (username, password) 튜플
+            database: 사용할 데이터베이스 (None이면 서버 기본값)
+            max_connection_pool_size: 연결 풀 최대 크기 (병렬 import 워커 수 이상)
+            connection_acquisition_timeout: 풀에서 연결을 얻기까지 최대 대기 시간 (초)
+            max_transaction_retry_time: 관리형 트랜잭션의 일시적 오류 재시도 시간 (초)
+            fetch_size: 세션이 한 번에 가져오는 레코드 수
+            mirror_check_interval: 메모리 복제본(load_mirror) 사용 시 import 세대 번호 확인 간격 (초)
         """
+        self._session_config = {"fetch_size": fetch_size}
+        # 통계 캐시: ((import 세대, 로컬 쓰기 세대), 통계)
+        self._write_generation = 0
+        self._stats_cache: Optional[Tuple[Tuple[int, int], Dict]] = None
+        # 메모리 복제본 (load_mirror 후 탐색 메서드가 사용)
+        self.mirror: Optional["GraphMirror"] = None
+        self.mirror_check_interval = mirror_check_interval
+        self._mirror_checked_at = 0.0
+        # 복제본에 반영된 로컬 쓰기 세대 (항목별 쓰기로 복제본이 뒤처졌는지 확인)
+        self._mirror_write_generation = 0
+        if database:
+            self._session_config["database"] = database
+        
         try:
-            self.driver = GraphDatabase.driver(uri, auth=auth)
+            self.driver = GraphDatabase.driver(
+                uri, auth=auth,
+                max_connection_pool_size=max_connection_pool_size,
+                connection_acquisition_timeout=connection_acquisition_timeout,
+                max_transaction_retry_time=max_transaction_retry_time,
+            )
             # 연결 테스트
             self.driver.verify_connectivity()
             print(f"✅ Neo4j 연결 성공: {uri}")
@@ -43,30 +671,74 @@ class GraphDBManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
     
+    def session(self, **config):
+        """생성자 설정(database, fetch_size)을 적용한 세션"""
+        return self.driver.session(**{**self._session_config, **config})
+    
+    @contextmanager
+    def unit_of_work(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[GraphUnitOfWork]:
+        """
+        세션 1개 + 관리형 쓰기 트랜잭션으로 여러 작업을 묶어 실행
+        
+        with graph.unit_of_work() as uow:
+            uow.create_atomic_note_node(note)
+            uow.create_entity_node("AI")
+            uow.link_note_to_entity(note["id"], "AI")
+        
+        블록이 정상 종료되면 남은 작업을 커밋, 예외가 발생하면 아직 커밋되지 않은 작업은 버림
+        (이미 batch_size마다 커밋된 작업은 유지)
+        """
+        with self.session() as session:
+            uow = GraphUnitOfWork(session, batch_size)
+            try:
+                yield uow
+                uow.flush()
+            finally:
+                self._invalidate_stats()
+    
+    def _write(self, query: str, rows: List[Dict]) -> List:
+        """관리형 쓰기 트랜잭션 1개로 `UNWIND $rows` 쿼리 실행 (일시적 오류 재시도)"""
+        self._invalidate_stats()
+        with self.session() as session:
+            return session.execute_write(lambda tx: list(tx.run(query, rows=rows)))
+    
+    def _invalidate_stats(self):
+        """이 프로세스의 쓰기 → 다음 get_graph_stats에서 통계 재계산"""
+        self._write_generation += 1
+    
+    def import_generation(self) -> int:
+        """현재 import 세대 번호 (import가 한 번도 끝나지 않았으면 0)"""
+        with self.session() as session:
+            record = session.run(GENERATION_QUERY).single()
+            return record["generation"] if record else 0
+    
+    def bump_generation(self) -> int:
+        """
+        import 세대 번호 1 증가 (import/삭제 작업이 끝난 뒤 1번 호출)
+        
+        get_graph_stats 캐시는 세대 번호가 바뀌면 무효화됨 - MCP 서버 등 다른 프로세스 포함
+        
+        Returns:
+            새 세대 번호
+        """
+        self._invalidate_stats()
+        with self.session() as session:
+            return session.execute_write(lambda tx: tx.run(GENERATION_BUMP_QUERY).single()["generation"])
+    
     def create_schema(self):
         """Graph DB 스키마 생성 (인덱스 및 제약조건)"""
         print("🔧 스키마 생성 중...")
         
-        with self.driver.session() as session:
-            # Neo4j 5.x 구문 (FOR ... REQUIRE)
-            constraints = [
-                # Entity 노드 유니크 제약조건
-                "CREATE CONSTRAINT entity_id_unique IF NOT EXISTS FOR (e:Entity) REQUIRE e.id IS UNIQUE",
-                # AtomicNote 노드 유니크 제약조건
-                "CREATE CONSTRAINT note_id_unique IF NOT EXISTS FOR (n:AtomicNote) REQUIRE n.id IS UNIQUE",
-            ]
-            
-            indexes = [
-                # Entity 이름 인덱스 (검색 최적화)
-                "CREATE INDEX entity_name_idx IF NOT EXISTS FOR (e:Entity) ON (e.name)",
-                # AtomicNote 제목 인덱스
-                "CREATE INDEX note_title_idx IF NOT EXISTS FOR (n:AtomicNote) ON (n.title)",
-                # 도메인 인덱스
-                "CREATE INDEX entity_domain_idx IF NOT EXISTS FOR (e:Entity) ON (e.domain)",
-            ]
+        with self.session() as session:
+            # 이전 버전 인덱스 정리 (같은 속성의 유니크 제약조건과 충돌)
+            for query in LEGACY_INDEXES:
+                try:
+                    session.run(query)
+                except Exception as e:
+                    print(f"⚠️  기존 인덱스 삭제 스킵: {e}")
             
             # 제약조건 생성
-            for query in constraints:
+            for query in CONSTRAINTS:
                 try:
                     session.run(query)
                 except Exception as e:
@@ -75,8 +747,8 @@ class GraphDBManager:
                     if "already exists" not in error_msg and "equivalent" not in error_msg:
                         print(f"⚠️  제약조건 생성 스킵: {e}")
             
-            # 인덱스 생성
-            for query in indexes:
+            # 인덱스 생성 (b-tree + 전체 텍스트)
+            for query in INDEXES + FULLTEXT_INDEXES:
                 try:
                     session.run(query)
                 except Exception as e:
@@ -86,155 +758,128 @@ class GraphDBManager:
         
         print("✅ 스키마 생성 완료")
     
-    def clear_all(self):
-        """모든 노드와 관계 삭제 (주의!)"""
+    def clear_all(self, batch_size: int = DEFAULT_DELETE_BATCH_SIZE):
+        """
+        모든 노드와 관계 삭제 (주의!)
+        
+        관계 → 노드 순서로 `CALL { ... } IN TRANSACTIONS` 배치 삭제 (트랜잭션 1개로 전체를 지우면
+        큰 그래프에서 서버 힙이 부족해짐). 관계를 먼저 지우므로 허브 노드를 지우는 트랜잭션도 작음
+        
+        Args:
+            batch_size: 내부 트랜잭션당 삭제 행 수
+        """
         print("⚠️  모든 데이터 삭제 중...")
-        with self.driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+        with self.session() as session:
+            total = session.run(COUNT_RELATIONSHIPS_QUERY).single()["count"]
+            self._delete_in_chunks(session, CLEAR_RELATIONSHIPS_QUERY, "관계", total, batch_size)
+            
+            # 메타데이터 노드는 유지 (세대 번호가 처음으로 돌아가면 다른 프로세스의 통계 캐시가 갱신되지 않음)
+            total = session.run(COUNT_NODES_QUERY).single()["count"]
+            self._delete_in_chunks(session, CLEAR_NODES_QUERY, "노드", total, batch_size)
+        
+        self.bump_generation()
+        if self.mirror is not None:
+            self.load_mirror()
         print("✅ 데이터 삭제 완료")
     
+    def _delete_in_chunks(self, session, query: str, kind: str, total: int, batch_size: int) -> int:
+        """
+        삭제 쿼리를 batch_size * DELETE_CHUNK_BATCHES 행씩 반복 실행 (청크마다 진행 상황 출력)
+        
+        쿼리 안에서는 `IN TRANSACTIONS OF $batch_size ROWS`로 batch_size마다 커밋
+        (자동 커밋 트랜잭션이어야 하므로 execute_write가 아닌 session.run)
+        """
+        deleted = 0
+        chunk_size = batch_size * DELETE_CHUNK_BATCHES
+        while True:
+            count = session.run(query, chunk_size=chunk_size, batch_size=batch_size).single()["deleted"]
+            if count == 0:
+                break
+            deleted += count
+            print(f"   🗑️  {kind} {deleted:,}/{max(total, deleted):,} 삭제")
+        return deleted
+    
+    def delete_source_note(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+        """
+        원본 노트 1개에서 나온 하위 그래프 삭제 (트랜잭션마다 최대 batch_size 행)
+        
+        1. 원본의 Atomic Note와 SourceNote 삭제 (MENTIONS/FROM_SOURCE 포함)
+        2. 그 노트들이 언급하던 엔티티의 관계 중 어느 한쪽 끝이라도 언급하는 노트가 더 이상 없는 관계 삭제
+           (언급이 없는 엔티티의 관계는 근거가 되는 노트가 없음)
+        3. 노트 언급도 관계도 남지 않은 엔티티 삭제
+        
+        다른 원본 노트가 계속 언급하는 엔티티와 그 관계는 유지. 관계별 근거 노트는 기록하지 않으므로
+        남은 엔티티 사이의 weight/support는 그대로 - 정확히 맞추려면 graph_sync.sync_graph 사용
+        
+        Args:
+            path: SourceNote.path (vault 기준 상대 경로 - note_ids.source_key)
+            batch_size: 트랜잭션당 행 수
+            
+        Returns:
+            {"notes", "relationships", "entities": 삭제한 수}
+        """
+        with self.session() as session:
+            note_ids = [record["id"] for record in session.run(SOURCE_NOTE_IDS_QUERY, path=path)]
+            candidates = {record["name"] for record in session.run(SOURCE_NOTE_ENTITIES_QUERY, path=path)}
+        
+        report = {"notes": self.delete_notes(note_ids, batch_size), "relationships": 0, "entities": 0}
+        self.delete_sources([path], batch_size)
+        
+        with self.session() as session:
+            # 관계를 지운 엔티티의 반대쪽 끝도 고아가 될 수 있으므로 후보에 추가
+            for batch in _batches(sorted(candidates), batch_size):
+                rows = [{"name": name} for name in batch]
+                record = session.execute_write(
+                    lambda tx, rows=rows: tx.run(UNREFERENCED_RELATIONSHIPS_DELETE_QUERY, rows=rows).single())
+                report["relationships"] += record["deleted"]
+                candidates.update(record["others"])
+            
+            for batch in _batches(sorted(candidates), batch_size):
+                rows = [{"name": name} for name in batch]
+                report["entities"] += session.execute_write(
+                    lambda tx, rows=rows: tx.run(ORPHAN_ENTITIES_DELETE_QUERY, rows=rows).single()["deleted"])
+        
+        self.bump_generation()
+        if self.mirror is not None:
+            self.load_mirror()
+        return report
+    
     def create_atomic_note_node(self, note_data: Dict) -> str:
         """
-        Atomic Note 노드 생성
+        Atomic Note 노드 생성 또는 업데이트
+        
+        content_hash가 기존 노드와 같으면 쓰기 없이 건너뜀 (멱등 재import)
         
         Args:
             note_data: Atomic Note 데이터
             
         Returns:
-            생성된 노드 ID
-        """
-        with self.driver.session() as session:
-            note_id = note_data.get("id", str(uuid.uuid4()))
-            
-            # 먼저 존재하는지 확인
-            check_query = "MATCH (n:AtomicNote {id: $id}) RETURN n.id as id"
-            existing = session.run(check_query, id=note_id).single()
-            
-            if existing:
-                # 기존 노트 업데이트
-                update_query = """
-                MATCH (n:AtomicNote {id: $id})
-                SET n.title = $title,
-                    n.content = $content,
-                    n.detailed_content = $detailed_content,
-                    n.domain = $domain,
-                    n.confidence = $confidence,
-                    n.source_note = $source_note,
-                    n.updated_at = timestamp()
-                RETURN n.id as id
-                """
-                result = session.run(
-                    update_query,
-                    id=note_id,
-                    title=note_data.get("title", ""),
-                    content=note_data.get("content", ""),
-                    detailed_content=note_data.get("detailed_content", ""),
-                    domain=note_data.get("domain", "general"),
-                    confidence=note_data.get("confidence", "medium"),
-                    source_note=note_data.get("source_note", "")
-                )
-            else:
-                # 새 노트 생성
-                create_query = """
-                CREATE (n:AtomicNote {
-                    id: $id,
-                    title: $title,
-                    content: $content,
-                    detailed_content: $detailed_content,
-                    domain: $domain,
-                    confidence: $confidence,
-                    source_note: $source_note,
-                    created_at: timestamp(),
-                    updated_at: timestamp()
-                })
-                RETURN n.id as id
-                """
-                result = session.run(
-                    create_query,
-                    id=note_id,
-                    title=note_data.get("title", ""),
-                    content=note_data.get("content", ""),
-                    detailed_content=note_data.get("detailed_content", ""),
-                    domain=note_data.get("domain", "general"),
-                    confidence=note_data.get("confidence", "medium"),
-                    source_note=note_data.get("source_note", "")
-                )
-            
-            return result.single()["id"]
+            노드 ID
+        """
+        return self._write(NOTE_UPSERT_QUERY, [_note_row(note_data)])[0]["id"]
     
     def create_entity_node(self, entity: str, entity_data: Optional[Dict] = None) -> str:
         """
         Entity 노드 생성 또는 업데이트
         
         Args:
-            entity: 엔티티 이름
-            entity_data: 추가 메타데이터
+            entity: 엔티티 이름 (대표 이름)
+            entity_data: 추가 메타데이터 (label, domain, confidence, aliases)
             
         Returns:
-            생성된 노드 ID
-        """
-        if entity_data is None:
-            entity_data = {}
-        
-        with self.driver.session() as session:
-            # Python에서 UUID 생성 (Neo4j 구버전 호환)
-            entity_id = str(uuid.uuid4())
-            
-            # 먼저 존재하는지 확인
-            check_query = "MATCH (e:Entity {name: $name}) RETURN e.id as id"
-            existing = session.run(check_query, name=entity).single()
-            
-            if existing:
-                # 기존 엔티티 업데이트
-                update_query = """
-                MATCH (e:Entity {name: $name})
-                SET e.label = $label,
-                    e.domain = $domain,
-                    e.confidence = $confidence,
-                    e.updated_at = timestamp()
-                RETURN e.id as id
-                """
-                result = session.run(
-                    update_query,
-                    name=entity,
-                    label=entity_data.get("label", "CONCEPT"),
-                    domain=entity_data.get("domain", "general"),
-                    confidence=entity_data.get("confidence", 1.0)
-                )
-                return result.single()["id"]
-            else:
-                # 새 엔티티 생성
-                create_query = """
-                CREATE (e:Entity {
-                    id: $id,
-                    name: $name,
-                    label: $label,
-                    domain: $domain,
-                    confidence: $confidence,
-                    created_at: timestamp(),
-                    updated_at: timestamp()
-                })
-                RETURN e.id as id
-                """
-                result = session.run(
-                    create_query,
-                    id=entity_id,
-                    name=entity,
-                    label=entity_data.get("label", "CONCEPT"),
-                    domain=entity_data.get("domain", "general"),
-                    confidence=entity_data.get("confidence", 1.0)
-                )
-                return result.single()["id"]
+            노드 ID
+        """
+        return self._write(ENTITY_UPSERT_QUERY, [_entity_row(entity, entity_data or {})])[0]["id"]
     
     def create_relationship(self, from_entity: str, rel_type: str, 
                           to_entity: str, confidence: float = 0.7,
                           metadata: Optional[Dict] = None):
         """
-        엔티티 간 관계 생성
+        엔티티 간 관계 생성 또는 업데이트
         
         Args:
             from_entity: 시작 엔티티 이름
-            rel_type: 관계 타입 (relates_to, is_example_of, 등)
+            rel_type: 관계 타입 (relates_to, is_example_of, 등 - graph_schema.RELATIONSHIP_TYPES)
             to_entity: 목표 엔티티 이름
             confidence: 신뢰도
             metadata: 추가 메타데이터
@@ -242,161 +887,691 @@ class GraphDBManager:
         if metadata is None:
             metadata = {}
         
-        # 관계 타입을 대문자로 변환 (Neo4j 관례)
-        rel_type_upper = rel_type.upper().replace(" ", "_")
-        
-        with self.driver.session() as session:
-            # 먼저 관계가 존재하는지 확인
-            check_query = f"""
-            MATCH (from:Entity {{name: $from_entity}})-[r:{rel_type_upper}]->(to:Entity {{name: $to_entity}})
-            RETURN r
-            """
-            existing = session.run(check_query, from_entity=from_entity, to_entity=to_entity).single()
-            
-            if existing:
-                # 기존 관계 업데이트
-                update_query = f"""
-                MATCH (from:Entity {{name: $from_entity}})-[r:{rel_type_upper}]->(to:Entity {{name: $to_entity}})
-                SET r.confidence = $confidence,
-                    r.method = $method,
-                    r.updated_at = timestamp()
-                RETURN r
-                """
-                session.run(
-                    update_query,
-                    from_entity=from_entity,
-                    to_entity=to_entity,
-                    confidence=confidence,
-                    method=metadata.get("method", "extracted")
-                )
-            else:
-                # 새 관계 생성
-                create_query = f"""
-                MATCH (from:Entity {{name: $from_entity}})
-                MATCH (to:Entity {{name: $to_entity}})
-                CREATE (from)-[r:{rel_type_upper} {{
-                    confidence: $confidence,
-                    method: $method,
-                    created_at: timestamp(),
-                    updated_at: timestamp()
-                }}]->(to)
-                RETURN r
-                """
-                session.run(
-                    create_query,
-                    from_entity=from_entity,
-                    to_entity=to_entity,
-                    confidence=confidence,
-                    method=metadata.get("method", "extracted")
-                )
+        # 화이트리스트 밖의 타입은 RELATES_TO로 저장하고 원래 타입은 original_type에 보존
+        for rel in aggregate_relationships([{
+            "from": from_entity,
+            "type": rel_type,
+            "to": to_entity,
+            "confidence": confidence,
+            "method": metadata.get("method", "extracted"),
+        }]):
+            self._write(_relationship_upsert_query(rel["type"]), [_relationship_row(rel)])
     
     def link_note_to_entity(self, note_id: str, entity: str):
         """Atomic Note와 Entity를 연결"""
-        with self.driver.session() as session:
-            # 먼저 관계가 존재하는지 확인
-            check_query = """
-            MATCH (n:AtomicNote {id: $note_id})-[r:MENTIONS]->(e:Entity {name: $entity})
-            RETURN r
-            """
-            existing = session.run(check_query, note_id=note_id, entity=entity).single()
+        self._write(MENTION_UPSERT_QUERY, [{"note_id": note_id, "entity": entity}])
+    
+    # ------------------------------------------------------------------
+    # 배치 import (UNWIND + 크기 제한 트랜잭션)
+    # ------------------------------------------------------------------
+    
+    def _write_batches(self, query: str, rows: List[Dict], batch_size: int) -> int:
+        """
+        행 목록을 batch_size 단위 트랜잭션으로 나누어 `UNWIND $rows` 쿼리 실행
+        
+        Returns:
+            처리한 행 수
+        """
+        self._invalidate_stats()
+        written = 0
+        with self.session() as session:
+            for batch in _batches(rows, batch_size):
+                session.execute_write(lambda tx, rows=batch: tx.run(query, rows=rows).consume())
+                written += len(batch)
+        return written
+    
+    def import_atomic_notes(self, notes: List[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Atomic Note 노드 일괄 생성/업데이트 (content_hash가 같으면 쓰기 생략)
+        
+        Args:
+            notes: create_atomic_note_node와 같은 형식의 노트 데이터 목록
+            batch_size: 트랜잭션당 행 수
+            
+        Returns:
+            처리한 노트 수
+        """
+        rows = [_note_row(note) for note in notes]
+        return self._write_batches(NOTE_UPSERT_QUERY, rows, batch_size)
+    
+    def import_sources(self, sources: List[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        SourceNote(원본 노트) 노드 일괄 생성/업데이트 (노트보다 먼저 - 노트 업서트가 FROM_SOURCE로 연결)
+        
+        Args:
+            sources: {"path", "title", "content_hash", "mtime", "import_hash"} 목록 (path 외에는 선택)
+            batch_size: 트랜잭션당 행 수
             
-            if not existing:
-                # 관계가 없으면 생성
-                create_query = """
-                MATCH (n:AtomicNote {id: $note_id})
-                MATCH (e:Entity {name: $entity})
-                CREATE (n)-[r:MENTIONS {created_at: timestamp()}]->(e)
-                RETURN r
-                """
-                session.run(create_query, note_id=note_id, entity=entity)
+        Returns:
+            처리한 원본 노트 수
+        """
+        rows = [_source_row(source) for source in sources if source.get("path")]
+        return self._write_batches(SOURCE_UPSERT_QUERY, rows, batch_size)
     
-    def get_entity_graph(self, entity: str, depth: int = 2) -> Dict:
+    def unchanged_sources(self, sources: List[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> Set[str]:
         """
-        특정 엔티티 주변의 그래프 가져오기
+        그래프의 import_hash가 같은 원본 경로 (재import 시 graph_import.skip_sources로 건너뛸 원본)
+        
+        원본 경로 인덱스 조회만 하므로 원본 노트 수에 비례 (Atomic Note 수와 무관)
         
         Args:
-            entity: 엔티티 이름
-            depth: 탐색 깊이
+            sources: build_import_rows 결과의 "sources" 행
             
         Returns:
-            노드와 관계 정보
+            변경 없는 원본 경로 집합
         """
-        with self.driver.session() as session:
-            query = f"""
-            MATCH path = (e:Entity {{name: $entity}})-[*1..{depth}]-(related)
-            RETURN e, related, relationships(path) as rels
-            LIMIT 100
-            """
+        rows = [{"path": source["path"], "import_hash": source["import_hash"]}
+                for source in sources if source.get("path") and source.get("import_hash")]
+        unchanged = set()
+        with self.session() as session:
+            for batch in _batches(rows, batch_size):
+                unchanged.update(record["path"] for record in session.run(UNCHANGED_SOURCES_QUERY, rows=batch))
+        return unchanged
+    
+    def import_entities(self, entities: List[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Entity 노드 일괄 생성/업데이트
+        
+        Args:
+            entities: {"name", "label", "domain", "confidence", "aliases"} 목록 (name 외에는 선택)
+            batch_size: 트랜잭션당 행 수
             
-            result = session.run(query, entity=entity)
+        Returns:
+            처리한 엔티티 수
+        """
+        rows = [_entity_row(entity["name"], entity) for entity in entities if entity.get("name")]
+        return self._write_batches(ENTITY_UPSERT_QUERY, rows, batch_size)
+    
+    def import_mentions(self, mentions: List[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Atomic Note → Entity MENTIONS 관계 일괄 생성 (노트와 엔티티가 먼저 있어야 함)
+        
+        Args:
+            mentions: {"note_id", "entity"} 목록
+            batch_size: 트랜잭션당 행 수
             
-            nodes = []
-            relationships = []
+        Returns:
+            처리한 행 수
+        """
+        return self._write_batches(MENTION_UPSERT_QUERY, list(mentions), batch_size)
+    
+    def import_relationships(self, relationships: Iterable[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        엔티티 간 관계 일괄 생성/업데이트 (관계 타입별로 묶어 UNWIND, 양 끝 엔티티가 먼저 있어야 함)
+        
+        Args:
+            relationships: {"from", "type", "to", "confidence", "method"} 목록
+            batch_size: 트랜잭션당 행 수
+            
+        Returns:
+            처리한 관계 수
+        """
+        written = 0
+        for rel_type, rows in _group_relationships(relationships).items():
+            written += self._write_batches(_relationship_upsert_query(rel_type), rows, batch_size)
+        return written
+    
+    # ------------------------------------------------------------------
+    # 동기화 (graph_sync): 현재 상태 조회 + 배치 삭제
+    # ------------------------------------------------------------------
+    
+    def read_graph_state(self) -> Dict:
+        """
+        동기화 비교용 현재 그래프 상태
+        
+        Returns:
+            {"sources": {경로: {"title", "content_hash", "mtime", "import_hash"}},
+             "notes": {id: {"source_note", "source_path", "content_hash"}},
+             "entities": {이름: {"label", "domain", "confidence", "aliases"}},
+             "mentions": {(note_id, 엔티티 이름)},
+             "relationships": {(from, 타입, to): {"weight", "support", "confidence", "method"}}}
+        """
+        with self.session() as session:
+            sources = {record["path"]: record.data() for record in session.run(STATE_SOURCES_QUERY)}
+            notes = {record["id"]: record.data() for record in session.run(STATE_NOTES_QUERY)}
+            entities = {record["name"]: record.data() for record in session.run(STATE_ENTITIES_QUERY)}
+            mentions = {(record["note_id"], record["entity"]) for record in session.run(STATE_MENTIONS_QUERY)}
+            relationships = {
+                (record["from"], record["type"], record["to"]): record.data()
+                for record in session.run(STATE_RELATIONSHIPS_QUERY)
+            }
+        return {"sources": sources, "notes": notes, "entities": entities, "mentions": mentions,
+                "relationships": relationships}
+    
+    def delete_notes(self, note_ids: List[str], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """Atomic Note 일괄 삭제 (MENTIONS 포함)"""
+        return self._write_batches(NOTE_DELETE_QUERY, [{"id": note_id} for note_id in note_ids], batch_size)
+    
+    def delete_sources(self, paths: List[str], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """SourceNote 일괄 삭제 (FROM_SOURCE 포함, Atomic Note는 유지)"""
+        return self._write_batches(SOURCE_DELETE_QUERY, [{"path": path} for path in paths], batch_size)
+    
+    def delete_entities(self, names: List[str], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """Entity 일괄 삭제 (연결된 관계 포함)"""
+        return self._write_batches(ENTITY_DELETE_QUERY, [{"name": name} for name in names], batch_size)
+    
+    def delete_mentions(self, mentions: List[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """MENTIONS 관계 일괄 삭제 ({"note_id", "entity"} 목록)"""
+        return self._write_batches(MENTION_DELETE_QUERY, list(mentions), batch_size)
+    
+    def delete_relationships(self, relationships: List[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """엔티티 간 관계 일괄 삭제 ({"from", "type", "to"} 목록, 타입은 그래프에 저장된 이름)"""
+        by_type: Dict[str, List[Dict]] = {}
+        for rel in relationships:
+            by_type.setdefault(rel["type"], []).append({"from": rel["from"], "to": rel["to"]})
+        return sum(
+            self._write_batches(_relationship_delete_query(rel_type), rows, batch_size)
+            for rel_type, rows in by_type.items()
+        )
+    
+    # ------------------------------------------------------------------
+    # 병렬 import (단계별 + 파티션별 워커)
+    # ------------------------------------------------------------------
+    
+    def _run_steps(self, steps: List[Tuple[str, List[Dict]]]) -> int:
+        """워커 1개의 작업: 세션 1개에서 (쿼리, 배치)를 순서대로 트랜잭션 실행"""
+        self._invalidate_stats()
+        written = 0
+        with self.session() as session:
+            for query, batch in steps:
+                session.execute_write(lambda tx, query=query, rows=batch: tx.run(query, rows=rows).consume())
+                written += len(batch)
+        return written
+    
+    def _run_phase(self, executor: ThreadPoolExecutor, tasks: List[List[Tuple[str, List[Dict]]]]) -> Dict:
+        """한 단계의 작업을 모두 병렬 실행하고 처리량 측정"""
+        start = time.perf_counter()
+        written = sum(executor.map(self._run_steps, tasks))
+        return _phase_report(written, time.perf_counter() - start)
+    
+    def import_parallel(self, rows: Dict[str, List[Dict]], workers: int = 4,
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Dict]:
+        """
+        단계별 병렬 import
+        
+        0. sources: 원본 노트(SourceNote) 배치 단위 병렬
+        1. entities: 이름 기준 전역 중복 제거 후 배치 단위 병렬
+        2. notes: 원본 경로 순 정렬 후 배치 단위 병렬 - 워커 간 SourceNote 잠금(FROM_SOURCE) 순서 통일
+        3. mentions: 엔티티 기준 파티션 - 허브 엔티티("AI" 등)의 잠금은 한 워커만 잡고,
+           파티션 안에서는 노트 ID 순으로 정렬해 워커 간 노트 잠금 순서를 통일 (교착 상태 방지)
+        4. relationships: 시작 엔티티 기준 파티션 + 목표 엔티티 순 정렬 (모든 관계 타입 공통 파티션)
+        
+        일시적 오류(교착 상태 등)는 트랜잭션 단위로 드라이버가 재시도
+        
+        Args:
+            rows: {"sources", "entities", "notes", "mentions", "relationships"} - graph_import.build_import_rows 결과 형식
+            workers: 동시 실행 워커(세션) 수 - 연결 풀 크기 이하
+            batch_size: 트랜잭션당 행 수
+            
+        Returns:
+            단계별 {"rows", "seconds", "rows_per_sec"}
+        """
+        # 1. 엔티티 전역 중복 제거 (별칭 합집합, 나머지는 나중 값)
+        entities: Dict[str, Dict] = {}
+        for entity in rows.get("entities", []):
+            name = entity.get("name")
+            if not name:
+                continue
+            row = _entity_row(name, entity)
+            current = entities.get(name)
+            if current is not None:
+                row["aliases"] = current["aliases"] + [a for a in row["aliases"] if a not in current["aliases"]]
+            entities[name] = row
+        entity_rows = list(entities.values())
+        note_rows = sorted((_note_row(note) for note in rows.get("notes", [])),
+                           key=lambda row: (row["source_path"] or "", row["id"]))
+        source_rows = [_source_row(source) for source in rows.get("sources", [])]
+        
+        # 3. MENTIONS: 엔티티 파티션 → 파티션별 순차 실행
+        mention_tasks = []
+        for part in _partition(rows.get("mentions", []), "entity", workers):
+            if not part:
+                continue
+            part.sort(key=lambda row: row["note_id"])
+            mention_tasks.append([(MENTION_UPSERT_QUERY, batch) for batch in _batches(part, batch_size)])
+        
+        # 4. 관계: 시작 엔티티 파티션 (타입이 달라도 같은 파티션)
+        partitioned: Dict[int, List[Tuple[str, List[Dict]]]] = {}
+        for rel_type, type_rows in _group_relationships(rows.get("relationships", [])).items():
+            query = _relationship_upsert_query(rel_type)
+            for index, part in enumerate(_partition(type_rows, "from", workers)):
+                part.sort(key=lambda row: row["to"])
+                partitioned.setdefault(index, []).extend(
+                    (query, batch) for batch in _batches(part, batch_size))
+        relationship_tasks = [steps for steps in partitioned.values() if steps]
+        
+        report = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            report["sources"] = self._run_phase(
+                executor, [[(SOURCE_UPSERT_QUERY, batch)] for batch in _batches(source_rows, batch_size)])
+            report["entities"] = self._run_phase(
+                executor, [[(ENTITY_UPSERT_QUERY, batch)] for batch in _batches(entity_rows, batch_size)])
+            report["notes"] = self._run_phase(
+                executor, [[(NOTE_UPSERT_QUERY, batch)] for batch in _batches(note_rows, batch_size)])
+            report["mentions"] = self._run_phase(executor, mention_tasks)
+            report["relationships"] = self._run_phase(executor, relationship_tasks)
+        return report
+    
+    def write_analytics(self, entity_rows: List[Dict], note_rows: List[Dict],
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+        """
+        graph_analytics 결과를 노드 속성으로 일괄 기록 후 import 세대 번호 증가
+        (통계 캐시와 메모리 복제본이 새 importance/community로 갱신됨)
+        
+        Args:
+            entity_rows: {"name", "pagerank", "importance", "degree", "community", "note_count"} 목록
+            note_rows: {"id", "importance"} 목록
+            batch_size: 트랜잭션당 행 수
+            
+        Returns:
+            {"entities", "notes": 처리한 행 수}
+        """
+        written = {
+            "entities": self._write_batches(ENTITY_ANALYTICS_QUERY, entity_rows, batch_size),
+            "notes": self._write_batches(NOTE_ANALYTICS_QUERY, note_rows, batch_size),
+        }
+        self.bump_generation()
+        return written
+    
+    # ------------------------------------------------------------------
+    # 메모리 복제본 (GraphMirror)
+    # ------------------------------------------------------------------
+    
+    def load_mirror(self) -> Optional["GraphMirror"]:
+        """
+        Neo4j 그래프를 메모리 복제본으로 일괄 로드 (NumPy가 없으면 None - 서버 쿼리 사용)
+        
+        로드 후 get_entity_graph / find_entity_path / get_k_hop_entities는 서버 대신 복제본에서 실행.
+        이 프로세스의 import_rows는 변경분을 바로 반영하고, 다른 프로세스의 import는
+        mirror_check_interval마다 세대 번호를 확인해 바뀌었으면 다시 로드
+        (항목별 create_*/link_* 쓰기는 다음 import 또는 다시 로드할 때까지 반영되지 않음)
+        """
+        mirror_class = _graph_mirror_class()
+        if mirror_class is None:
+            print("⚠️  NumPy가 없어 메모리 복제본을 사용하지 않습니다 (pip install numpy)")
+            return None
+        generation = self.import_generation()
+        self.mirror = mirror_class.from_neo4j(self)
+        self.mirror.generation = generation
+        self._mirror_checked_at = time.monotonic()
+        self._mirror_write_generation = self._write_generation
+        return self.mirror
+    
+    def refresh_mirror(self, rows: Dict[str, List[Dict]], generation: Optional[int] = None):
+        """
+        import한 행을 복제본에 반영 (복제본을 로드하지 않았으면 아무것도 하지 않음)
+        
+        Args:
+            rows: graph_import.build_import_rows 결과 형식
+            generation: import 후 세대 번호 (bump_generation 결과)
+        """
+        if self.mirror is None:
+            return
+        self.mirror.apply_rows(rows)
+        if generation is not None:
+            self.mirror.generation = generation
+            self._mirror_checked_at = time.monotonic()
+            self._mirror_write_generation = self._write_generation
+    
+    def _active_mirror(self) -> Optional["GraphMirror"]:
+        """사용할 복제본 (확인 간격이 지났고 다른 프로세스가 import했으면 다시 로드)"""
+        if self.mirror is None:
+            return None
+        if time.monotonic() - self._mirror_checked_at >= self.mirror_check_interval:
+            self._mirror_checked_at = time.monotonic()
+            if self.import_generation() != self.mirror.generation:
+                self.load_mirror()
+        return self.mirror
+    
+    def current_mirror(self) -> Optional["GraphMirror"]:
+        """
+        최신 상태가 보장된 복제본 (복제본을 로드하지 않았으면 None)
+        
+        확인 간격과 무관하게 매번 세대 번호를 확인하고, 다른 프로세스의 import나 이 프로세스의
+        항목별 쓰기가 복제본 이후에 있었으면 다시 로드 (분석 결과를 다시 기록하는 graph_analytics용)
+        """
+        if self.mirror is None:
+            return None
+        if (self.import_generation() != self.mirror.generation
+                or self._write_generation != self._mirror_write_generation):
+            self.load_mirror()
+        return self.mirror
+    
+    def get_entity_graph(self, entity: str, depth: int = 2, fan_out: int = DEFAULT_FAN_OUT,
+                         max_nodes: int = DEFAULT_MAX_NODES, include_notes: bool = False) -> Dict:
+        """
+        특정 엔티티 주변의 그래프 가져오기 (엔티티 간 관계 단계별 BFS + 선택적으로 언급한 노트)
+        
+        각 노드는 가중치(관계 weight 합) → importance → degree(graph_analytics) 순으로 이웃을 fan_out개까지만
+        확장하므로 결과 크기와 다음 단계의 frontier가 depth * fan_out 으로 제한됨.
+        순위를 매기려면 노드의 관계를 한 번 읽어야 하므로 허브 1개의 비용은 그 노드의 관계 수에 비례
+        (이웃의 차수는 상위 fan_out개에 대해서만 조회)
+        
+        Args:
+            entity: 엔티티 이름
+            depth: 탐색 깊이
+            fan_out: 노드당 확장할 최대 이웃 수 (include_notes면 엔티티당 노트 수 상한도 겸함)
+            max_nodes: 결과에 포함할 최대 노드 수 (시작 엔티티 포함, 노트 포함)
+            include_notes: True면 결과 엔티티를 언급한 Atomic Note도 포함 (importance 순, 더 확장하지 않음)
             
+        Returns:
+            {"nodes": [{"id", "name", "label", "domain", "importance", "community", "degree", "depth"}]
+                       (id 기준 중복 제거, importance/community는 graph_analytics 실행 전에는 None,
+                        노트는 {"id", "kind": "AtomicNote", "title", "content", "domain", "importance", "depth"}),
+             "relationships": [{"from", "type", "to", "weight", "confidence"}] (중복 제거, 노트는 MENTIONS),
+             "adjacency": {엔티티 이름: [이웃 이름, ...]} (엔티티 간 관계만),
+             "truncated": fan_out/max_nodes 상한 때문에 생략된 이웃이 있으면 True}
+        """
+        mirror = self._active_mirror()
+        if mirror is not None:
+            graph = mirror.neighborhood(entity, depth=depth, fan_out=fan_out, max_nodes=max_nodes)
+        else:
+            graph = self._entity_graph_bfs(entity, depth, fan_out, max_nodes)
+        if include_notes and graph["nodes"]:
+            self._attach_mentioning_notes(graph, fan_out, max_nodes)
+        return graph
+    
+    def _attach_mentioning_notes(self, graph: Dict, fan_out: int, max_nodes: int):
+        """get_entity_graph 결과의 엔티티마다 언급한 노트를 fan_out개까지 추가 (제자리 수정)"""
+        depths = {node["name"]: node["depth"] for node in graph["nodes"] if "name" in node}
+        note_ids = set()
+        with self.session() as session:
+            result = session.run(ENTITY_NOTES_QUERY, names=list(depths), fan_out=fan_out)
             for record in result:
-                # 노드 정보 추출
-                if record["e"]:
-                    nodes.append(dict(record["e"]))
-                if record["related"]:
-                    nodes.append(dict(record["related"]))
+                if record["id"] not in note_ids:
+                    if len(graph["nodes"]) >= max_nodes:
+                        graph["truncated"] = True
+                        continue
+                    note_ids.add(record["id"])
+                    graph["nodes"].append({
+                        "id": record["id"],
+                        "kind": "AtomicNote",
+                        "title": record["title"],
+                        "content": record["content"],
+                        "domain": record["domain"],
+                        "importance": record["importance"],
+                        "depth": depths[record["entity"]] + 1,
+                    })
+                graph["relationships"].append({
+                    "from": record["id"],
+                    "type": "MENTIONS",
+                    "to": record["entity"],
+                    "weight": 1,
+                    "confidence": None,
+                })
+                if record["mentions"] > fan_out:
+                    graph["truncated"] = True
+    
+    def _entity_graph_bfs(self, entity: str, depth: int, fan_out: int, max_nodes: int) -> Dict:
+        """get_entity_graph의 서버 쿼리 경로 (복제본이 없을 때)"""
+        graph = {"nodes": [], "relationships": [], "adjacency": {}, "truncated": False}
+        
+        with self.session() as session:
+            root = session.run(ENTITY_ROOT_QUERY, name=entity).single()
+            if root is None:
+                return graph
+            
+            nodes = {root["id"] or root["name"]: {**root.data(), "depth": 0}}
+            node_names = {root["name"]}
+            relationships: Dict[tuple, Dict] = {}
+            adjacency: Dict[str, List[str]] = {root["name"]: []}
+            frontier = [root["name"]]
+            
+            for level in range(1, depth + 1):
+                if not frontier:
+                    break
+                next_frontier = []
+                expanded: Dict[str, int] = {}
                 
-                # 관계 정보 추출
-                if record["rels"]:
+                result = session.run(ENTITY_NEIGHBORS_QUERY, names=frontier, fan_out=fan_out)
+                for record in result:
+                    source, name = record["source"], record["name"]
+                    expanded[source] = expanded.get(source, 0) + 1
+                    
+                    if name not in node_names:
+                        if len(nodes) >= max_nodes:
+                            graph["truncated"] = True
+                            continue
+                        nodes[record["id"] or name] = {
+                            "id": record["id"],
+                            "name": name,
+                            "label": record["label"],
+                            "domain": record["domain"],
+                            "importance": record["importance"],
+                            "community": record["community"],
+                            "degree": record["degree"],
+                            "depth": level,
+                        }
+                        node_names.add(name)
+                        adjacency[name] = []
+                        next_frontier.append(name)
+                    
+                    if name not in adjacency[source]:
+                        adjacency[source].append(name)
+                        adjacency[name].append(source)
+                    
                     for rel in record["rels"]:
-                        relationships.append({
-                            "type": rel.type,
-                            "properties": dict(rel)
+                        from_entity, to_entity = (source, name) if rel["outgoing"] else (name, source)
+                        relationships.setdefault((from_entity, rel["type"], to_entity), {
+                            "from": from_entity,
+                            "type": rel["type"],
+                            "to": to_entity,
+                            "weight": rel["weight"],
+                            "confidence": rel["confidence"],
                         })
-            
-            return {
-                "nodes": nodes,
-                "relationships": relationships
-            }
+                
+                # 이웃을 fan_out개 채운 노드는 생략된 이웃이 있을 수 있음
+                if any(count >= fan_out for count in expanded.values()):
+                    graph["truncated"] = True
+                frontier = next_frontier
+        
+        graph["nodes"] = list(nodes.values())
+        graph["relationships"] = list(relationships.values())
+        graph["adjacency"] = adjacency
+        return graph
     
-    def search_entities(self, query: str, limit: int = 10) -> List[Dict]:
-        """엔티티 검색"""
-        with self.driver.session() as session:
-            cypher_query = """
-            MATCH (e:Entity)
-            WHERE e.name CONTAINS $search_query
-            RETURN e
-            ORDER BY e.name
-            LIMIT $limit
-            """
+    def find_entity_path(self, start_entity: str, end_entity: str, max_depth: int = 5) -> List[Dict]:
+        """
+        두 엔티티 사이의 최단 경로 (방향 무시, 모든 관계 타입)
+        
+        Args:
+            start_entity: 시작 엔티티 이름
+            end_entity: 끝 엔티티 이름
+            max_depth: 최대 탐색 깊이
             
-            result = session.run(cypher_query, search_query=query, limit=limit)
-            return [dict(record["e"]) for record in result]
-    
-    def get_graph_stats(self) -> Dict:
-        """Graph DB 통계"""
-        with self.driver.session() as session:
-            stats_query = """
-            MATCH (n)
-            WITH labels(n) as labels
-            UNWIND labels as label
-            RETURN label, count(*) as count
-            ORDER BY count DESC
+        Returns:
+            [{"entities": 경로의 노드 이름 목록, "relationships": 관계 타입 목록, "length"}] (경로가 없으면 빈 목록)
+        """
+        mirror = self._active_mirror()
+        if mirror is not None:
+            path = mirror.shortest_path(start_entity, end_entity, max_depth=max_depth)
+            return [path] if path else []
+        
+        with self.session() as session:
+            query = f"""
+            MATCH path = shortestPath(
+                (start:Entity {{name: $start_entity}})-[*1..{int(max_depth)}]-(end:Entity {{name: $end_entity}})
+            )
+            RETURN [node IN nodes(path) | coalesce(node.name, node.id)] AS entity_names,
+                   [rel IN relationships(path) | type(rel)] AS rel_types,
+                   length(path) AS path_length
             """
+            result = session.run(query, start_entity=start_entity, end_entity=end_entity)
+            return [
+                {
+                    "entities": record["entity_names"],
+                    "relationships": record["rel_types"],
+                    "length": record["path_length"],
+                }
+                for record in result
+            ]
+    
+    def get_k_hop_entities(self, entity: str, k: int = 2) -> Dict[str, int]:
+        """
+        k단계 이내의 엔티티 (엔티티 간 관계만, 방향 무시)
+        
+        Returns:
+            {엔티티 이름: 최소 단계 수} (시작 엔티티 제외)
+        """
+        mirror = self._active_mirror()
+        if mirror is not None:
+            return mirror.k_hop(entity, k=k)
+        
+        hops: Dict[str, int] = {}
+        visited = {entity}
+        frontier = [entity]
+        with self.session() as session:
+            for level in range(1, k + 1):
+                if not frontier:
+                    break
+                result = session.run(ENTITY_NEXT_HOP_QUERY, names=frontier)
+                frontier = [record["name"] for record in result if record["name"] not in visited]
+                visited.update(frontier)
+                hops.update((name, level) for name in frontier)
+        return hops
+    
+    def search_entities(self, query: str, limit: int = 10, skip: int = 0) -> List[Dict]:
+        """
+        엔티티 검색 (이름 + 별칭 전체 텍스트 인덱스, 대소문자 무시, 관련도순)
+        
+        점수 = 전체 텍스트 점수 * (1 + importance) - 분석(graph_analytics) 전에는 전체 텍스트 점수 그대로
+        
+        Args:
+            query: 검색어
+            limit: 반환할 최대 결과 수
+            skip: 건너뛸 결과 수 (페이지네이션)
             
-            result = session.run(stats_query)
-            node_counts = {record["label"]: record["count"] for record in result}
+        Returns:
+            엔티티 속성 + "score" 목록
+        """
+        search_query = fulltext_query(query)
+        if not search_query:
+            return []
+        
+        with self.session() as session:
+            result = session.run(ENTITY_SEARCH_QUERY, search_query=search_query, skip=skip, limit=limit,
+                                 window=(skip + limit) * SEARCH_RERANK_FACTOR)
+            return [{**dict(record["node"]), "score": record["score"]} for record in result]
+    
+    def search_notes(self, query: str, limit: int = 10, skip: int = 0) -> List[Dict]:
+        """
+        Atomic Note 검색 (제목 + 내용 + 상세 내용 전체 텍스트 인덱스, 관련도순)
+        
+        Args:
+            query: 검색어
+            limit: 반환할 최대 결과 수
+            skip: 건너뛸 결과 수 (페이지네이션)
             
-            # 관계 통계
-            rel_query = """
-            MATCH ()-[r]->()
-            RETURN type(r) as type, count(*) as count
-            ORDER BY count DESC
-            """
+        Returns:
+            {"id", "title", "content", "domain", "source_note", "score"} 목록
+        """
+        search_query = fulltext_query(query)
+        if not search_query:
+            return []
+        
+        with self.session() as session:
+            result = session.run(NOTE_SEARCH_QUERY, search_query=search_query, skip=skip, limit=limit)
+            return [record.data() for record in result]
+    
+    def get_sources(self, folder: str = "") -> List[Dict]:
+        """
+        원본 노트 목록 (SourceNote 경로 인덱스 범위 조회)
+        
+        Args:
+            folder: vault 기준 폴더 경로 (빈 값이면 전체)
             
-            result = session.run(rel_query)
-            rel_counts = {record["type"]: record["count"] for record in result}
+        Returns:
+            {"path", "title", "mtime", "content_hash", "notes": Atomic Note 수} 목록 (경로순)
+        """
+        with self.session() as session:
+            result = session.run(SOURCES_QUERY, prefix=_folder_prefix(folder))
+            return [record.data() for record in result]
+    
+    def get_source_atomic_notes(self, path: str, folder: bool = False) -> List[Dict]:
+        """
+        원본 노트(또는 폴더)에서 나온 Atomic Note 목록
+        
+        SourceNote 경로 인덱스 → FROM_SOURCE를 따라가므로 AtomicNote 전체를 스캔하지 않음
+        
+        Args:
+            path: 원본 노트 경로 (note_ids.source_key), folder=True면 폴더 경로
+            folder: True면 폴더 아래 모든 원본 노트
             
-            return {
-                "nodes": node_counts,
-                "relationships": rel_counts,
-                "total_nodes": sum(node_counts.values()),
-                "total_relationships": sum(rel_counts.values())
-            }
+        Returns:
+            {"source_path", "id", "title", "content", "domain"} 목록
+        """
+        with self.session() as session:
+            if folder:
+                result = session.run(FOLDER_ATOMIC_NOTES_QUERY, prefix=_folder_prefix(path))
+            else:
+                result = session.run(SOURCE_ATOMIC_NOTES_QUERY, path=path)
+            return [record.data() for record in result]
+    
+    def get_graph_stats(self, refresh: bool = False) -> Dict:
+        """
+        Graph DB 통계 (import 세대마다 1번 계산 후 캐시)
+        
+        - 라벨/관계 타입별 개수: count store (전체 스캔 없음)
+        - 도메인 분포, 엔티티 차수 백분위: import 세대가 바뀔 때만 다시 계산
+        
+        캐시는 import 세대 번호(bump_generation)와 이 프로세스의 쓰기로 무효화되므로,
+        캐시가 유효하면 세대 번호 조회 쿼리 1개만 실행
+        
+        Args:
+            refresh: True면 캐시를 무시하고 다시 계산
+            
+        Returns:
+            {"nodes", "relationships": 라벨/타입별 개수, "total_nodes", "total_relationships",
+             "entity_domains", "note_domains": 도메인별 개수,
+             "entity_degree": {"p50", "p90", "p99", "max", "avg"}, "generation"}
+        """
+        cache_key = (self.import_generation(), self._write_generation)
+        if not refresh and self._stats_cache is not None and self._stats_cache[0] == cache_key:
+            return self._stats_cache[1]
+        
+        with self.session() as session:
+            node_counts = {}
+            for record in list(session.run(LABELS_QUERY)):
+                label = record["label"]
+                if label == GRAPH_META_LABEL:
+                    continue
+                count = session.run(f"MATCH (n:{_escape_name(label)}) RETURN count(n) AS count").single()["count"]
+                if count:
+                    node_counts[label] = count
+            
+            rel_counts = {}
+            for record in list(session.run(RELATIONSHIP_TYPES_QUERY)):
+                rel_type = record["relationshipType"]
+                count = session.run(
+                    f"MATCH ()-[r:{_escape_name(rel_type)}]->() RETURN count(r) AS count").single()["count"]
+                if count:
+                    rel_counts[rel_type] = count
+            
+            domains = {}
+            for label in ("Entity", "AtomicNote"):
+                result = session.run(DOMAIN_COUNTS_QUERY.format(label=label))
+                domains[label] = {record["domain"]: record["count"] for record in result}
+            
+            degree = session.run(ENTITY_DEGREE_QUERY).single()
+        
+        stats = {
+            "nodes": dict(sorted(node_counts.items(), key=lambda item: -item[1])),
+            "relationships": dict(sorted(rel_counts.items(), key=lambda item: -item[1])),
+            "total_nodes": sum(node_counts.values()),
+            "total_relationships": sum(rel_counts.values()),
+            "entity_domains": domains["Entity"],
+            "note_domains": domains["AtomicNote"],
+            "entity_degree": {
+                "p50": degree["p50"] or 0,
+                "p90": degree["p90"] or 0,
+                "p99": degree["p99"] or 0,
+                "max": degree["max"] or 0,
+                "avg": round(degree["avg"] or 0, 2),
+            },
+            "generation": cache_key[0],
+        }
+        self._stats_cache = (cache_key, stats)
+        return stats
 
 
 # CLI 인터페이스
@@ -433,7 +1608,7 @@ if __name__ == "__main__":
             
             # 통계 출력
             print("\n📊 Graph DB 통계:")
-            stats = graph.get_statistics()
+            stats = graph.get_graph_stats()
             print(f"  총 노드: {stats['total_nodes']}개")
             print(f"  총 관계: {stats['total_relationships']}개")
             print(f"  노드 타입: {stats['nodes']}")
@@ -0,0 +1,153 @@
+"""
+Offline Bulk Import Export
+Stage 1/2 결과 → `neo4j-admin database import full` 용 CSV + 스키마 스크립트
+- 처음 그래프를 만들 때 트랜잭션 Cypher 대신 오프라인 bulk importer 사용 (수백만 행도 수 분)
+- 노드/관계는 트랜잭션 import(MERGE)와 같은 기준으로 중복 제거 → 행 수를 그대로 비교 가능
+- 결정적 ID (note_<hex16>, entity_<hex16>) 사용 → 이후 트랜잭션 import와 ID 호환
+
+출력 파일:
+    entities.csv, atomic_notes.csv       노드
+    source_notes.csv                     노드 (원본 노트)
+    mentions.csv, relationships.csv      관계
+    from_source.csv                      관계 (Atomic Note → 원본 노트)
+    schema.cypher                        import 후 cypher-shell로 실행할 제약조건/인덱스
+    import.sh                            neo4j-admin 명령
+"""
+
+import csv
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from entity_records import DEFAULT_MIN_SCORE
+    from graph_import import build_import_rows
+    from graph_schema import schema_script
+    from note_ids import stable_entity_id
+except ImportError:
+    from src.entity_records import DEFAULT_MIN_SCORE
+    from src.graph_import import build_import_rows
+    from src.graph_schema import schema_script
+    from src.note_ids import stable_entity_id
+
+# neo4j-admin 기본 배열 구분자
+ARRAY_DELIMITER = ";"
+
+ENTITY_HEADER = ["name:ID(Entity)", "id", "label", "domain", "confidence:float",
+                 "aliases:string[]", "created_at:long", "updated_at:long"]
+NOTE_HEADER = ["id:ID(AtomicNote)", "title", "content", "detailed_content", "domain", "confidence",
+               "source_note", "content_hash", "created_at:long", "updated_at:long"]
+SOURCE_HEADER = ["path:ID(SourceNote)", "title", "content_hash", "mtime", "import_hash",
+                 "created_at:long", "updated_at:long"]
+MENTION_HEADER = [":START_ID(AtomicNote)", ":END_ID(Entity)", "created_at:long"]
+FROM_SOURCE_HEADER = [":START_ID(AtomicNote)", ":END_ID(SourceNote)"]
+RELATIONSHIP_HEADER = [":START_ID(Entity)", ":END_ID(Entity)", ":TYPE", "confidence:float", "method",
+                       "weight:long", "support:long", "original_type", "created_at:long", "updated_at:long"]
+
+
+def _write_csv(path: Path, header: List[str], rows: Iterable[List]) -> int:
+    """헤더 포함 CSV 기록 (줄바꿈이 있는 값은 따옴표 처리 → --multiline-fields=true 필요)"""
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def import_command(output_dir: Path, database: str = "neo4j") -> str:
+    """출력 파일에 맞는 neo4j-admin 명령"""
+    return (
+        f"neo4j-admin database import full {database} \\\n"
+        f"  --nodes=Entity={output_dir / 'entities.csv'} \\\n"
+        f"  --nodes=AtomicNote={output_dir / 'atomic_notes.csv'} \\\n"
+        f"  --nodes=SourceNote={output_dir / 'source_notes.csv'} \\\n"
+        f"  --relationships=MENTIONS={output_dir / 'mentions.csv'} \\\n"
+        f"  --relationships=FROM_SOURCE={output_dir / 'from_source.csv'} \\\n"
+        f"  --relationships={output_dir / 'relationships.csv'} \\\n"
+        f"  --multiline-fields=true \\\n"
+        f"  --array-delimiter='{ARRAY_DELIMITER}' \\\n"
+        f"  --overwrite-destination\n"
+    )
+
+
+def export_bulk_import(atomic_notes_results: Iterable[Dict],
+                       output_dir: str,
+                       min_entity_score: float = DEFAULT_MIN_SCORE,
+                       extra_relationships: Optional[Iterable[Dict]] = None,
+                       database: str = "neo4j") -> Dict[str, int]:
+    """
+    Stage 결과를 neo4j-admin bulk import 파일로 내보내기
+
+    Args:
+        atomic_notes_results: Stage 2 결과 (없으면 Stage 1 결과) 리스트 - 결정적 ID 부여 후
+        output_dir: 출력 디렉토리
+        min_entity_score: entity_records가 있을 때 이 점수 미만의 엔티티 제외
+        extra_relationships: Vault 단위 관계 (예: 동시 출현 관계)
+        database: import 대상 데이터베이스 이름 (import.sh에 사용)
+
+    Returns:
+        파일별 행 수 {"entities", "notes", "sources", "mentions", "from_source", "relationships"}
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = build_import_rows(atomic_notes_results, min_entity_score=min_entity_score,
+                             extra_relationships=extra_relationships)
+    now = int(time.time() * 1000)
+
+    # 트랜잭션 import의 MERGE와 같은 기준으로 중복 제거 (같은 키는 나중 값 우선)
+    notes = {note["id"]: note for note in rows["notes"]}
+    sources = {source["path"]: source for source in rows["sources"]}
+    entities = {entity["name"]: entity for entity in rows["entities"]}
+    mentions = {
+        (mention["note_id"], mention["entity"]): mention
+        for mention in rows["mentions"]
+        if mention["note_id"] in notes and mention["entity"] in entities
+    }
+    # 관계는 build_import_rows에서 (from, 타입, to) 기준으로 이미 병합됨
+    # 양 끝 엔티티가 없는 관계는 트랜잭션 import의 MATCH에서도 생성되지 않음
+    relationships = [
+        rel for rel in rows["relationships"]
+        if rel["from"] in entities and rel["to"] in entities
+    ]
+
+    counts = {
+        "entities": _write_csv(output_dir / "entities.csv", ENTITY_HEADER, (
+            [name, stable_entity_id(name), entity.get("label", "CONCEPT"), entity.get("domain", "general"),
+             entity.get("confidence", 1.0), ARRAY_DELIMITER.join(entity.get("aliases", [])), now, now]
+            for name, entity in entities.items()
+        )),
+        "notes": _write_csv(output_dir / "atomic_notes.csv", NOTE_HEADER, (
+            [note["id"], note["title"], note["content"], note["detailed_content"], note["domain"],
+             note["confidence"], note["source_note"], note.get("content_hash") or "", now, now]
+            for note in notes.values()
+        )),
+        "sources": _write_csv(output_dir / "source_notes.csv", SOURCE_HEADER, (
+            [path, source["title"], source.get("content_hash") or "", source.get("mtime") or "",
+             source["import_hash"], now, now]
+            for path, source in sources.items()
+        )),
+        "mentions": _write_csv(output_dir / "mentions.csv", MENTION_HEADER, (
+            [note_id, entity, now] for note_id, entity in mentions
+        )),
+        "from_source": _write_csv(output_dir / "from_source.csv", FROM_SOURCE_HEADER, (
+            [note_id, note["source_path"]] for note_id, note in notes.items() if note.get("source_path") in sources
+        )),
+        "relationships": _write_csv(output_dir / "relationships.csv", RELATIONSHIP_HEADER, (
+            [rel["from"], rel["to"], rel["type"], rel["confidence"], rel["method"],
+             rel["weight"], rel["support"], rel.get("original_type") or "", now, now]
+            for rel in relationships
+        )),
+    }
+
+    with open(output_dir / "schema.cypher", "w", encoding="utf-8") as f:
+        f.write(schema_script())
+    with open(output_dir / "import.sh", "w", encoding="utf-8") as f:
+        f.write("#!/bin/sh\n# Neo4j를 정지한 상태에서 실행 (대상 데이터베이스를 덮어씀)\n")
+        f.write(import_command(output_dir.resolve(), database))
+        f.write(f"# 서버 시작 후: cypher-shell -f {(output_dir / 'schema.cypher').resolve()}\n")
+
+    return counts
@@ -0,0 +1,292 @@
+"""
+Graph Import Planner
+Stage 1/2 결과 → Neo4j 배치 import 행(row) 목록
+- 노트/엔티티/MENTIONS/관계를 한 번에 모아 GraphDBManager의 UNWIND 배치 메서드로 전달
+- 엔티티는 Vault 전체에서 이름 기준으로 병합 (별칭 합집합)
+- 원본 노트마다 SourceNote 행 1개 (경로 = note_ids.source_key, Atomic Note는 FROM_SOURCE로 연결)
+"""
+
+import hashlib
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+try:
+    from entity_records import DEFAULT_MIN_SCORE, filter_entity_records
+    from graph_schema import normalize_relationship_type, relationship_type
+    from note_ids import source_key
+except ImportError:
+    from src.entity_records import DEFAULT_MIN_SCORE, filter_entity_records
+    from src.graph_schema import normalize_relationship_type, relationship_type
+    from src.note_ids import source_key
+
+
+def _source_path(source_note: Dict) -> Optional[str]:
+    """SourceNote 경로 (원본 정보가 없으면 None → FROM_SOURCE 연결 생략)"""
+    return source_key(source_note) or None
+
+
+def _import_hash(notes: List[Dict], mentions: List[Dict]) -> str:
+    """
+    원본 노트 1개에서 나온 import 행의 해시
+
+    노트 content_hash(Stage 1)와 MENTIONS(Stage 2 엔티티 필터링/정규화 결과)가 모두 같으면 같은 값
+    → 재import 때 SourceNote.import_hash와 비교해 변경 없는 원본의 노트/MENTIONS 행을 건너뜀
+    """
+    payload = {
+        "notes": sorted((note["id"], note.get("content_hash") or "") for note in notes),
+        "mentions": sorted((mention["note_id"], mention["entity"]) for mention in mentions),
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _note_row(atomic_note: Dict, source_note: Dict) -> Dict:
+    return {
+        "id": atomic_note["id"],
+        "title": atomic_note.get("title", "Untitled"),
+        "content": atomic_note.get("content", ""),
+        "detailed_content": atomic_note.get("detailed_content", ""),
+        "domain": atomic_note.get("domain", "general"),
+        "confidence": atomic_note.get("confidence", "medium"),
+        "source_note": source_note.get("title", ""),
+        "source_path": _source_path(source_note),
+        "content_hash": atomic_note.get("content_hash"),
+    }
+
+
+def aggregate_relationships(relationships: Iterable[Dict]) -> List[Dict]:
+    """
+    같은 (from, 타입, to) 관계를 1개로 병합
+
+    - 타입은 화이트리스트 기준으로 정규화 (목록 밖의 타입은 RELATES_TO + original_type)
+    - weight: weight 합 (없으면 1씩), support: 병합된 관계 수 합
+    - confidence: 최댓값, method: 최댓값을 준 관계의 method
+
+    이미 병합된 목록을 다시 넣어도 결과가 같음 (weight/support 합산)
+
+    Args:
+        relationships: {"from", "type", "to", "confidence", "method", ["weight", "support"]} 목록
+
+    Returns:
+        병합된 관계 목록 (처음 등장한 순서 유지)
+    """
+    aggregated: Dict[tuple, Dict] = {}
+
+    for rel in relationships:
+        from_entity, to_entity = rel.get("from"), rel.get("to")
+        if not from_entity or not to_entity:
+            continue
+        normalized = normalize_relationship_type(rel.get("type", "relates_to"))
+        rel_type = relationship_type(normalized)
+        confidence = rel.get("confidence", 0.7)
+
+        key = (from_entity, rel_type, to_entity)
+        current = aggregated.get(key)
+        if current is None:
+            current = aggregated[key] = {
+                "from": from_entity,
+                "type": rel_type,
+                "to": to_entity,
+                "confidence": confidence,
+                "method": rel.get("method", "extracted"),
+                "weight": 0,
+                "support": 0,
+            }
+            original_type = rel.get("original_type") or (normalized if normalized != rel_type else None)
+            if original_type:
+                current["original_type"] = original_type
+        elif confidence > current["confidence"]:
+            current["confidence"] = confidence
+            current["method"] = rel.get("method", "extracted")
+
+        current["weight"] += rel.get("weight", 1)
+        current["support"] += rel.get("support", 1)
+
+    return list(aggregated.values())
+
+
+def build_import_rows(atomic_notes_results: Iterable[Dict],
+                      min_entity_score: float = DEFAULT_MIN_SCORE,
+                      extra_relationships: Optional[Iterable[Dict]] = None) -> Dict[str, List[Dict]]:
+    """
+    Stage 결과 전체를 배치 import 행으로 변환
+
+    Args:
+        atomic_notes_results: Stage 2 결과 (없으면 Stage 1 결과) 리스트 - 결정적 ID 부여 후
+        min_entity_score: entity_records가 있을 때 이 점수 미만의 엔티티 제외
+        extra_relationships: Vault 단위 관계 (예: 동시 출현 관계)
+
+    Returns:
+        {"sources", "notes", "entities", "mentions", "relationships": 행 목록,
+         "filtered_entities": 점수 미달로 제외된 엔티티 수}
+        - sources는 원본 노트별 {"path", "title", "content_hash", "mtime", "import_hash"}
+        - relationships는 같은 (from, 타입, to)를 병합한 결과 (aggregate_relationships)
+    """
+    sources: Dict[str, Dict] = {}
+    notes: List[Dict] = []
+    entities: Dict[str, Dict] = {}
+    mentions: List[Dict] = []
+    relationships: List[Dict] = []
+    filtered = 0
+
+    for result in atomic_notes_results:
+        source_note = result.get("source_note", {})
+        first_note, first_mention = len(notes), len(mentions)
+        for atomic_note in result.get("atomic_notes", []):
+            notes.append(_note_row(atomic_note, source_note))
+            domain = atomic_note.get("domain", "general")
+
+            # Stage 2 엔티티 레코드 (점수 필터링) > Enhanced 엔티티 > LLM 엔티티
+            skipped_entities = set()
+            if "entity_records" in atomic_note:
+                note_entities = filter_entity_records(atomic_note["entity_records"], min_entity_score)
+                skipped_entities = ({r["text"] for r in atomic_note["entity_records"]}
+                                    - {r["text"] for r in note_entities})
+                filtered += len(skipped_entities)
+            else:
+                note_entities = atomic_note.get("entities_enhanced", atomic_note.get("extracted_entities", []))
+
+            # Stage 2 정규화 결과: {대표 이름: [별칭, ...]}
+            entity_aliases = atomic_note.get("entity_aliases", {})
+
+            linked = set()
+            for entity in note_entities:
+                if isinstance(entity, dict):
+                    name = entity.get("text", "")
+                    entity_data = {
+                        "label": entity.get("label", "CONCEPT"),
+                        "domain": domain,
+                        "confidence": entity.get("confidence", 1.0),
+                    }
+                else:
+                    name = str(entity)
+                    entity_data = {"domain": domain}
+                if not name or name in linked:
+                    continue
+
+                # 같은 이름은 나중 값으로 갱신하고 별칭은 합집합 (순차 import와 같은 결과)
+                aliases = entity_aliases.get(name, [])
+                current = entities.get(name)
+                if current is None:
+                    entities[name] = {"name": name, **entity_data, "aliases": list(aliases)}
+                else:
+                    current.update(entity_data)
+                    current["aliases"] += [a for a in aliases if a not in current["aliases"]]
+
+                mentions.append({"note_id": atomic_note["id"], "entity": name})
+                linked.add(name)
+
+            # Enhanced 관계 우선 사용 - 한쪽 끝이라도 이 노트의 엔티티일 때만 (다른 쪽은 기본값으로 생성)
+            for rel in atomic_note.get("relationships_enhanced", atomic_note.get("relationships", [])):
+                from_entity = rel.get("from", "")
+                to_entity = rel.get("to", "")
+                if not from_entity or not to_entity:
+                    continue
+                if from_entity in skipped_entities or to_entity in skipped_entities:
+                    continue
+                if from_entity not in linked and to_entity not in linked:
+                    continue
+                for name in (from_entity, to_entity):
+                    entities.setdefault(name, {"name": name, "aliases": []})
+                relationships.append({
+                    "from": from_entity,
+                    "type": rel.get("type", "relates_to"),
+                    "to": to_entity,
+                    "confidence": rel.get("confidence", 0.7),
+                    "method": rel.get("method", "extracted"),
+                })
+
+        path = _source_path(source_note)
+        if path:
+            sources[path] = {
+                "path": path,
+                "title": source_note.get("title", ""),
+                "content_hash": source_note.get("content_hash"),
+                "mtime": source_note.get("modified_date"),
+                "import_hash": _import_hash(notes[first_note:], mentions[first_mention:]),
+            }
+
+    # Vault 단위 관계는 이미 있는 엔티티 사이에서만 생성
+    # (점수 미달로 제외된 엔티티로 가는 관계는 Neo4j의 MATCH에서도 생성되지 않음)
+    for rel in extra_relationships or []:
+        if rel.get("from") not in entities or rel.get("to") not in entities:
+            continue
+        relationships.append({
+            **rel,
+            "confidence": rel.get("confidence", 0.5),
+            "method": rel.get("method", "cooccurrence"),
+        })
+
+    return {
+        "sources": list(sources.values()),
+        "notes": notes,
+        "entities": list(entities.values()),
+        "mentions": mentions,
+        "relationships": aggregate_relationships(relationships),
+        "filtered_entities": filtered,
+    }
+
+
+def skip_sources(rows: Dict[str, List[Dict]], paths: Set[str]) -> Dict[str, List[Dict]]:
+    """
+    paths 원본 노트의 SourceNote/노트/MENTIONS 행을 뺀 import 행
+
+    재import 전에 GraphDBManager.unchanged_sources(rows["sources"])로 import_hash가 같은 원본을 구해
+    넘기면 변경 없는 원본은 원본 경로 인덱스 조회만 하고 건너뜀 (노트마다 조회하지 않음)
+
+    엔티티와 관계는 Vault 전체에서 병합된 값이므로 그대로 둠 (MERGE 업서트라 다시 써도 결과가 같음)
+    """
+    if not paths:
+        return rows
+    skipped_notes = {note["id"] for note in rows["notes"] if note.get("source_path") in paths}
+    return {
+        **rows,
+        "sources": [source for source in rows.get("sources", []) if source["path"] not in paths],
+        "notes": [note for note in rows["notes"] if note["id"] not in skipped_notes],
+        "mentions": [mention for mention in rows["mentions"] if mention["note_id"] not in skipped_notes],
+    }
+
+
+def import_rows(graph, rows: Dict[str, List[Dict]], batch_size: Optional[int] = None,
+                workers: int = 1) -> Dict[str, Dict]:
+    """
+    build_import_rows 결과를 의존 순서대로 import (원본 노트 → 엔티티 → 노트 → MENTIONS → 관계)
+
+    끝나면 import 세대 번호를 올려 get_graph_stats 캐시를 무효화하고, 메모리 복제본(load_mirror)에 변경분 반영
+
+    Args:
+        graph: GraphDBManager
+        rows: build_import_rows 결과
+        batch_size: 트랜잭션당 행 수 (None이면 GraphDBManager 기본값)
+        workers: 2 이상이면 단계별 병렬 import (GraphDBManager.import_parallel)
+
+    Returns:
+        단계별 {"rows", "seconds", "rows_per_sec"}
+    """
+    kwargs = {"batch_size": batch_size} if batch_size else {}
+    if workers > 1:
+        report = graph.import_parallel(rows, workers=workers, **kwargs)
+        graph.refresh_mirror(rows, graph.bump_generation())
+        return report
+
+    phases = [
+        ("sources", graph.import_sources),
+        ("entities", graph.import_entities),
+        ("notes", graph.import_atomic_notes),
+        ("mentions", graph.import_mentions),
+        ("relationships", graph.import_relationships),
+    ]
+    report = {}
+    for phase, write in phases:
+        start = time.perf_counter()
+        written = write(rows.get(phase, []), **kwargs)
+        elapsed = time.perf_counter() - start
+        report[phase] = {
+            "rows": written,
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(written / elapsed) if elapsed > 0 else 0,
+        }
+    # import 세대 번호 증가 → 통계 캐시 무효화, 메모리 복제본에는 변경분 반영
+    graph.refresh_mirror(rows, graph.bump_generation())
+    return report
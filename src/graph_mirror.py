@@ -0,0 +1,436 @@
+"""
+Graph Mirror
+Entity/AtomicNote 그래프의 프로세스 내 읽기 전용 복제본 (CSR 인접 리스트, NumPy 배열)
+- 이웃/경로/k-hop 탐색을 서버 왕복과 Cypher 계획 없이 메모리에서 실행
+- 노드는 정수 ID (엔티티 이름 → ID, 노트 ID → ID 사전), 관계는 양방향 CSR
+- Neo4j 또는 Stage 결과(graph_import.build_import_rows 행)에서 일괄 로드, import 후 변경분만 반영
+- neo4j 드라이버 없이 import 가능 (from_neo4j는 GraphDBManager를 인자로 받음)
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from note_ids import stable_entity_id
+except ImportError:
+    from src.note_ids import stable_entity_id
+
+# 노드 종류
+ENTITY = 0
+NOTE = 1
+
+# 관계 타입 코드 0번은 노트 → 엔티티 MENTIONS (엔티티 간 탐색에서 제외)
+MENTIONS = "MENTIONS"
+
+# Neo4j 일괄 로드 쿼리 (fetch_size 단위 스트리밍)
+MIRROR_ENTITIES_QUERY = """
+MATCH (e:Entity)
+RETURN e.name AS name, e.label AS label, e.domain AS domain,
+       e.importance AS importance, e.community AS community
+"""
+
+MIRROR_NOTES_QUERY = """
+MATCH (n:AtomicNote)
+RETURN n.id AS id, n.domain AS domain
+"""
+
+MIRROR_MENTIONS_QUERY = """
+MATCH (n:AtomicNote)-[:MENTIONS]->(e:Entity)
+RETURN n.id AS note_id, e.name AS entity
+"""
+
+MIRROR_RELATIONSHIPS_QUERY = """
+MATCH (a:Entity)-[r]->(b:Entity)
+RETURN a.name AS from, type(r) AS type, b.name AS to,
+       coalesce(r.weight, 1) AS weight, r.confidence AS confidence
+"""
+
+
+class GraphMirror:
+    """
+    Entity/AtomicNote 그래프의 CSR 복제본
+
+    관계는 원래 방향(_src → _dst)의 COO 목록으로 보관하고, 탐색용으로 양방향 CSR을 만듦
+    (indptr[i]:indptr[i+1] 구간이 노드 i의 이웃). apply_rows는 새 노드/관계만 추가하고
+    CSR을 벡터 연산으로 다시 만듦 (정렬 1번, O(E log E))
+    """
+
+    def __init__(self):
+        # 정수 ID → 키 (엔티티 이름 / 노트 ID), 종류, 엔티티 label/domain
+        self.keys: List[str] = []
+        self.kinds: List[int] = []
+        self.labels: List[Optional[str]] = []
+        self.domains: List[Optional[str]] = []
+        # graph_analytics 결과 (분석 전에는 None)
+        self.importance: List[Optional[float]] = []
+        self.communities: List[Optional[int]] = []
+        self.entity_ids: Dict[str, int] = {}
+        self.note_ids: Dict[str, int] = {}
+
+        self.rel_types: List[str] = [MENTIONS]
+        self._type_codes: Dict[str, int] = {MENTIONS: 0}
+
+        # 원래 방향의 관계 (src, 타입 코드, dst) → 위치
+        self._edge_index: Dict[Tuple[int, int, int], int] = {}
+        self._src: List[int] = []
+        self._dst: List[int] = []
+        self._type: List[int] = []
+        self._weight: List[float] = []
+        self._confidence: List[Optional[float]] = []
+
+        # 양방향 CSR
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.relptr = np.zeros(0, dtype=np.int64)      # 노드별 엔티티 간 관계 구간의 끝 (그 뒤는 MENTIONS)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.edge_ids = np.zeros(0, dtype=np.int64)     # CSR 위치 → 원래 관계 위치
+        self.edge_types = np.zeros(0, dtype=np.int16)
+        self.edge_weights = np.zeros(0, dtype=np.float32)
+
+        # 로드/갱신 시점의 import 세대 번호 (GraphDBManager가 설정)
+        self.generation: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # 로드 / 갱신
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_rows(cls, rows: Dict[str, List[Dict]]) -> "GraphMirror":
+        """build_import_rows 결과(Stage 결과)에서 생성"""
+        mirror = cls()
+        mirror.apply_rows(rows)
+        return mirror
+
+    @classmethod
+    def from_neo4j(cls, graph) -> "GraphMirror":
+        """
+        Neo4j에서 일괄 로드
+
+        Args:
+            graph: GraphDBManager (세션의 fetch_size 단위로 스트리밍)
+        """
+        with graph.session() as session:
+            rows = {
+                "entities": [record.data() for record in session.run(MIRROR_ENTITIES_QUERY)],
+                "notes": [record.data() for record in session.run(MIRROR_NOTES_QUERY)],
+                "mentions": [record.data() for record in session.run(MIRROR_MENTIONS_QUERY)],
+                "relationships": [record.data() for record in session.run(MIRROR_RELATIONSHIPS_QUERY)],
+            }
+        return cls.from_rows(rows)
+
+    def apply_rows(self, rows: Dict[str, List[Dict]]):
+        """
+        import한 행을 반영 (graph_import.build_import_rows 형식, MERGE와 같은 기준)
+
+        - 같은 이름의 엔티티/같은 ID의 노트는 속성만 갱신
+        - 같은 (from, 타입, to) 관계는 weight/confidence만 갱신
+        - 양 끝 노드가 없는 MENTIONS/관계는 건너뜀 (MATCH와 같은 결과)
+        """
+        for entity in rows.get("entities", []):
+            name = entity.get("name")
+            if not name:
+                continue
+            node = self._entity(name)
+            self.labels[node] = entity.get("label") or self.labels[node] or "CONCEPT"
+            self.domains[node] = entity.get("domain") or self.domains[node] or "general"
+            if entity.get("importance") is not None:
+                self.importance[node] = entity["importance"]
+            if entity.get("community") is not None:
+                self.communities[node] = entity["community"]
+
+        for note in rows.get("notes", []):
+            node = self._note(note["id"])
+            self.domains[node] = note.get("domain") or self.domains[node]
+
+        for mention in rows.get("mentions", []):
+            note = self.note_ids.get(mention["note_id"])
+            entity = self.entity_ids.get(mention["entity"])
+            if note is not None and entity is not None:
+                self._edge(note, MENTIONS, entity, 1.0, None)
+
+        for rel in rows.get("relationships", []):
+            from_node = self.entity_ids.get(rel["from"])
+            to_node = self.entity_ids.get(rel["to"])
+            if from_node is not None and to_node is not None:
+                self._edge(from_node, rel["type"], to_node, rel.get("weight", 1), rel.get("confidence"))
+
+        self._build()
+
+    def _entity(self, name: str) -> int:
+        node = self.entity_ids.get(name)
+        if node is None:
+            node = self.entity_ids[name] = self._add_node(name, ENTITY)
+        return node
+
+    def _note(self, note_id: str) -> int:
+        node = self.note_ids.get(note_id)
+        if node is None:
+            node = self.note_ids[note_id] = self._add_node(note_id, NOTE)
+        return node
+
+    def _add_node(self, key: str, kind: int) -> int:
+        self.keys.append(key)
+        self.kinds.append(kind)
+        self.labels.append(None)
+        self.domains.append(None)
+        self.importance.append(None)
+        self.communities.append(None)
+        return len(self.keys) - 1
+
+    def _edge(self, src: int, rel_type: str, dst: int, weight: float, confidence: Optional[float]):
+        code = self._type_codes.get(rel_type)
+        if code is None:
+            code = self._type_codes[rel_type] = len(self.rel_types)
+            self.rel_types.append(rel_type)
+
+        key = (src, code, dst)
+        position = self._edge_index.get(key)
+        if position is None:
+            self._edge_index[key] = len(self._src)
+            self._src.append(src)
+            self._dst.append(dst)
+            self._type.append(code)
+            self._weight.append(weight)
+            self._confidence.append(confidence)
+        else:
+            self._weight[position] = weight
+            self._confidence[position] = confidence
+
+    def _build(self):
+        """COO 관계 목록 → 양방향 CSR (정방향 + 역방향을 시작 노드 → MENTIONS 여부 순으로 정렬)"""
+        src = np.asarray(self._src, dtype=np.int64)
+        dst = np.asarray(self._dst, dtype=np.int64)
+        edge_ids = np.arange(len(src), dtype=np.int64)
+
+        owners = np.concatenate([src, dst])
+        mentions = np.concatenate([self._type, self._type]) == 0 if len(src) else np.zeros(0, dtype=bool)
+        # 노드별 구간 안에서 엔티티 간 관계를 MENTIONS보다 앞에 배치
+        order = np.lexsort((mentions, owners))
+
+        counts = np.bincount(owners, minlength=len(self.keys))
+        self.indptr = np.zeros(len(self.keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+        self.relptr = self.indptr[:-1] + np.bincount(owners[~mentions], minlength=len(self.keys))
+
+        self.indices = np.concatenate([dst, src])[order].astype(np.int32)
+        self.edge_ids = np.concatenate([edge_ids, edge_ids])[order]
+        self.edge_types = np.asarray(self._type, dtype=np.int16)[self.edge_ids]
+        self.edge_weights = np.asarray(self._weight, dtype=np.float32)[self.edge_ids]
+
+    # ------------------------------------------------------------------
+    # 탐색
+    # ------------------------------------------------------------------
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.keys)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self._src)
+
+    def edge_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """원래 방향의 관계 배열 (src, dst, 타입 코드 - 0은 MENTIONS, weight)"""
+        return (
+            np.asarray(self._src, dtype=np.int64),
+            np.asarray(self._dst, dtype=np.int64),
+            np.asarray(self._type, dtype=np.int16),
+            np.asarray(self._weight, dtype=np.float64),
+        )
+
+    def degree(self, node: int) -> int:
+        """노드 차수 (MENTIONS 포함, Cypher COUNT { (n)--() }와 같은 값)"""
+        return int(self.indptr[node + 1] - self.indptr[node])
+
+    def _expand(self, frontier: np.ndarray, include_mentions: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        frontier 노드들의 CSR 위치를 한 번에 펼침
+
+        Returns:
+            (CSR 위치 배열, 각 위치의 출발 노드 배열)
+        """
+        starts = self.indptr[frontier]
+        ends = self.indptr[frontier + 1] if include_mentions else self.relptr[frontier]
+        counts = ends - starts
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        # 구간 [starts[i], ends[i]) 를 이어 붙인 위치 배열
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+        owners = np.repeat(frontier, counts)
+        return offsets, owners
+
+    def _entity_node(self, node: int) -> Dict:
+        name = self.keys[node]
+        return {
+            "id": stable_entity_id(name),
+            "name": name,
+            "label": self.labels[node],
+            "domain": self.domains[node],
+            "importance": self.importance[node],
+            "community": self.communities[node],
+            "degree": self.degree(node),
+        }
+
+    def _relationship(self, position: int) -> Dict:
+        """CSR 위치 → {"from", "type", "to", "weight", "confidence"} (원래 방향)"""
+        edge = int(self.edge_ids[position])
+        return {
+            "from": self.keys[self._src[edge]],
+            "type": self.rel_types[self._type[edge]],
+            "to": self.keys[self._dst[edge]],
+            "weight": self._weight[edge],
+            "confidence": self._confidence[edge],
+        }
+
+    def neighborhood(self, entity: str, depth: int = 2, fan_out: int = 20, max_nodes: int = 200) -> Dict:
+        """
+        GraphDBManager.get_entity_graph와 같은 결과를 메모리에서 계산
+
+        엔티티 간 관계만 따라가며, 노드마다 이웃을 (관계 weight 합 → importance → 차수 → 이름) 순으로
+        fan_out개만 확장
+        """
+        graph = {"nodes": [], "relationships": [], "adjacency": {}, "truncated": False}
+        root = self.entity_ids.get(entity)
+        if root is None:
+            return graph
+
+        nodes = {root: {**self._entity_node(root), "depth": 0}}
+        relationships: Dict[int, Dict] = {}
+        adjacency: Dict[int, List[int]] = {root: []}
+        frontier = [root]
+
+        for level in range(1, depth + 1):
+            if not frontier:
+                break
+            next_frontier = []
+            for source in frontier:
+                positions, _ = self._expand(np.asarray([source], dtype=np.int64), include_mentions=False)
+                if len(positions) == 0:
+                    continue
+
+                # 이웃별 weight 합 → (weight 합, importance, 차수, 이름) 순 정렬 (자기 자신 제외)
+                neighbors = self.indices[positions]
+                unique, inverse = np.unique(neighbors, return_inverse=True)
+                weights = np.bincount(inverse, weights=self.edge_weights[positions])
+                candidates = [(node, weight) for node, weight in zip(unique.tolist(), weights.tolist())
+                              if node != source]
+                candidates.sort(key=lambda item: (-item[1], -(self.importance[item[0]] or 0),
+                                                  -self.degree(item[0]), self.keys[item[0]]))
+                ranked = [node for node, _ in candidates]
+                if len(ranked) > fan_out:
+                    graph["truncated"] = True
+                    ranked = ranked[:fan_out]
+
+                for node in ranked:
+                    if node not in nodes:
+                        if len(nodes) >= max_nodes:
+                            graph["truncated"] = True
+                            continue
+                        nodes[node] = {**self._entity_node(node), "depth": level}
+                        adjacency[node] = []
+                        next_frontier.append(node)
+                    if node not in adjacency[source]:
+                        adjacency[source].append(node)
+                        adjacency[node].append(source)
+                    for position in positions[neighbors == node].tolist():
+                        edge = int(self.edge_ids[position])
+                        if edge not in relationships:
+                            relationships[edge] = self._relationship(position)
+            frontier = next_frontier
+
+        graph["nodes"] = list(nodes.values())
+        graph["relationships"] = list(relationships.values())
+        graph["adjacency"] = {
+            self.keys[node]: [self.keys[neighbor] for neighbor in neighbors]
+            for node, neighbors in adjacency.items()
+        }
+        return graph
+
+    def shortest_path(self, start: str, end: str, max_depth: int = 5) -> Optional[Dict]:
+        """
+        두 엔티티 사이의 최단 경로 (방향 무시, 모든 관계 타입 - Cypher shortestPath와 같은 기준)
+
+        Returns:
+            {"entities": 경로의 노드 키 목록, "relationships": 관계 타입 목록, "length"} / 경로가 없으면 None
+        """
+        source = self.entity_ids.get(start)
+        target = self.entity_ids.get(end)
+        if source is None or target is None:
+            return None
+        if source == target:
+            return {"entities": [start], "relationships": [], "length": 0}
+
+        parent = np.full(self.num_nodes, -1, dtype=np.int64)
+        parent_edge = np.full(self.num_nodes, -1, dtype=np.int64)
+        visited = np.zeros(self.num_nodes, dtype=bool)
+        visited[source] = True
+        frontier = np.asarray([source], dtype=np.int64)
+
+        for _ in range(max_depth):
+            positions, owners = self._expand(frontier, include_mentions=True)
+            neighbors = self.indices[positions]
+            fresh = ~visited[neighbors]
+            positions, owners, neighbors = positions[fresh], owners[fresh], neighbors[fresh]
+            if len(neighbors) == 0:
+                return None
+
+            # 같은 노드에 여러 부모가 있으면 처음 것 사용
+            frontier, first = np.unique(neighbors, return_index=True)
+            frontier = frontier.astype(np.int64)
+            visited[frontier] = True
+            parent[frontier] = owners[first]
+            parent_edge[frontier] = positions[first]
+
+            if visited[target]:
+                path, rel_types = [target], []
+                while path[-1] != source:
+                    node = path[-1]
+                    rel_types.append(self.rel_types[self._type[int(self.edge_ids[parent_edge[node]])]])
+                    path.append(int(parent[node]))
+                path.reverse()
+                rel_types.reverse()
+                return {
+                    "entities": [self.keys[node] for node in path],
+                    "relationships": rel_types,
+                    "length": len(rel_types),
+                }
+        return None
+
+    def k_hop(self, entity: str, k: int = 2, include_mentions: bool = False) -> Dict[str, int]:
+        """
+        k단계 이내의 노드 (방향 무시)
+
+        Args:
+            include_mentions: False면 엔티티 간 관계만 (결과도 엔티티만)
+
+        Returns:
+            {노드 키: 최소 단계 수} (시작 엔티티 제외)
+        """
+        source = self.entity_ids.get(entity)
+        if source is None:
+            return {}
+
+        hops = np.full(self.num_nodes, -1, dtype=np.int64)
+        hops[source] = 0
+        frontier = np.asarray([source], dtype=np.int64)
+        for level in range(1, k + 1):
+            positions, _ = self._expand(frontier, include_mentions)
+            neighbors = np.unique(self.indices[positions])
+            frontier = neighbors[hops[neighbors] < 0].astype(np.int64)
+            if len(frontier) == 0:
+                break
+            hops[frontier] = level
+
+        found = np.nonzero(hops > 0)[0]
+        return {self.keys[node]: int(hops[node]) for node in found.tolist()}
+
+    def stats(self) -> Dict[str, int]:
+        """노드/관계 수"""
+        return {
+            "entities": len(self.entity_ids),
+            "notes": len(self.note_ids),
+            "relationships": self.num_edges,
+        }
@@ -0,0 +1,85 @@
+"""
+Graph DB Schema
+Neo4j 제약조건/인덱스 정의 (Neo4j 5.x 구문)
+- GraphDBManager.create_schema와 오프라인 bulk import용 schema.cypher가 같은 정의를 사용
+- neo4j 드라이버 없이 import 가능
+"""
+
+from typing import List
+
+# 이전 버전에서 만든 인덱스 - 같은 속성의 유니크 제약조건 생성 전에 삭제
+LEGACY_INDEXES = [
+    # Entity.name은 유니크 제약조건(인덱스 포함)으로 대체
+    "DROP INDEX entity_name_idx IF EXISTS",
+]
+
+CONSTRAINTS = [
+    # Entity 노드 유니크 제약조건
+    "CREATE CONSTRAINT entity_id_unique IF NOT EXISTS FOR (e:Entity) REQUIRE e.id IS UNIQUE",
+    # Entity 이름 유니크 제약조건 (MERGE 키, 동시 import 시 중복 생성 방지)
+    "CREATE CONSTRAINT entity_name_unique IF NOT EXISTS FOR (e:Entity) REQUIRE e.name IS UNIQUE",
+    # AtomicNote 노드 유니크 제약조건
+    "CREATE CONSTRAINT note_id_unique IF NOT EXISTS FOR (n:AtomicNote) REQUIRE n.id IS UNIQUE",
+    # 그래프 메타데이터 노드 (import 세대 번호 등, 키당 1개)
+    "CREATE CONSTRAINT graph_meta_key_unique IF NOT EXISTS FOR (m:GraphMeta) REQUIRE m.key IS UNIQUE",
+    # 원본 노트 경로 유니크 제약조건 (MERGE 키, 경로 조회와 폴더 접두어(STARTS WITH) 조회 인덱스 포함)
+    "CREATE CONSTRAINT source_note_path_unique IF NOT EXISTS FOR (s:SourceNote) REQUIRE s.path IS UNIQUE",
+]
+
+INDEXES = [
+    # AtomicNote 제목 인덱스
+    "CREATE INDEX note_title_idx IF NOT EXISTS FOR (n:AtomicNote) ON (n.title)",
+    # 도메인 인덱스
+    "CREATE INDEX entity_domain_idx IF NOT EXISTS FOR (e:Entity) ON (e.domain)",
+]
+
+# 그래프 메타데이터 노드 라벨 - 통계/삭제 대상에서 제외
+GRAPH_META_LABEL = "GraphMeta"
+
+# 전체 텍스트 인덱스 (db.index.fulltext.queryNodes로 검색, 점수순 정렬)
+# cjk 분석기: 한글/한자/가나는 2-gram, 영문은 소문자 토큰 → 조사가 붙은 한국어도 부분 일치
+FULLTEXT_ANALYZER = "cjk"
+ENTITY_SEARCH_INDEX = "entity_search_idx"
+NOTE_SEARCH_INDEX = "note_search_idx"
+
+FULLTEXT_INDEXES = [
+    # Entity 이름 + 별칭 (문자열 리스트)
+    f"CREATE FULLTEXT INDEX {ENTITY_SEARCH_INDEX} IF NOT EXISTS FOR (e:Entity) ON EACH [e.name, e.aliases] "
+    f"OPTIONS {{indexConfig: {{`fulltext.analyzer`: '{FULLTEXT_ANALYZER}'}}}}",
+    # AtomicNote 제목 + 내용
+    f"CREATE FULLTEXT INDEX {NOTE_SEARCH_INDEX} IF NOT EXISTS FOR (n:AtomicNote) "
+    f"ON EACH [n.title, n.content, n.detailed_content] "
+    f"OPTIONS {{indexConfig: {{`fulltext.analyzer`: '{FULLTEXT_ANALYZER}'}}}}",
+]
+
+
+# 엔티티 간 관계 타입 화이트리스트 (Stage 1 프롬프트 + Stage 2 관계 단서 + 동시 출현)
+# 관계 타입은 Cypher 파라미터로 전달할 수 없어 쿼리 문자열에 들어가므로 목록 밖의 타입은 허용하지 않음
+RELATIONSHIP_TYPES = frozenset([
+    "RELATES_TO", "IS_EXAMPLE_OF", "CAUSES", "SUPPORTS", "CONTRADICTS", "IMPLEMENTS",
+    "DERIVED_FROM", "USES", "BASED_ON", "CO_OCCURS_WITH",
+])
+
+# 화이트리스트에 없는 타입은 이 타입으로 저장 (원래 타입은 original_type 속성)
+FALLBACK_RELATIONSHIP_TYPE = "RELATES_TO"
+
+
+def normalize_relationship_type(rel_type: str) -> str:
+    """관계 타입을 Neo4j 관례(대문자 + 밑줄)로 변환"""
+    return (rel_type or "").strip().upper().replace(" ", "_").replace("-", "_")
+
+
+def relationship_type(rel_type: str) -> str:
+    """화이트리스트 관계 타입 (목록에 없으면 FALLBACK_RELATIONSHIP_TYPE)"""
+    normalized = normalize_relationship_type(rel_type)
+    return normalized if normalized in RELATIONSHIP_TYPES else FALLBACK_RELATIONSHIP_TYPE
+
+
+def schema_statements() -> List[str]:
+    """실행 순서대로 나열한 전체 스키마 문"""
+    return LEGACY_INDEXES + CONSTRAINTS + INDEXES + FULLTEXT_INDEXES
+
+
+def schema_script() -> str:
+    """cypher-shell로 실행할 수 있는 스키마 스크립트 (문마다 세미콜론)"""
+    return "".join(f"{statement};\n" for statement in schema_statements())
@@ -0,0 +1,209 @@
+"""
+Graph Sync
+Stage 결과(원하는 상태)와 Neo4j 그래프(현재 상태)를 비교해 차이만 반영
+- 원본 노트(SourceNote): 새 원본 생성, 해시/mtime이 바뀐 원본 수정, 결과에서 사라진 원본 삭제
+- 노트: 새 노트 생성, content_hash나 출처(FROM_SOURCE)가 바뀐 노트 수정, 결과에서 사라진 노트 삭제
+- MENTIONS / 엔티티 간 관계: 추가·변경·삭제 (관계는 weight/support/confidence/method 비교)
+- 엔티티: 새 엔티티 생성, 속성이 바뀐 엔티티 수정, 더 이상 참조되지 않는 엔티티(고아) 삭제
+- 원본 노트별 변경 요약 + 단계별 변경 수 보고
+
+import_rows는 추가/덮어쓰기만 하므로 원본에서 지운 노트·엔티티·관계가 그래프에 계속 남음.
+sync_graph는 현재 Stage 결과 전체를 원하는 상태로 보고 그 밖의 것은 삭제함
+"""
+
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    from graph_import import aggregate_relationships
+except ImportError:
+    from src.graph_import import aggregate_relationships
+
+# 관계 비교 속성 (MERGE 업서트가 덮어쓰는 속성)
+RELATIONSHIP_FIELDS = ("weight", "support", "confidence", "method")
+
+# 원본 노트 비교 속성
+SOURCE_FIELDS = ("title", "content_hash", "mtime", "import_hash")
+
+
+def _entity_changed(desired: Dict, current: Dict) -> bool:
+    """엔티티 업서트가 속성을 바꾸는지 (별칭은 합집합으로 갱신되므로 새 별칭이 있을 때만)"""
+    if desired.get("label", "CONCEPT") != current.get("label"):
+        return True
+    if desired.get("domain", "general") != current.get("domain"):
+        return True
+    if desired.get("confidence", 1.0) != current.get("confidence"):
+        return True
+    return not set(desired.get("aliases", [])) <= set(current.get("aliases") or [])
+
+
+def plan_sync(rows: Dict[str, List[Dict]], state: Dict) -> Dict:
+    """
+    원하는 상태와 현재 상태의 차이 계산 (Neo4j 불필요)
+
+    Args:
+        rows: graph_import.build_import_rows 결과 (원하는 상태 - Stage 결과 전체)
+        state: GraphDBManager.read_graph_state 결과 (현재 상태)
+
+    Returns:
+        {"source_notes", "notes", "entities", "relationships": {"create", "update", "delete"},
+         "mentions": {"create", "delete"}, "sources": 원본 노트별 {"create", "update", "delete"} 수}
+        - create/update는 import 행, delete는 삭제 키 목록
+    """
+    current_sources: Dict[str, Dict] = state.get("sources", {})
+    current_notes: Dict[str, Dict] = state["notes"]
+    current_entities: Dict[str, Dict] = state["entities"]
+    current_mentions: Set[Tuple[str, str]] = state["mentions"]
+    current_relationships: Dict[Tuple[str, str, str], Dict] = state["relationships"]
+
+    sources: Dict[str, Dict[str, int]] = {}
+
+    def count(source: Optional[str], change: str):
+        summary = sources.setdefault(source or "", {"create": 0, "update": 0, "delete": 0})
+        summary[change] += 1
+
+    # 원본 노트 (SourceNote)
+    source_notes = {"create": [], "update": [], "delete": []}
+    desired_sources = {source["path"]: source for source in rows.get("sources", [])}
+    for path, source in desired_sources.items():
+        current = current_sources.get(path)
+        if current is None:
+            source_notes["create"].append(source)
+        elif any(source.get(field) != current.get(field) for field in SOURCE_FIELDS):
+            source_notes["update"].append(source)
+    source_notes["delete"] = [path for path in current_sources if path not in desired_sources]
+
+    # 노트 (원본별 요약은 원본 경로 기준, 경로가 없는 이전 버전 노트는 제목)
+    notes = {"create": [], "update": [], "delete": []}
+    desired_note_ids = set()
+    for note in rows["notes"]:
+        desired_note_ids.add(note["id"])
+        current = current_notes.get(note["id"])
+        source = note.get("source_path") or note.get("source_note")
+        if current is None:
+            notes["create"].append(note)
+            count(source, "create")
+        elif (not note.get("content_hash") or note.get("content_hash") != current.get("content_hash")
+              or note.get("source_path") != current.get("source_path")):
+            notes["update"].append(note)
+            count(source, "update")
+    for note_id, current in current_notes.items():
+        if note_id not in desired_note_ids:
+            notes["delete"].append(note_id)
+            count(current.get("source_path") or current.get("source_note"), "delete")
+
+    # 엔티티 (삭제는 원하는 상태에 없는 엔티티 = 어떤 노트/관계도 참조하지 않는 엔티티)
+    entities = {"create": [], "update": [], "delete": []}
+    desired_entities = {entity["name"]: entity for entity in rows["entities"]}
+    for name, entity in desired_entities.items():
+        current = current_entities.get(name)
+        if current is None:
+            entities["create"].append(entity)
+        elif _entity_changed(entity, current):
+            entities["update"].append(entity)
+    entities["delete"] = [name for name in current_entities if name not in desired_entities]
+
+    # MENTIONS
+    desired_mentions = {(mention["note_id"], mention["entity"]) for mention in rows["mentions"]}
+    mentions = {
+        "create": [{"note_id": note_id, "entity": entity}
+                   for note_id, entity in desired_mentions - current_mentions],
+        # 삭제되는 노트의 MENTIONS는 노트와 함께 삭제됨
+        "delete": [{"note_id": note_id, "entity": entity}
+                   for note_id, entity in current_mentions - desired_mentions
+                   if note_id in desired_note_ids],
+    }
+
+    # 엔티티 간 관계 (build_import_rows와 같은 기준으로 병합된 상태끼리 비교)
+    relationships = {"create": [], "update": [], "delete": []}
+    desired_relationships = {}
+    for rel in aggregate_relationships(rows["relationships"]):
+        # 양 끝 엔티티가 없는 관계는 MATCH에서 생성되지 않아 현재 상태에도 나타나지 않음 → 매번 create로 잡히지 않게 제외
+        if rel["from"] not in desired_entities or rel["to"] not in desired_entities:
+            continue
+        key = (rel["from"], rel["type"], rel["to"])
+        desired_relationships[key] = rel
+        current = current_relationships.get(key)
+        if current is None:
+            relationships["create"].append(rel)
+        elif any(rel.get(field) != current.get(field) for field in RELATIONSHIP_FIELDS):
+            relationships["update"].append(rel)
+    relationships["delete"] = [
+        {"from": from_entity, "type": rel_type, "to": to_entity}
+        for (from_entity, rel_type, to_entity) in current_relationships
+        if (from_entity, rel_type, to_entity) not in desired_relationships
+        # 삭제되는 엔티티의 관계는 엔티티와 함께 삭제됨
+        and from_entity in desired_entities and to_entity in desired_entities
+    ]
+
+    return {
+        "source_notes": source_notes,
+        "notes": notes,
+        "entities": entities,
+        "mentions": mentions,
+        "relationships": relationships,
+        "sources": sources,
+    }
+
+
+def delta_report(plan: Dict) -> Dict[str, Dict[str, int]]:
+    """계획의 단계별 변경 수"""
+    return {
+        phase: {change: len(items) for change, items in plan[phase].items()}
+        for phase in ("source_notes", "notes", "entities", "mentions", "relationships")
+    }
+
+
+def sync_graph(graph, rows: Dict[str, List[Dict]], batch_size: Optional[int] = None,
+               dry_run: bool = False) -> Dict:
+    """
+    Stage 결과 전체를 원하는 상태로 그래프 동기화 (차이만 배치로 반영)
+
+    적용 순서: 관계/MENTIONS 삭제 → 노트/원본 삭제 → 원본 → 엔티티 → 노트 → MENTIONS → 관계 → 고아 엔티티 삭제
+
+    Args:
+        graph: GraphDBManager
+        rows: graph_import.build_import_rows 결과 (Stage 결과 전체)
+        batch_size: 트랜잭션당 행 수 (None이면 GraphDBManager 기본값)
+        dry_run: True면 차이만 계산하고 반영하지 않음
+
+    Returns:
+        {"delta": 단계별 변경 수, "sources": 원본 노트별 변경 수 (변경된 원본만), "seconds": {"read", "plan", "apply"}}
+    """
+    kwargs = {"batch_size": batch_size} if batch_size else {}
+    seconds = {}
+
+    start = time.perf_counter()
+    state = graph.read_graph_state()
+    seconds["read"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    plan = plan_sync(rows, state)
+    seconds["plan"] = round(time.perf_counter() - start, 3)
+
+    report = {
+        "delta": delta_report(plan),
+        "sources": {source: summary for source, summary in plan["sources"].items() if any(summary.values())},
+        "seconds": seconds,
+    }
+    if dry_run:
+        return report
+
+    start = time.perf_counter()
+    graph.delete_relationships(plan["relationships"]["delete"], **kwargs)
+    graph.delete_mentions(plan["mentions"]["delete"], **kwargs)
+    graph.delete_notes(plan["notes"]["delete"], **kwargs)
+    graph.delete_sources(plan["source_notes"]["delete"], **kwargs)
+    graph.import_sources(plan["source_notes"]["create"] + plan["source_notes"]["update"], **kwargs)
+    graph.import_entities(plan["entities"]["create"] + plan["entities"]["update"], **kwargs)
+    graph.import_atomic_notes(plan["notes"]["create"] + plan["notes"]["update"], **kwargs)
+    graph.import_mentions(plan["mentions"]["create"], **kwargs)
+    graph.import_relationships(plan["relationships"]["create"] + plan["relationships"]["update"], **kwargs)
+    graph.delete_entities(plan["entities"]["delete"], **kwargs)
+    seconds["apply"] = round(time.perf_counter() - start, 3)
+
+    # 삭제는 메모리 복제본에 증분 반영할 수 없으므로 다시 로드
+    graph.bump_generation()
+    if graph.mirror is not None:
+        graph.load_mirror()
+    return report
@@ -0,0 +1,127 @@
+"""
+Atomic Note ID 관리
+원본 노트 경로 + 제목/내용 해시로 결정적(deterministic) ID를 부여
+- 같은 입력이면 재실행해도 같은 ID → Graph import가 멱등(idempotent)
+- 원본 노트가 다르면 제목이 같아도 ID가 충돌하지 않음
+"""
+
+import hashlib
+import json
+import unicodedata
+from typing import Dict
+
+# ID 해시 길이 (hex 16자 = 64bit)
+ID_HASH_LENGTH = 16
+
+# content_hash 계산에 포함하는 필드 (Stage 1 결과 기준, Stage 2에서 추가되는 필드 제외)
+CONTENT_FIELDS = (
+    "title", "content", "detailed_content", "domain", "confidence",
+    "extracted_entities", "relationships",
+)
+
+
+def _normalize(text: str) -> str:
+    """해시 입력 정규화 (유니코드 NFC, 공백 정리, 소문자)"""
+    text = unicodedata.normalize("NFC", text or "")
+    return " ".join(text.split()).lower()
+
+
+def source_key(source_note: Dict) -> str:
+    """
+    원본 노트를 식별하는 키 (vault 기준 상대 경로 우선)
+
+    Args:
+        source_note: Stage 1 결과의 source_note 항목
+    """
+    key = source_note.get("relative_path") or source_note.get("file_path") or source_note.get("title", "")
+    return key.replace("\\", "/")
+
+
+def content_hash(atomic_note: Dict) -> str:
+    """Atomic Note 내용 해시 (변경 감지용, sha256 hex)"""
+    payload = {field: atomic_note.get(field) for field in CONTENT_FIELDS}
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def source_content_hash(text: str) -> str:
+    """원본 노트 본문 해시 (재import 시 원본 변경 확인용, sha256 hex)"""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def stable_note_id(source: str, title: str, disambiguator: str = "") -> str:
+    """
+    원본 경로 + 제목으로 안정적인 Atomic Note ID 생성
+
+    Args:
+        source: 원본 노트 키 (source_key 결과)
+        title: Atomic Note 제목
+        disambiguator: 같은 원본에 같은 제목이 여러 개일 때 구분값 (내용 해시)
+
+    Returns:
+        "note_<hex16>" 형식의 ID
+    """
+    key = f"{_normalize(source)}\n{_normalize(title)}\n{disambiguator}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:ID_HASH_LENGTH]
+    return f"note_{digest}"
+
+
+def stable_entity_id(name: str) -> str:
+    """
+    엔티티 이름(대표 이름)으로 안정적인 Entity ID 생성
+
+    Entity.name이 유니크 키이므로 정규화 없이 이름 그대로 해시 (이름 1개 = ID 1개)
+
+    Returns:
+        "entity_<hex16>" 형식의 ID
+    """
+    digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:ID_HASH_LENGTH]
+    return f"entity_{digest}"
+
+
+def assign_stable_ids(result: Dict) -> Dict:
+    """
+    Stage 1 결과의 모든 Atomic Note에 결정적 ID와 content_hash 부여 (여러 번 실행해도 동일)
+
+    LLM이 만든 ID는 원본 노트 간 충돌하고 실행마다 바뀌므로 덮어씀.
+    같은 결과 안의 related_notes 참조도 새 ID로 바꿈.
+
+    Args:
+        result: decompose_note 결과 (source_note, atomic_notes 포함)
+
+    Returns:
+        같은 result 객체 (제자리 수정)
+    """
+    source = source_key(result.get("source_note", {}))
+    atomic_notes = result.get("atomic_notes", [])
+
+    id_map = {}
+    used_ids = set()
+
+    for atomic_note in atomic_notes:
+        note_hash = content_hash(atomic_note)
+        new_id = stable_note_id(source, atomic_note.get("title", ""))
+        if new_id in used_ids:
+            # 같은 원본 안에서 제목이 중복되면 내용 해시로 구분 (내용까지 같으면 순번 추가)
+            new_id = stable_note_id(source, atomic_note.get("title", ""), note_hash)
+            counter = 1
+            while new_id in used_ids:
+                new_id = stable_note_id(source, atomic_note.get("title", ""), f"{note_hash}:{counter}")
+                counter += 1
+
+        old_id = atomic_note.get("id")
+        if old_id and old_id != new_id:
+            id_map.setdefault(old_id, new_id)
+
+        atomic_note["id"] = new_id
+        atomic_note["content_hash"] = note_hash
+        used_ids.add(new_id)
+
+    # 같은 결과 안의 참조 갱신
+    if id_map:
+        for atomic_note in atomic_notes:
+            related = atomic_note.get("related_notes")
+            if related:
+                atomic_note["related_notes"] = [id_map.get(ref, ref) for ref in related]
+
+    return result
@@ -24,6 +24,7 @@ class ObsidianNote:
     tags: List[str] = field(default_factory=list)
     created_date: Optional[datetime] = None
     modified_date: Optional[datetime] = None
+    relative_path: str = ""  # vault 기준 상대 경로 (vault 위치와 무관한 식별자)
     
     def __repr__(self):
         return f"ObsidianNote(title='{self.title}', links={len(self.links)}, tags={len(self.tags)})"
@@ -96,6 +97,12 @@ class ObsidianVaultLoader:
         # 태그 추출 #tag
         tags = self._extract_tags(content)
         
+        # vault 기준 상대 경로
+        try:
+            relative_path = file_path.resolve().relative_to(self.vault_path.resolve()).as_posix()
+        except ValueError:
+            relative_path = file_path.name
+        
         return ObsidianNote(
             file_path=str(file_path),
             title=file_path.stem,
@@ -104,7 +111,8 @@ class ObsidianVaultLoader:
             links=links,
             tags=tags,
             created_date=created_date,
-            modified_date=modified_date
+            modified_date=modified_date,
+            relative_path=relative_path
         )
     
     def _parse_frontmatter(self, content: str) -> tuple[Dict, str]:
@@ -231,6 +239,7 @@ class ObsidianVaultLoader:
         """
         return {
             "file_path": note.file_path,
+            "relative_path": note.relative_path,
             "title": note.title,
             "content": note.content,
             "frontmatter": note.frontmatter,
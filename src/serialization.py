@@ -0,0 +1,253 @@
+"""
+Pipeline Artifact Serialization
+Stage 1/2/3 산출물(JSON)의 저장/로드를 담당하는 공통 레이어
+- orjson이 설치되어 있으면 빠른 JSON 코덱 사용 (없으면 표준 json)
+- 선택적 압축: gzip (표준 라이브러리), zstd (zstandard 설치 시)
+- 디버깅용 읽기 쉬운 텍스트 모드 (indent=2)
+"""
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+
+# 압축 방식 → 파일 확장자
+COMPRESSION_SUFFIXES = {
+    "none": "",
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+# 매직 바이트 (확장자와 무관하게 압축 여부 판별)
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+PathLike = Union[str, Path]
+
+
+def default_compression() -> str:
+    """환경변수 PKM_ARTIFACT_COMPRESSION (none|gzip|zstd, 기본값: none)"""
+    compression = os.getenv("PKM_ARTIFACT_COMPRESSION", "none").strip().lower() or "none"
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"지원하지 않는 압축 방식: {compression}")
+    return compression
+
+
+def default_readable() -> bool:
+    """환경변수 PKM_ARTIFACT_READABLE=1 이면 들여쓰기된 텍스트로 저장 (디버깅용)"""
+    return os.getenv("PKM_ARTIFACT_READABLE", "0").strip().lower() in ("1", "true", "yes")
+
+
+def encode_json(data: Any, readable: bool = False) -> bytes:
+    """
+    데이터를 UTF-8 JSON 바이트로 인코딩
+
+    Args:
+        data: 직렬화할 데이터
+        readable: True면 indent=2 텍스트 (한글 그대로 유지)
+
+    Returns:
+        UTF-8 인코딩된 JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if readable else 0
+        return orjson.dumps(data, option=option)
+
+    if readable:
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def decode_json(raw: bytes) -> Any:
+    """UTF-8 JSON 바이트를 디코딩"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def compress(raw: bytes, compression: str) -> bytes:
+    """바이트를 지정한 방식으로 압축"""
+    if compression == "none":
+        return raw
+    if compression == "gzip":
+        return gzip.compress(raw, compresslevel=6)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("zstd 압축을 사용하려면 zstandard를 설치하세요: pip install zstandard")
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    raise ValueError(f"지원하지 않는 압축 방식: {compression}")
+
+
+def decompress(raw: bytes) -> bytes:
+    """매직 바이트로 압축 방식을 판별하여 해제"""
+    if raw.startswith(_GZIP_MAGIC):
+        return gzip.decompress(raw)
+    if raw.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise ImportError("zstd 파일을 읽으려면 zstandard를 설치하세요: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(raw)
+    return raw
+
+
+def artifact_base(path: PathLike) -> Path:
+    """압축 확장자(.gz, .zst)를 제거한 기본 경로 (예: X_atomic.json.gz → X_atomic.json)"""
+    path = Path(path)
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if suffix and path.name.endswith(suffix):
+            return path.with_name(path.name[:-len(suffix)])
+    return path
+
+
+def resolve_artifact(path: PathLike) -> Optional[Path]:
+    """
+    기본 경로에 해당하는 실제 파일 찾기 (압축 여부 무관)
+
+    여러 형식이 함께 존재하면 가장 최근에 수정된 파일을 반환
+
+    Args:
+        path: 기본 경로 (예: X_atomic.json) 또는 압축 파일 경로
+
+    Returns:
+        존재하는 파일 경로 또는 None
+    """
+    base = artifact_base(path)
+    candidates = [
+        base.with_name(base.name + suffix)
+        for suffix in COMPRESSION_SUFFIXES.values()
+    ]
+    existing = [p for p in candidates if p.exists()]
+    if not existing:
+        return None
+    return max(existing, key=lambda p: p.stat().st_mtime)
+
+
+def artifact_exists(path: PathLike) -> bool:
+    """기본 경로에 해당하는 산출물이 (어떤 형식으로든) 존재하는지 확인"""
+    return resolve_artifact(path) is not None
+
+
+def save_artifact(data: Any, path: PathLike, compression: Optional[str] = None,
+                  readable: Optional[bool] = None) -> Path:
+    """
+    산출물 저장
+
+    Args:
+        data: 저장할 데이터
+        path: 기본 경로 (예: X_atomic.json) - 압축 시 확장자가 자동으로 붙음
+        compression: none | gzip | zstd (None이면 환경변수 기본값)
+        readable: 들여쓰기 텍스트 모드 (None이면 환경변수 기본값)
+
+    Returns:
+        실제로 저장된 파일 경로
+    """
+    if compression is None:
+        compression = default_compression()
+    if readable is None:
+        readable = default_readable()
+
+    base = artifact_base(path)
+    target = base.with_name(base.name + COMPRESSION_SUFFIXES[compression])
+    return _write_artifact(base, target, compress(encode_json(data, readable=readable), compression))
+
+
+def _write_artifact(base: Path, target: Path, payload: bytes) -> Path:
+    """압축/인코딩이 끝난 바이트를 원자적으로 기록"""
+    # 임시 파일에 쓴 뒤 교체 (중간에 중단되어도 기존 파일 유지)
+    tmp_path = target.with_name(target.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, target)
+
+    # 다른 형식의 이전 파일 정리 (형식 변경 시 중복 방지)
+    for suffix in COMPRESSION_SUFFIXES.values():
+        stale = base.with_name(base.name + suffix)
+        if stale != target and stale.exists():
+            stale.unlink()
+
+    return target
+
+
+def save_artifact_if_changed(data: Any, path: PathLike, compression: Optional[str] = None,
+                             readable: Optional[bool] = None) -> Tuple[Path, bool]:
+    """
+    내용이 바뀐 경우에만 산출물 저장 (재실행 시 불필요한 쓰기 방지)
+
+    압축 파일은 헤더(gzip mtime 등)가 매번 달라지므로 압축 해제한 JSON 바이트로 비교
+
+    Returns:
+        (파일 경로, 실제로 썼는지 여부)
+    """
+    if compression is None:
+        compression = default_compression()
+    if readable is None:
+        readable = default_readable()
+
+    base = artifact_base(path)
+    target = base.with_name(base.name + COMPRESSION_SUFFIXES[compression])
+    raw = encode_json(data, readable=readable)
+
+    if resolve_artifact(base) == target:
+        with open(target, "rb") as f:
+            if decompress(f.read()) == raw:
+                return target, False
+
+    return _write_artifact(base, target, compress(raw, compression)), True
+
+
+def load_artifact(path: PathLike) -> Any:
+    """
+    산출물 로드 (압축 형식 자동 판별)
+
+    Args:
+        path: 기본 경로 또는 실제 파일 경로
+
+    Returns:
+        로드된 데이터
+    """
+    path = Path(path)
+    # 실제 파일 경로가 주어지면 추가 탐색 없이 바로 로드
+    resolved = path if path.is_file() else resolve_artifact(path)
+    if resolved is None:
+        raise FileNotFoundError(f"산출물을 찾을 수 없습니다: {path}")
+
+    with open(resolved, "rb") as f:
+        raw = f.read()
+    return decode_json(decompress(raw))
+
+
+def find_artifacts(directory: PathLike, pattern: str) -> List[Path]:
+    """
+    디렉토리에서 패턴에 맞는 산출물 찾기 (압축 파일 포함, 기본 경로 기준 중복 제거)
+
+    Args:
+        directory: 검색 디렉토리
+        pattern: 기본 파일명 패턴 (예: "*_atomic.json")
+
+    Returns:
+        실제 파일 경로 리스트 (기본 경로 기준 정렬)
+    """
+    directory = Path(directory)
+    found = {}
+
+    for suffix in COMPRESSION_SUFFIXES.values():
+        for file_path in directory.glob(pattern + suffix):
+            base = artifact_base(file_path)
+            current = found.get(base)
+            if current is None or file_path.stat().st_mtime > current.stat().st_mtime:
+                found[base] = file_path
+
+    return [found[base] for base in sorted(found)]
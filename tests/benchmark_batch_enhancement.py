@@ -0,0 +1,46 @@
+"""
+Stage 2 배치 개선 처리량 벤치마크
+process_atomic_notes_batch의 프로세스 수별 처리량 (notes/sec)
+"""
+
+import copy
+import os
+import sys
+import time
+from pathlib import Path
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from entity_extraction_simple import SimpleEntityExtractor
+from benchmark_data import make_result_set
+
+NUM_SOURCES = 500
+NOTES_PER_SOURCE = 8
+
+
+if __name__ == "__main__":
+    print("⚙️  Stage 2 배치 개선 벤치마크")
+    print("=" * 60)
+
+    extractor = SimpleEntityExtractor()
+    results = make_result_set(NUM_SOURCES, NOTES_PER_SOURCE)
+    total_notes = NUM_SOURCES * NOTES_PER_SOURCE
+
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1))) or [1]
+    print(f"Atomic Notes: {total_notes}개, CPU 코어: {cores}개")
+
+    baseline = None
+    print(f"\n{'workers':>8s} {'시간(s)':>9s} {'notes/sec':>11s} {'배속':>7s}")
+    for workers in worker_counts:
+        batch = copy.deepcopy(results)
+        start = time.perf_counter()
+        extractor.process_atomic_notes_batch(batch, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        throughput = total_notes / elapsed
+        baseline = baseline or throughput
+        print(f"{workers:8d} {elapsed:9.2f} {throughput:11.0f} {throughput / baseline:6.2f}x")
+
+    print("\n✅ 벤치마크 완료!")
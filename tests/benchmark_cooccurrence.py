@@ -0,0 +1,67 @@
+"""
+동시 출현 관계 마이닝 벤치마크
+합성 Vault (Atomic Notes 1만 / 10만 개, Zipf 분포 엔티티)에서 단계별 소요 시간 측정
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import numpy as np
+
+from cooccurrence import build_incidence_matrix, cooccurrence_scores, mine_cooccurrence_relationships
+
+NOTE_COUNTS = [10_000, 100_000]
+VOCABULARY_SIZE = 20_000
+ENTITIES_PER_NOTE = (3, 12)
+
+
+def make_results(num_notes, seed=42):
+    """Zipf 분포로 엔티티를 뽑은 합성 Stage 2 결과 (원본 노트당 10개)"""
+    rng = np.random.default_rng(seed)
+    vocabulary = [f"엔티티{i}" for i in range(VOCABULARY_SIZE)]
+    sizes = rng.integers(ENTITIES_PER_NOTE[0], ENTITIES_PER_NOTE[1] + 1, size=num_notes)
+    picks = (rng.zipf(1.3, size=int(sizes.sum())) - 1) % VOCABULARY_SIZE
+
+    results = []
+    position = 0
+    for start in range(0, num_notes, 10):
+        atomic_notes = []
+        for index in range(start, min(start + 10, num_notes)):
+            size = sizes[index]
+            atomic_notes.append({
+                "id": f"note_{index}",
+                "entities_enhanced": [vocabulary[i] for i in picks[position:position + size]],
+            })
+            position += size
+        results.append({"atomic_notes": atomic_notes})
+    return results
+
+
+if __name__ == "__main__":
+    print("📈 동시 출현 관계 마이닝 벤치마크")
+    print("=" * 60)
+
+    print(f"\n{'노트 수':>8s} {'행렬(s)':>8s} {'점수(s)':>8s} {'전체(s)':>8s} {'엔티티':>8s} {'후보 쌍':>10s} {'관계':>8s}")
+    for num_notes in NOTE_COUNTS:
+        results = make_results(num_notes)
+
+        start = time.perf_counter()
+        incidence, entity_names, _ = build_incidence_matrix(results)
+        matrix_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = cooccurrence_scores(incidence, min_count=2)
+        score_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        relationships = mine_cooccurrence_relationships(results, min_count=2, min_npmi=0.2)
+        total_time = time.perf_counter() - start
+
+        print(f"{num_notes:8d} {matrix_time:8.2f} {score_time:8.2f} {total_time:8.2f} "
+              f"{len(entity_names):8d} {len(scores['count']):10d} {len(relationships):8d}")
+
+    print("\n✅ 벤치마크 완료!")
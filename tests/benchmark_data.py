@@ -0,0 +1,102 @@
+"""
+벤치마크용 데이터 생성 헬퍼
+실제 atomic_notes 폴더가 있으면 그 결과를, 없으면 한글 위주의 합성 결과를 사용
+"""
+
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from serialization import find_artifacts, load_artifact
+from note_ids import assign_stable_ids
+
+ATOMIC_NOTES_DIR = Path(__file__).parent.parent / "atomic_notes"
+
+KOREAN_TERMS = [
+    "인공지능", "머신러닝", "딥러닝", "신경망", "지식그래프", "온톨로지", "자연어처리",
+    "강화학습", "데이터베이스", "검색엔진", "추천시스템", "임베딩", "트랜스포머", "생산성",
+    "메모", "제텔카스텐", "독서", "글쓰기", "학습", "기억", "습관", "목표", "프로젝트",
+]
+ENGLISH_TERMS = ["AI", "LLM", "Neo4j", "Python", "Obsidian", "Gemini", "GPU", "API", "Graph", "Vector"]
+RELATION_TYPES = ["relates_to", "is_example_of", "causes", "supports", "implements", "derived_from"]
+SENTENCE_TEMPLATES = [
+    "{a}은 {b}를 사용하여 문제를 해결합니다.",
+    "{a}는 {b}의 예시입니다.",
+    "{a}가 {b}를 지지합니다.",
+    "{a} uses {b} for retrieval.",
+    "{a}와 {b}는 밀접하게 연결되어 있으며 실무에서 함께 활용됩니다.",
+    "{a}은 {b}에 기반하여 설계되었습니다.",
+]
+
+
+def make_atomic_note(rng: random.Random, index: int, terms: List[str]) -> Dict:
+    """합성 Atomic Note 1개 생성"""
+    entities = rng.sample(terms, k=min(len(terms), rng.randint(3, 8)))
+    sentences = [
+        rng.choice(SENTENCE_TEMPLATES).format(a=rng.choice(entities), b=rng.choice(entities))
+        for _ in range(rng.randint(4, 12))
+    ]
+    return {
+        "id": f"note_{index:06d}",
+        "title": f"{entities[0]}와 {entities[1]}의 관계",
+        "content": sentences[0],
+        "detailed_content": " ".join(sentences[1:]),
+        "extracted_entities": entities,
+        "relationships": [
+            {"from": rng.choice(entities), "type": rng.choice(RELATION_TYPES), "to": rng.choice(entities)}
+            for _ in range(rng.randint(1, 4))
+        ],
+        "domain": rng.choice(["technology", "productivity", "learning"]),
+        "related_notes": [],
+        "confidence": rng.choice(["high", "medium", "low"]),
+    }
+
+
+def make_result_set(num_sources: int = 200, notes_per_source: int = 8, seed: int = 42) -> List[Dict]:
+    """
+    decompose_vault 결과와 같은 형태의 합성 결과 리스트 생성
+
+    Args:
+        num_sources: 원본 노트 수
+        notes_per_source: 원본 노트당 Atomic Note 수
+        seed: 난수 시드 (재현 가능)
+    """
+    rng = random.Random(seed)
+    terms = KOREAN_TERMS + ENGLISH_TERMS
+    results = []
+    index = 0
+
+    for source_index in range(num_sources):
+        atomic_notes = []
+        for _ in range(notes_per_source):
+            atomic_notes.append(make_atomic_note(rng, index, terms))
+            index += 1
+        results.append(assign_stable_ids({
+            "atomic_notes": atomic_notes,
+            "hierarchy": {terms[source_index % len(terms)]: rng.sample(terms, k=3)},
+            "summary": "이 문서는 개인 지식 관리와 관련된 여러 개념을 설명합니다.",
+            "source_note": {
+                "title": f"원본노트_{source_index:04d}",
+                "file_path": f"/vault/폴더_{source_index % 10}/원본노트_{source_index:04d}.md",
+                "relative_path": f"폴더_{source_index % 10}/원본노트_{source_index:04d}.md",
+                "created_date": "2025-01-01T00:00:00",
+            },
+        }))
+
+    return results
+
+
+def load_result_set(pattern: str = "*_atomic.json") -> List[Dict]:
+    """실제 Stage 1/2 결과가 있으면 로드, 없으면 합성 데이터 반환"""
+    if ATOMIC_NOTES_DIR.exists():
+        files = find_artifacts(ATOMIC_NOTES_DIR, pattern)
+        if files:
+            print(f"📂 실제 데이터 사용: {len(files)}개 파일 ({ATOMIC_NOTES_DIR})")
+            return [load_artifact(f) for f in files]
+
+    print("🧪 합성 데이터 사용 (atomic_notes 폴더 없음)")
+    return make_result_set()
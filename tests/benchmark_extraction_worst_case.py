@@ -0,0 +1,79 @@
+"""
+Entity Extraction 최악 조건 벤치마크
+적대적 입력(엔티티 다수, 매우 긴 텍스트, 반복 조사 등)에서 노트당 지연 시간 추적
+- guard: 기본 시간 예산/길이 제한 적용
+- no guard: 시간 예산 없음 (항상 전체 regex 경로)
+"""
+
+import copy
+import sys
+import time
+from pathlib import Path
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from entity_extraction_simple import SimpleEntityExtractor
+from benchmark_data import KOREAN_TERMS, SENTENCE_TEMPLATES
+
+
+def note(note_id, text, entities=()):
+    return {
+        "id": note_id,
+        "title": note_id,
+        "content": "",
+        "detailed_content": text,
+        "extracted_entities": list(entities),
+        "relationships": [],
+    }
+
+
+def adversarial_corpus():
+    """벤치마크용 적대적 입력 모음"""
+    many_entities = [f"{term}{i}" for i in range(2000) for term in KOREAN_TERMS[:1]]
+    normal_text = " ".join(
+        SENTENCE_TEMPLATES[i % len(SENTENCE_TEMPLATES)].format(a=KOREAN_TERMS[i % 20], b=KOREAN_TERMS[(i + 3) % 20])
+        for i in range(4000)
+    )
+    return [
+        note("many_entities", " ".join(f"{e}은 {e}를 사용합니다." for e in many_entities[:500]), many_entities),
+        note("long_text", normal_text, KOREAN_TERMS),
+        note("long_hangul_run", "한" * 50000),
+        note("repeated_particles", "은는이가을를의에와과" * 5000),
+        note("entity_with_particles", "머신러닝은은은은은은은" * 3000, ["머신러닝"]),
+        note("capitalized_run", "Graph " * 20000),
+        note("overlapping_entities", "가" * 5000, ["가" * n for n in range(1, 200)]),
+    ]
+
+
+def run(extractor, corpus):
+    rows = []
+    for item in corpus:
+        atomic_note = copy.deepcopy(item)
+        start = time.perf_counter()
+        extractor.enhance_gemini_entities(atomic_note)
+        elapsed = time.perf_counter() - start
+        rows.append((item["id"], len(item["detailed_content"]), elapsed,
+                     atomic_note.get("extraction_degraded") or "-"))
+    return rows
+
+
+if __name__ == "__main__":
+    print("🧨 Entity Extraction 최악 조건 벤치마크")
+    print("=" * 60)
+
+    corpus = adversarial_corpus()
+    guarded = SimpleEntityExtractor(verbose=False)
+    unguarded = SimpleEntityExtractor(verbose=False, time_budget=None, max_text_length=10 ** 9)
+
+    guarded_rows = run(guarded, corpus)
+    unguarded_rows = run(unguarded, corpus)
+
+    print(f"\n{'입력':24s} {'길이':>8s} {'guard(ms)':>10s} {'no guard(ms)':>13s}  {'성능 저하 사유':s}")
+    for (name, length, guarded_time, reason), (_, _, unguarded_time, _) in zip(guarded_rows, unguarded_rows):
+        print(f"{name:24s} {length:8d} {guarded_time * 1000:10.1f} {unguarded_time * 1000:13.1f}  {reason}")
+
+    stats = guarded.guard_stats
+    print(f"\n최악 지연: {stats['slowest_seconds'] * 1000:.1f}ms ({stats['slowest_note']})")
+    print(f"성능 저하 노트: {stats['degraded']}개 (시간 예산 초과: {stats['over_budget']}개) / {stats['notes']}개")
+    print("\n✅ 벤치마크 완료!")
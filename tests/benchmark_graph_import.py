@@ -0,0 +1,139 @@
+"""
+Stage 3 Graph import 처리량 벤치마크 (Neo4j 필요)
+항목별 메서드(create_*/link_*) vs 작업 단위(unit_of_work) vs UNWIND 배치 메서드(import_*)
+vs 단계별 병렬 import(import_parallel)의 rows/sec 비교
+
+벤치마크 데이터는 이름/ID 앞에 접두사를 붙여 기존 그래프와 섞이지 않게 하고, 끝나면 삭제
+"""
+
+import copy
+import os
+import sys
+import time
+from pathlib import Path
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from dotenv import load_dotenv
+from graph_db import GraphDBManager
+from graph_import import build_import_rows, import_rows
+from benchmark_data import make_result_set
+
+# .env 파일 로드
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
+
+PREFIX = "__bench__"
+NUM_SOURCES = 250
+NOTES_PER_SOURCE = 8
+# 항목별 경로는 느리므로 일부 노트만 측정
+PER_ITEM_NOTES = 200
+
+
+def prefixed_rows(results):
+    """벤치마크 전용 접두사를 붙인 import 행"""
+    rows = build_import_rows(copy.deepcopy(results))
+    for row in rows["notes"]:
+        row["id"] = PREFIX + row["id"]
+    for row in rows["entities"]:
+        row["name"] = PREFIX + row["name"]
+    for row in rows["mentions"]:
+        row["note_id"] = PREFIX + row["note_id"]
+        row["entity"] = PREFIX + row["entity"]
+    for row in rows["relationships"]:
+        row["from"] = PREFIX + row["from"]
+        row["to"] = PREFIX + row["to"]
+    return rows
+
+
+def count_rows(rows):
+    return sum(len(rows[key]) for key in ("notes", "entities", "mentions", "relationships"))
+
+
+def cleanup(graph):
+    """벤치마크 노드만 삭제"""
+    with graph.session() as session:
+        session.run(
+            """
+            MATCH (n)
+            WHERE (n:AtomicNote AND n.id STARTS WITH $prefix) OR (n:Entity AND n.name STARTS WITH $prefix)
+            DETACH DELETE n
+            """,
+            prefix=PREFIX,
+        )
+
+
+def import_per_item(graph, rows):
+    """항목마다 세션 + 트랜잭션 1개"""
+    for note in rows["notes"]:
+        graph.create_atomic_note_node(note)
+    for entity in rows["entities"]:
+        graph.create_entity_node(entity["name"], entity)
+    for mention in rows["mentions"]:
+        graph.link_note_to_entity(mention["note_id"], mention["entity"])
+    for rel in rows["relationships"]:
+        graph.create_relationship(rel["from"], rel["type"], rel["to"], rel["confidence"],
+                                  {"method": rel["method"]})
+
+
+if __name__ == "__main__":
+    print("🚚 Stage 3 Graph import 벤치마크")
+    print("=" * 60)
+
+    results = make_result_set(NUM_SOURCES, NOTES_PER_SOURCE)
+    all_rows = prefixed_rows(results)
+    sample_rows = prefixed_rows(results[:max(PER_ITEM_NOTES // NOTES_PER_SOURCE, 1)])
+
+    with GraphDBManager(NEO4J_URI, (NEO4J_USER, NEO4J_PASSWORD), max_connection_pool_size=32) as graph:
+        graph.create_schema()
+        cleanup(graph)
+
+        print(f"\n{'방식':<14s} {'행 수':>8s} {'시간(s)':>9s} {'rows/sec':>10s}")
+
+        start = time.perf_counter()
+        import_per_item(graph, sample_rows)
+        elapsed = time.perf_counter() - start
+        per_item_rate = count_rows(sample_rows) / elapsed
+        print(f"{'항목별':<14s} {count_rows(sample_rows):8d} {elapsed:9.2f} {per_item_rate:10.0f}")
+        cleanup(graph)
+
+        # 같은 항목별 호출을 작업 단위로 묶으면 세션 1개 + batch_size마다 트랜잭션 1개
+        start = time.perf_counter()
+        with graph.unit_of_work() as uow:
+            import_per_item(uow, all_rows)
+        elapsed = time.perf_counter() - start
+        rate = count_rows(all_rows) / elapsed
+        print(f"{'unit_of_work':<14s} {count_rows(all_rows):8d} {elapsed:9.2f} {rate:10.0f}"
+              f"  ({rate / per_item_rate:.0f}x)")
+        cleanup(graph)
+
+        for batch_size in (500, 1000, 5000):
+            start = time.perf_counter()
+            import_rows(graph, all_rows, batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+            rate = count_rows(all_rows) / elapsed
+            label = f"UNWIND {batch_size}"
+            print(f"{label:<14s} {count_rows(all_rows):8d} {elapsed:9.2f} {rate:10.0f}"
+                  f"  ({rate / per_item_rate:.0f}x)")
+            cleanup(graph)
+
+        # 단계별 병렬 import - 단계별 처리량
+        for workers in (2, 4, 8):
+            start = time.perf_counter()
+            report = import_rows(graph, all_rows, workers=workers)
+            elapsed = time.perf_counter() - start
+            rate = count_rows(all_rows) / elapsed
+            label = f"병렬 x{workers}"
+            print(f"{label:<14s} {count_rows(all_rows):8d} {elapsed:9.2f} {rate:10.0f}"
+                  f"  ({rate / per_item_rate:.0f}x)")
+            for phase, phase_report in report.items():
+                print(f"    {phase:<14s} {phase_report['rows']:8d} {phase_report['seconds']:9.2f} "
+                      f"{phase_report['rows_per_sec']:10d}")
+            cleanup(graph)
+
+    print("\n✅ 벤치마크 완료!")
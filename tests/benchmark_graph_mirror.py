@@ -0,0 +1,60 @@
+"""
+메모리 그래프 복제본(GraphMirror) 벤치마크 (Neo4j 불필요)
+Stage 결과 행에서 CSR 복제본을 만들고 이웃/최단 경로/k-hop 쿼리당 지연시간 측정
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graph_import import build_import_rows
+from graph_mirror import GraphMirror
+from benchmark_data import make_result_set
+
+NUM_SOURCES = 1000
+NOTES_PER_SOURCE = 8
+REPEAT = 200
+
+
+def measure(label: str, query, repeat: int = REPEAT):
+    """쿼리당 지연시간 (p50/p95, ms)"""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query()
+        latencies.append((time.perf_counter() - start) * 1000)
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(f"{label:<22s} {statistics.median(latencies):9.3f} {p95:9.3f}")
+
+
+if __name__ == "__main__":
+    print("🧠 GraphMirror 벤치마크")
+    print("=" * 60)
+
+    rows = build_import_rows(make_result_set(NUM_SOURCES, NOTES_PER_SOURCE))
+
+    start = time.perf_counter()
+    mirror = GraphMirror.from_rows(rows)
+    print(f"로드: {time.perf_counter() - start:.2f}s  {mirror.stats()}")
+
+    # 증분 반영: 노트 1개 분량의 행
+    delta = build_import_rows(make_result_set(1, 1, seed=7))
+    start = time.perf_counter()
+    mirror.apply_rows(delta)
+    print(f"증분 반영: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    names = sorted(mirror.entity_ids, key=lambda name: -mirror.degree(mirror.entity_ids[name]))
+    hub, leaf = names[0], names[-1]
+
+    print(f"\n{'쿼리':<22s} {'p50(ms)':>9s} {'p95(ms)':>9s}")
+    measure(f"이웃 depth=2 ({hub})", lambda: mirror.neighborhood(hub, depth=2))
+    measure(f"이웃 depth=3 ({hub})", lambda: mirror.neighborhood(hub, depth=3))
+    measure("최단 경로", lambda: mirror.shortest_path(hub, leaf))
+    measure("k-hop k=2", lambda: mirror.k_hop(hub, k=2))
+    measure("k-hop k=2 (노트 포함)", lambda: mirror.k_hop(hub, k=2, include_mentions=True))
+
+    print("\n✅ 벤치마크 완료!")
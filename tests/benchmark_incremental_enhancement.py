@@ -0,0 +1,61 @@
+"""
+Stage 2 증분 처리 벤치마크
+전체 처리 → 변경 없는 재실행 → 노트 1% 변경 후 재실행 시간 비교
+"""
+
+import copy
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from entity_extraction_simple import SimpleEntityExtractor
+from entity_matcher import EntityGazetteer
+from enhancement_cache import EnhancementCache
+from benchmark_data import make_result_set
+
+NUM_SOURCES = 500
+NOTES_PER_SOURCE = 8
+
+
+def run(results, cache_path):
+    """사전 생성 + 캐시 기반 배치 처리 1회 (Stage 2 스크립트와 같은 순서)"""
+    batch = copy.deepcopy(results)
+    start = time.perf_counter()
+    extractor = SimpleEntityExtractor(verbose=False)
+    extractor.gazetteer = EntityGazetteer.from_results(batch)
+    with EnhancementCache(cache_path, extractor.version) as cache:
+        enhanced = extractor.process_atomic_notes_batch(batch, cache=cache)
+        stats = dict(cache.stats)
+    return enhanced, stats, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print("♻️  Stage 2 증분 처리 벤치마크")
+    print("=" * 60)
+
+    results = make_result_set(NUM_SOURCES, NOTES_PER_SOURCE)
+    print(f"Atomic Notes: {NUM_SOURCES * NOTES_PER_SOURCE}개")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = Path(tmp_dir) / "enhancement_cache.jsonl"
+
+        full, stats, elapsed = run(results, cache_path)
+        print(f"\n{'실행':<16s} {'시간(s)':>9s} {'재사용':>7s} {'처리':>7s}")
+        print(f"{'전체 처리':<16s} {elapsed:9.2f} {stats['hits']:7d} {stats['misses']:7d}")
+
+        unchanged, stats, elapsed = run(results, cache_path)
+        print(f"{'변경 없음':<16s} {elapsed:9.2f} {stats['hits']:7d} {stats['misses']:7d}")
+        print(f"  결과 동일: {full == unchanged}")
+
+        # 1% 노트 내용 변경
+        for result in results[::100]:
+            for note in result["atomic_notes"]:
+                note["content"] += " 수정됨"
+        _, stats, elapsed = run(results, cache_path)
+        print(f"{'1% 변경':<16s} {elapsed:9.2f} {stats['hits']:7d} {stats['misses']:7d}")
+
+    print("\n✅ 벤치마크 완료!")
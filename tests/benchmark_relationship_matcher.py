@@ -0,0 +1,113 @@
+"""
+관계 추출 벤치마크
+기존 regex alternation 방식 vs Aho-Corasick 방식 (엔티티 10 / 100 / 1,000개)
+"""
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from entity_extraction_simple import SimpleEntityExtractor
+from benchmark_data import KOREAN_TERMS, ENGLISH_TERMS, SENTENCE_TEMPLATES
+
+ENTITY_COUNTS = [10, 100, 1000]
+NUM_TEXTS = 20
+
+
+def legacy_extract_relationships(text, entities):
+    """기존 구현 (엔티티 alternation을 패턴 20여 개에 삽입) - 비교용 사본"""
+    relationships = []
+    korean_patterns = {
+        "supports": [r"({})(?:이|가)\s+({})(?:을|를)\s+지지", r"({})(?:은|는)\s+({})(?:을|를)\s+옹호"],
+        "contradicts": [r"({})(?:이|가)\s+({})(?:와|과)\s+모순", r"({})(?:은|는)\s+({})(?:와|과)\s+반대"],
+        "is_example_of": [r"({})(?:은|는)\s+({})의\s+예시", r"({})(?:은|는)\s+({})의\s+사례"],
+        "causes": [r"({})(?:이|가)\s+({})(?:을|를)\s+야기", r"({})(?:은|는)\s+({})(?:을|를)\s+초래"],
+        "implements": [r"({})(?:이|가)\s+({})(?:을|를)\s+구현", r"({})(?:은|는)\s+({})(?:을|를)\s+실현"],
+        "uses": [r"({})(?:이|가)\s+({})(?:을|를)\s+사용", r"({})(?:은|는)\s+({})(?:을|를)\s+활용"],
+        "based_on": [r"({})(?:은|는)\s+({})에?\s+기반", r"({})(?:은|는)\s+({})를?\s+바탕"],
+    }
+    english_patterns = {
+        "supports": [r"({}) supports? ({})"],
+        "contradicts": [r"({}) contradicts? ({})"],
+        "is_example_of": [r"({}) is an? example of ({})"],
+        "causes": [r"({}) causes? ({})"],
+        "implements": [r"({}) implements? ({})"],
+        "uses": [r"({}) uses? ({})"],
+        "based_on": [r"({}) is based on ({})"],
+    }
+    entity_pattern = "|".join(re.escape(e) for e in entities)
+    all_patterns = {**korean_patterns, **english_patterns}
+    for relation_type, patterns in all_patterns.items():
+        for pattern_template in patterns:
+            pattern = pattern_template.format(entity_pattern, entity_pattern)
+            try:
+                for match in re.finditer(pattern, text, re.IGNORECASE):
+                    relationships.append({
+                        "from": match.group(1).strip(),
+                        "type": relation_type,
+                        "to": match.group(2).strip(),
+                    })
+            except:
+                pass
+    return relationships
+
+
+def make_entities(count, rng):
+    """실제 용어 + 합성 용어로 엔티티 목록 생성"""
+    base = KOREAN_TERMS + ENGLISH_TERMS
+    entities = list(base[:count])
+    while len(entities) < count:
+        entities.append(f"{rng.choice(KOREAN_TERMS)}{len(entities)}")
+    return entities
+
+
+def make_texts(entities, rng):
+    """엔티티를 포함한 문장으로 텍스트 생성"""
+    texts = []
+    for _ in range(NUM_TEXTS):
+        sentences = [
+            rng.choice(SENTENCE_TEMPLATES).format(a=rng.choice(entities), b=rng.choice(entities))
+            for _ in range(30)
+        ]
+        texts.append(" ".join(sentences))
+    return texts
+
+
+def triples(relationships):
+    return sorted((r["from"].lower(), r["type"], r["to"].lower()) for r in relationships)
+
+
+if __name__ == "__main__":
+    print("🔗 관계 추출 벤치마크 (regex alternation vs Aho-Corasick)")
+    print("=" * 60)
+
+    extractor = SimpleEntityExtractor()
+    rng = random.Random(7)
+
+    print(f"\n{'엔티티 수':>8s} {'기존(ms/노트)':>14s} {'AC(ms/노트)':>12s} {'배속':>8s} {'관계 수(기존/AC)':>18s}")
+    for count in ENTITY_COUNTS:
+        entities = make_entities(count, rng)
+        texts = make_texts(entities, rng)
+
+        start = time.perf_counter()
+        legacy = [legacy_extract_relationships(text, entities) for text in texts]
+        legacy_time = (time.perf_counter() - start) / len(texts)
+
+        start = time.perf_counter()
+        current = [extractor.extract_relationships(text, entities) for text in texts]
+        current_time = (time.perf_counter() - start) / len(texts)
+
+        legacy_count = sum(len(r) for r in legacy)
+        current_count = sum(len(r) for r in current)
+        print(f"{count:8d} {legacy_time * 1000:14.2f} {current_time * 1000:12.2f} "
+              f"{legacy_time / current_time:7.1f}x {legacy_count:>9d}/{current_count:<8d}")
+
+    # 관계 수 차이: 기존 구현은 {**korean, **english} 병합 시 같은 키의 한글 패턴이 덮어써져
+    # 영문 패턴만 동작했고, alternation이 가장 긴 엔티티 대신 먼저 나온 접두어를 선택함
+    print("\nℹ️  관계 수 차이는 기존 구현의 한글 패턴 누락/접두어 매칭 문제 때문입니다.")
+    print("\n✅ 벤치마크 완료!")
@@ -0,0 +1,122 @@
+"""
+엔티티 검색 지연시간 벤치마크 (Neo4j 필요)
+이전 방식(CONTAINS 라벨 스캔) vs 전체 텍스트 인덱스(search_entities)의 쿼리당 지연시간 비교
+
+엔티티 10만 개를 접두사를 붙여 생성하고, 끝나면 삭제
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from dotenv import load_dotenv
+from graph_db import GraphDBManager
+from benchmark_data import ENGLISH_TERMS, KOREAN_TERMS
+
+# .env 파일 로드
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
+
+PREFIX = "__bench__"
+NUM_ENTITIES = 100_000
+NUM_QUERIES = 50
+QUERIES = ["인공지능", "지식그래프", "학습", "neo4j", "Python", "graph", "추천"]
+
+# 이전 search_entities 쿼리
+CONTAINS_QUERY = """
+MATCH (e:Entity)
+WHERE e.name CONTAINS $search_query
+RETURN e
+ORDER BY e.name
+LIMIT $limit
+"""
+
+
+def make_entities(num_entities: int, seed: int = 42):
+    """합성 엔티티 행 (한글/영문 용어 조합 + 일련번호)"""
+    rng = random.Random(seed)
+    terms = KOREAN_TERMS + ENGLISH_TERMS
+    return [
+        {
+            "name": f"{PREFIX}{rng.choice(terms)} {rng.choice(terms)} {index}",
+            "label": "CONCEPT",
+            "domain": rng.choice(["technology", "productivity", "learning"]),
+            "aliases": [f"{rng.choice(terms)}{index}"],
+        }
+        for index in range(num_entities)
+    ]
+
+
+def cleanup(graph):
+    """벤치마크 엔티티만 삭제"""
+    with graph.session() as session:
+        session.run(
+            """
+            MATCH (e:Entity) WHERE e.name STARTS WITH $prefix
+            CALL { WITH e DETACH DELETE e } IN TRANSACTIONS OF 10000 ROWS
+            """,
+            prefix=PREFIX,
+        ).consume()
+
+
+def measure(search, num_queries: int):
+    """쿼리별 지연시간(ms) 목록"""
+    latencies = []
+    for index in range(num_queries):
+        query = QUERIES[index % len(QUERIES)]
+        start = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label: str, latencies):
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(f"{label:<16s} {statistics.median(latencies):9.1f} {p95:9.1f} {max(latencies):9.1f}")
+
+
+if __name__ == "__main__":
+    print("🔎 엔티티 검색 벤치마크")
+    print("=" * 60)
+
+    with GraphDBManager(NEO4J_URI, (NEO4J_USER, NEO4J_PASSWORD)) as graph:
+        graph.create_schema()
+        cleanup(graph)
+
+        start = time.perf_counter()
+        graph.import_entities(make_entities(NUM_ENTITIES), batch_size=5000)
+        with graph.session() as session:
+            # 전체 텍스트 인덱스는 비동기로 채워지므로 측정 전에 대기
+            session.run("CALL db.awaitIndexes(600)").consume()
+        print(f"엔티티 {NUM_ENTITIES:,}개 생성 + 인덱싱: {time.perf_counter() - start:.1f}s")
+
+        def contains_search(query):
+            with graph.session() as session:
+                return list(session.run(CONTAINS_QUERY, search_query=query, limit=10))
+
+        # 워밍업 (쿼리 플랜 캐시, 페이지 캐시)
+        measure(contains_search, len(QUERIES))
+        measure(graph.search_entities, len(QUERIES))
+
+        print(f"\n{'방식':<16s} {'p50(ms)':>9s} {'p95(ms)':>9s} {'max(ms)':>9s}")
+        report("CONTAINS", measure(contains_search, NUM_QUERIES))
+        report("전체 텍스트", measure(graph.search_entities, NUM_QUERIES))
+        report("전체 텍스트 p2", measure(lambda q: graph.search_entities(q, skip=10), NUM_QUERIES))
+
+        print("\n상위 결과 예시:")
+        for hit in graph.search_entities("지식그래프", limit=3):
+            print(f"   {hit['score']:.2f}  {hit['name']}")
+
+        cleanup(graph)
+
+    print("\n✅ 벤치마크 완료!")
@@ -0,0 +1,96 @@
+"""
+Serialization 벤치마크
+전체 결과 셋 기준으로 형식별 디스크 크기와 저장/로드 시간 비교
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import serialization
+from serialization import load_artifact, save_artifact
+from benchmark_data import load_result_set
+
+REPEAT = 5
+
+
+def bench_legacy(results, directory: Path):
+    """기존 방식: json.dump(indent=2, ensure_ascii=False) / json.load"""
+    start = time.perf_counter()
+    paths = []
+    for i, result in enumerate(results):
+        path = directory / f"legacy_{i}_atomic.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        paths.append(path)
+    save_time = time.perf_counter() - start
+
+    load_times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                json.load(f)
+        load_times.append(time.perf_counter() - start)
+
+    size = sum(p.stat().st_size for p in paths)
+    return size, save_time, min(load_times)
+
+
+def bench_mode(results, directory: Path, compression: str, readable: bool):
+    """serialization 레이어 사용"""
+    start = time.perf_counter()
+    paths = [
+        save_artifact(result, directory / f"{compression}_{int(readable)}_{i}_atomic.json",
+                      compression=compression, readable=readable)
+        for i, result in enumerate(results)
+    ]
+    save_time = time.perf_counter() - start
+
+    load_times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for path in paths:
+            load_artifact(path)
+        load_times.append(time.perf_counter() - start)
+
+    size = sum(p.stat().st_size for p in paths)
+    return size, save_time, min(load_times)
+
+
+if __name__ == "__main__":
+    print("📦 Serialization 벤치마크")
+    print("=" * 60)
+
+    results = load_result_set()
+    total_notes = sum(len(r.get("atomic_notes", [])) for r in results)
+    print(f"결과 파일: {len(results)}개, Atomic Notes: {total_notes}개")
+    print(f"JSON 코덱: {'orjson' if serialization.orjson else 'json (표준 라이브러리)'}")
+    print("=" * 60)
+
+    modes = [("none", True), ("none", False), ("gzip", False)]
+    if serialization.zstandard is not None:
+        modes.append(("zstd", False))
+    else:
+        print("ℹ️  zstandard 미설치 - zstd 모드 생략")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        rows = [("legacy json indent=2",) + bench_legacy(results, tmp_dir)]
+        for compression, readable in modes:
+            label = f"{compression}{' readable' if readable else ''}"
+            rows.append((label,) + bench_mode(results, tmp_dir, compression, readable))
+
+    baseline_size = rows[0][1]
+    baseline_load = rows[0][3]
+    print(f"\n{'형식':24s} {'크기(KB)':>10s} {'비율':>7s} {'저장(ms)':>10s} {'로드(ms)':>10s} {'로드 배속':>9s}")
+    for label, size, save_time, load_time in rows:
+        print(f"{label:24s} {size / 1024:10.1f} {size / baseline_size:6.2f}x "
+              f"{save_time * 1000:10.1f} {load_time * 1000:10.1f} {baseline_load / load_time:8.2f}x")
+
+    print("\n✅ 벤치마크 완료!")
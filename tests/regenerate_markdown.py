@@ -12,6 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from atomic_note_agent import AtomicNoteAgent
+from serialization import find_artifacts, load_artifact
 
 print("📝 기존 JSON → 마크다운 재생성")
 print("=" * 60)
@@ -25,7 +26,7 @@ if not atomic_notes_dir.exists():
     exit(1)
 
 # JSON 파일 찾기
-json_files = list(atomic_notes_dir.glob("*_atomic.json"))
+json_files = find_artifacts(atomic_notes_dir, "*_atomic.json")
 
 if not json_files:
     print("❌ JSON 파일이 없습니다.")
@@ -45,9 +46,8 @@ for i, json_file in enumerate(json_files, 1):
     print(f"\n[{i}/{len(json_files)}] {json_file.name}")
     
     try:
-        # JSON 로드
-        with open(json_file, 'r', encoding='utf-8') as f:
-            result = json.load(f)
+        # JSON 로드 (압축 형식 자동 판별)
+        result = load_artifact(json_file)
         
         atomic_notes_count = len(result.get("atomic_notes", []))
         print(f"  ℹ️  Atomic Notes: {atomic_notes_count}개")
@@ -14,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 from dotenv import load_dotenv
 from atomic_note_agent import AtomicNoteAgent
 from obsidian_loader import ObsidianVaultLoader
+from serialization import artifact_exists, find_artifacts, load_artifact, save_artifact
 
 # .env 파일 로드
 env_path = Path(__file__).parent.parent / '.env'
@@ -87,9 +88,8 @@ if choice == "1":
     # JSON 저장
     output_file = f"./atomic_notes/{test_note.title.replace('/', '_')}_atomic.json"
     os.makedirs("./atomic_notes", exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
-    print(f"\n💾 저장됨: {output_file}")
+    saved_path = save_artifact(result, output_file)
+    print(f"\n💾 저장됨: {saved_path}")
     
     # 마크다운 저장
     agent.save_as_markdown(result)
@@ -163,10 +163,9 @@ elif choice == "2":
         os.makedirs("./atomic_notes", exist_ok=True)
         
         # 이미 JSON 파일이 존재하는지 확인
-        if os.path.exists(output_file):
+        if artifact_exists(output_file):
             print(f"  ♻️  이미 처리됨 - JSON 로드 중...")
-            with open(output_file, 'r', encoding='utf-8') as f:
-                result = json.load(f)
+            result = load_artifact(output_file)
             print(f"  ✅ 로드 완료: {len(result.get('atomic_notes', []))}개 Atomic Notes")
         else:
             # 새로 분해
@@ -174,11 +173,10 @@ elif choice == "2":
             result = agent.decompose_note(note)
             
             # JSON 저장
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
+            saved_path = save_artifact(result, output_file)
             
             print(f"  ✅ 완료: {len(result.get('atomic_notes', []))}개 생성")
-            print(f"  💾 저장: {output_file}")
+            print(f"  💾 저장: {saved_path}")
         
         # 마크다운 저장 (항상 수행)
         print(f"  📝 마크다운 생성 중...")
@@ -195,7 +193,7 @@ elif choice == "3":
     existing_files = []
     new_files = []
     if os.path.exists("./atomic_notes"):
-        existing_files = [f for f in os.listdir("./atomic_notes") if f.endswith("_atomic.json")]
+        existing_files = find_artifacts("./atomic_notes", "*_atomic.json")
     
     if existing_files:
         print(f"\n💡 이미 {len(existing_files)}개의 JSON 파일이 존재합니다.")
@@ -209,11 +207,9 @@ elif choice == "3":
             # 마크다운만 재생성
             print("\n📝 기존 JSON에서 마크다운 생성 중...")
             for json_file in existing_files:
-                json_path = os.path.join("./atomic_notes", json_file)
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    result = json.load(f)
+                result = load_artifact(json_file)
                 agent.save_as_markdown(result)
-                print(f"  ✅ {json_file} → 마크다운 생성")
+                print(f"  ✅ {json_file.name} → 마크다운 생성")
             print("\n✅ 마크다운 재생성 완료!")
             exit(0)
         elif sub_choice == "2":
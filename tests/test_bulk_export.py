@@ -0,0 +1,95 @@
+"""
+Bulk Export 테스트 스크립트
+Stage 3 (오프라인): Atomic Notes → neo4j-admin import용 CSV
+
+트랜잭션 import(test_graph_import.py)로 만든 그래프와 행 수를 비교하여 결과 검증 가능
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from dotenv import load_dotenv
+from serialization import artifact_exists, find_artifacts, load_artifact
+from note_ids import assign_stable_ids
+from entity_records import DEFAULT_MIN_SCORE
+from graph_export import export_bulk_import
+
+# .env 파일 로드
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+print("📦 Stage 3 (오프라인): neo4j-admin bulk import 파일 생성")
+print("=" * 60)
+
+MIN_ENTITY_SCORE = float(os.getenv("PKM_MIN_ENTITY_SCORE", DEFAULT_MIN_SCORE))
+atomic_notes_dir = Path(__file__).parent.parent / "atomic_notes"
+output_dir = Path(os.getenv("PKM_BULK_EXPORT_DIR", str(Path(__file__).parent.parent / "graph_bulk_import")))
+
+if not atomic_notes_dir.exists():
+    print("❌ atomic_notes 폴더가 없습니다.")
+    print("   먼저 Stage 1과 2를 실행하세요.")
+    exit(1)
+
+# Enhanced 파일 우선, 없으면 일반 파일 사용 (Stage 3와 동일)
+json_files = find_artifacts(atomic_notes_dir, "*_enhanced.json") or find_artifacts(atomic_notes_dir, "*_atomic.json")
+
+if not json_files:
+    print("❌ Atomic Notes JSON 파일이 없습니다.")
+    print("   먼저 Stage 1을 실행하세요.")
+    exit(1)
+
+results = [assign_stable_ids(load_artifact(json_file)) for json_file in json_files]
+
+cooccurrence = []
+cooccurrence_file = atomic_notes_dir / "cooccurrence_relationships.json"
+if artifact_exists(cooccurrence_file):
+    cooccurrence = load_artifact(cooccurrence_file).get("relationships", [])
+
+counts = export_bulk_import(results, output_dir, min_entity_score=MIN_ENTITY_SCORE,
+                            extra_relationships=cooccurrence)
+
+print(f"\n📂 출력: {output_dir}")
+print(f"  - entities.csv:      {counts['entities']}행")
+print(f"  - atomic_notes.csv:  {counts['notes']}행")
+print(f"  - source_notes.csv:  {counts['sources']}행")
+print(f"  - mentions.csv:      {counts['mentions']}행")
+print(f"  - from_source.csv:   {counts['from_source']}행")
+print(f"  - relationships.csv: {counts['relationships']}행")
+print(f"  - schema.cypher, import.sh")
+print("\n실행 방법: Neo4j 정지 → sh import.sh → Neo4j 시작 → cypher-shell -f schema.cypher")
+
+# 트랜잭션 import 결과와 행 수 비교 (같은 Stage 결과만 import된 그래프 기준)
+choice = input("\nNeo4j의 현재 그래프와 행 수를 비교할까요? (y/n): ").strip().lower()
+if choice == "y":
+    from graph_db import GraphDBManager
+
+    NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+    NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+    NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
+
+    with GraphDBManager(NEO4J_URI, (NEO4J_USER, NEO4J_PASSWORD)) as graph:
+        stats = graph.get_graph_stats()
+
+    graph_counts = {
+        "entities": stats["nodes"].get("Entity", 0),
+        "notes": stats["nodes"].get("AtomicNote", 0),
+        "sources": stats["nodes"].get("SourceNote", 0),
+        "mentions": stats["relationships"].get("MENTIONS", 0),
+        "from_source": stats["relationships"].get("FROM_SOURCE", 0),
+        "relationships": (stats["total_relationships"] - stats["relationships"].get("MENTIONS", 0)
+                          - stats["relationships"].get("FROM_SOURCE", 0)),
+    }
+
+    print(f"\n{'':<15s} {'CSV':>10s} {'Neo4j':>10s}")
+    mismatches = 0
+    for key, count in counts.items():
+        mark = "✅" if count == graph_counts[key] else "❌"
+        mismatches += count != graph_counts[key]
+        print(f"{key:<15s} {count:10d} {graph_counts[key]:10d}  {mark}")
+    print("\n✅ 행 수 일치" if not mismatches else f"\n⚠️  {mismatches}개 항목 불일치")
+
+print("\n✅ Bulk export 완료!")
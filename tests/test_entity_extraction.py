@@ -13,6 +13,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from dotenv import load_dotenv
 from entity_extraction_simple import SimpleEntityExtractor
+from enhancement_cache import EnhancementCache
+from serialization import artifact_base, find_artifacts, load_artifact, save_artifact_if_changed
+from note_ids import assign_stable_ids
+from entity_matcher import EntityGazetteer
+from entity_canonicalizer import EntityCanonicalizer
+from cooccurrence import mine_cooccurrence_relationships
 
 # .env 파일 로드
 env_path = Path(__file__).parent.parent / '.env'
@@ -32,7 +38,7 @@ if not atomic_notes_dir.exists():
     print("   먼저 Stage 1 (test_atomic_agent.py)를 실행하세요.")
     exit(1)
 
-json_files = list(atomic_notes_dir.glob("*_atomic.json"))
+json_files = find_artifacts(atomic_notes_dir, "*_atomic.json")
 
 if not json_files:
     print("❌ Atomic Notes JSON 파일이 없습니다.")
@@ -40,19 +46,33 @@ if not json_files:
     exit(1)
 
 print(f"\n📂 발견된 Atomic Notes 파일: {len(json_files)}개")
+
+# JSON 로드 (압축 형식 자동 판별) + 결정적 ID 보장
+loaded_files = [(json_file, assign_stable_ids(load_artifact(json_file))) for json_file in json_files]
+
+# 별칭 테이블 (선택): {대표 이름: [별칭, ...]}
+alias_file = os.getenv("PKM_ENTITY_ALIASES", str(Path(__file__).parent.parent / "entity_aliases.json"))
+canonicalizer = EntityCanonicalizer.from_file(alias_file)
+
+# Vault 전체 엔티티 사전 (노트 A의 엔티티를 노트 B에서도 인식)
+extractor.gazetteer = EntityGazetteer.from_results(data for _, data in loaded_files)
+for canonical, aliases in canonicalizer.alias_table.items():
+    extractor.gazetteer.add(canonical, aliases)
+print(f"📖 엔티티 사전: {len(extractor.gazetteer)}개 엔티티")
+
+# 증분 캐시: 입력 해시 + Extractor 버전이 같은 노트는 다시 처리하지 않음
+cache = EnhancementCache(atomic_notes_dir / "enhancement_cache.jsonl", extractor.version)
+print(f"🗃️  증분 캐시: {len(cache)}개 노트")
 print("=" * 60)
 
 # 각 파일 처리
 total_entities = 0
 total_relationships = 0
+total_skipped = 0
 
-for json_file in json_files:
+for json_file, data in loaded_files:
     print(f"\n📄 처리 중: {json_file.name}")
     
-    # JSON 로드
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
     atomic_notes = data.get("atomic_notes", [])
     
     if not atomic_notes:
@@ -60,22 +80,25 @@ for json_file in json_files:
         continue
     
     # 각 Atomic Note 개선
+    skipped = 0
     for i, note in enumerate(atomic_notes, 1):
-        print(f"\n  [{i}/{len(atomic_notes)}] {note.get('title', 'Untitled')}")
-        
-        # Entity 개선
-        enhanced_note = extractor.enhance_gemini_entities(note)
+        # Entity 개선 (변경 없는 노트는 캐시 재사용)
+        enhanced_note, reused = extractor.enhance_incremental(note, cache)
         
         # 통계
         entities = enhanced_note.get("entities_enhanced", [])
         relationships = enhanced_note.get("relationships_enhanced", [])
+        total_entities += len(entities)
+        total_relationships += len(relationships)
         
+        if reused:
+            skipped += 1
+            continue
+        
+        print(f"\n  [{i}/{len(atomic_notes)}] {note.get('title', 'Untitled')}")
         print(f"    ✅ 엔티티: {len(entities)}개")
         print(f"    🔗 관계: {len(relationships)}개")
         
-        total_entities += len(entities)
-        total_relationships += len(relationships)
-        
         # 샘플 출력
         if entities:
             print(f"    📝 엔티티 샘플: {entities[:5]}")
@@ -85,14 +108,47 @@ for json_file in json_files:
             for rel in relationships[:3]:
                 print(f"       {rel['from']} --[{rel['type']}]--> {rel['to']}")
     
-    # 개선된 결과 저장
-    output_file = json_file.parent / f"{json_file.stem}_enhanced.json"
-    data["atomic_notes"] = atomic_notes
+    if skipped:
+        print(f"  ⏭️  변경 없음: {skipped}개 노트 (캐시 사용)")
+    total_skipped += skipped
+
+# 삭제된 노트의 캐시 레코드 정리
+cache.compact(keep_ids=(note.get("id") for _, data in loaded_files for note in data.get("atomic_notes", [])))
+
+# 엔티티 정규화: 조사/띄어쓰기/대소문자/별칭 차이를 하나의 대표 이름으로 병합
+print("\n" + "=" * 60)
+print("🧹 엔티티 정규화 (대표 이름 + 별칭 병합)")
+canonicalizer.fit_results(data for _, data in loaded_files)
+canonicalizer.apply_results([data for _, data in loaded_files])
+alias_map = canonicalizer.alias_map()
+print(f"  ✅ 병합된 표기: {len(alias_map)}개")
+for alias, canonical in list(alias_map.items())[:5]:
+    print(f"     {alias} → {canonical}")
+
+# 개선된 결과 저장
+for json_file, data in loaded_files:
+    if not data.get("atomic_notes"):
+        continue
+    
+    base_file = artifact_base(json_file)
+    output_file = base_file.parent / f"{base_file.stem}_enhanced.json"
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    saved_path, written = save_artifact_if_changed(data, output_file)
     
-    print(f"\n  💾 저장: {output_file.name}")
+    if written:
+        print(f"  💾 저장: {saved_path.name}")
+
+# Vault 전체 동시 출현 관계 (NumPy/SciPy 필요)
+print("\n📈 동시 출현 관계 마이닝")
+try:
+    cooccurrence = mine_cooccurrence_relationships([data for _, data in loaded_files])
+    saved_path, written = save_artifact_if_changed({"relationships": cooccurrence},
+                                                   atomic_notes_dir / "cooccurrence_relationships.json")
+    print(f"  ✅ co_occurs_with 관계: {len(cooccurrence)}개")
+    if written:
+        print(f"  💾 저장: {saved_path.name}")
+except ImportError as e:
+    print(f"  ⏭️  스킵: {e}")
 
 # 전체 통계
 print("\n" + "=" * 60)
@@ -101,5 +157,9 @@ print("=" * 60)
 print(f"총 엔티티: {total_entities}개")
 print(f"총 관계: {total_relationships}개")
 print(f"처리된 파일: {len(json_files)}개")
+print(f"캐시 재사용 노트: {total_skipped}개")
+guard = extractor.guard_stats
+print(f"성능 저하 처리 노트: {guard['degraded']}개 (시간 예산 초과: {guard['over_budget']}개)")
+print(f"최대 노트 처리 시간: {guard['slowest_seconds'] * 1000:.1f}ms ({guard['slowest_note']})")
 print("\n✅ Stage 2 완료!")
 
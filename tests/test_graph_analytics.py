@@ -0,0 +1,67 @@
+"""
+Graph 분석 스크립트
+Stage 3 이후: 엔티티 그래프 분석 (PageRank, 차수, 커뮤니티, 노트 수) → Neo4j 노드 속성
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# src 폴더를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import numpy as np
+from scipy import sparse
+from dotenv import load_dotenv
+from graph_db import GraphDBManager
+from graph_analytics import label_propagation, run_analytics
+
+# .env 파일 로드
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+print("📐 Graph 분석: PageRank / 차수 / 커뮤니티 / 노트 수")
+print("=" * 60)
+
+
+def _undirected(n, edges):
+    rows = [a for a, _ in edges] + [b for _, b in edges]
+    cols = [b for _, b in edges] + [a for a, _ in edges]
+    return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+
+
+# 라벨 전파 기본 검사 (Neo4j 없이): 이분 구조에서 라벨이 뒤집히며 갈라지지 않아야 함
+print("\n🧪 커뮤니티 검사 (경로 / 스타 / 분리된 간선)")
+cases = [
+    ("경로 X-Y-Q", _undirected(3, [(0, 1), (1, 2)]), [0, 0, 0]),
+    ("스타 (중심 1 + 잎 5)", _undirected(6, [(0, leaf) for leaf in range(1, 6)]), [0] * 6),
+    ("분리된 간선 2개", _undirected(4, [(0, 1), (2, 3)]), [0, 0, 1, 1]),
+]
+for name, adjacency, expected in cases:
+    result = label_propagation(adjacency).tolist()
+    assert result == expected, f"{name}: {result} != {expected}"
+    print(f"  ✓ {name}: {result}")
+
+NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
+
+try:
+    with GraphDBManager(NEO4J_URI, (NEO4J_USER, NEO4J_PASSWORD)) as graph:
+        summary = run_analytics(graph)
+
+        seconds = summary["seconds"]
+        print(f"\n✅ 엔티티 {summary['entities']}개, 노트 {summary['notes']}개 기록")
+        print(f"   커뮤니티: {summary['communities']}개")
+        print(f"   로드 {seconds['load']:.2f}s / 계산 {seconds['compute']:.2f}s / 기록 {seconds['write']:.2f}s")
+
+        print("\n🏆 PageRank 상위 엔티티:")
+        for row in summary["top_entities"]:
+            print(f"  - {row['name']:<20s} pagerank={row['pagerank']:.4f} degree={row['degree']:4d} "
+                  f"notes={row['note_count']:4d} community={row['community']}")
+
+except Exception as e:
+    print(f"\n❌ 에러 발생: {e}")
+    print("\nNeo4j 서버가 실행 중인지, Stage 3 import가 끝났는지 확인하세요.")
+    import traceback
+    traceback.print_exc()
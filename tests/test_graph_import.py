@@ -5,7 +5,7 @@ Stage 3: Atomic Notes → Neo4j Graph DB
 
 import os
 import sys
-import json
+import time
 from pathlib import Path
 
 # src 폴더를 Python 경로에 추가
@@ -13,6 +13,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from dotenv import load_dotenv
 from graph_db import GraphDBManager
+from serialization import artifact_exists, find_artifacts, load_artifact
+from note_ids import assign_stable_ids
+from entity_records import DEFAULT_MIN_SCORE
+from graph_import import build_import_rows, import_rows, skip_sources
+from graph_sync import sync_graph
 
 # .env 파일 로드
 env_path = Path(__file__).parent.parent / '.env'
@@ -29,6 +34,14 @@ NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
 print(f"🔧 Neo4j 설정:")
 print(f"   URI: {NEO4J_URI}")
 print(f"   User: {NEO4J_USER}")
+
+# 이 점수 미만의 엔티티(패턴 매칭 잡음)는 Graph에 넣지 않음
+MIN_ENTITY_SCORE = float(os.getenv("PKM_MIN_ENTITY_SCORE", DEFAULT_MIN_SCORE))
+print(f"   최소 엔티티 점수: {MIN_ENTITY_SCORE}")
+
+# 병렬 import 워커 수 (1이면 순차 배치 import)
+IMPORT_WORKERS = int(os.getenv("PKM_IMPORT_WORKERS", "4"))
+print(f"   Import 워커: {IMPORT_WORKERS}개")
 print("=" * 60)
 
 # Enhanced JSON 파일 로드 (Stage 2 결과)
@@ -40,8 +53,8 @@ if not atomic_notes_dir.exists():
     exit(1)
 
 # Enhanced 파일 우선, 없으면 일반 파일 사용
-enhanced_files = list(atomic_notes_dir.glob("*_enhanced.json"))
-regular_files = list(atomic_notes_dir.glob("*_atomic.json"))
+enhanced_files = find_artifacts(atomic_notes_dir, "*_enhanced.json")
+regular_files = find_artifacts(atomic_notes_dir, "*_atomic.json")
 
 json_files = enhanced_files if enhanced_files else regular_files
 
@@ -59,7 +72,8 @@ print("=" * 60)
 
 try:
     # Graph DB 연결
-    graph = GraphDBManager(NEO4J_URI, (NEO4J_USER, NEO4J_PASSWORD))
+    graph = GraphDBManager(NEO4J_URI, (NEO4J_USER, NEO4J_PASSWORD),
+                           max_connection_pool_size=max(IMPORT_WORKERS * 2, 10))
     
     # 스키마 생성
     graph.create_schema()
@@ -68,9 +82,10 @@ try:
     print("\n처리 옵션:")
     print("1. 기존 데이터 유지하고 추가")
     print("2. 모든 데이터 삭제 후 새로 시작")
-    print("3. 종료")
+    print("3. 동기화 (바뀐 것만 반영, 사라진 노트/엔티티/관계 삭제)")
+    print("4. 종료")
     
-    choice = input("\n선택 (1-3): ").strip()
+    choice = input("\n선택 (1-4): ").strip()
     
     if choice == "2":
         confirm = input("⚠️  정말 모든 데이터를 삭제하시겠습니까? (yes/no): ").strip().lower()
@@ -79,114 +94,75 @@ try:
         else:
             print("취소됨")
             exit(0)
-    elif choice == "3":
+    elif choice not in ("1", "3"):
         print("종료")
         exit(0)
     
-    # 통계
-    total_notes = 0
-    total_entities = 0
-    total_relationships = 0
-    
-    # 각 파일 처리
+    # 모든 파일 로드 (압축 형식 자동 판별) + 결정적 ID 보장
+    results = []
     for json_file in json_files:
-        print(f"\n📄 처리 중: {json_file.name}")
-        
-        # JSON 로드
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        atomic_notes = data.get("atomic_notes", [])
-        source_note = data.get("source_note", {})
-        
-        if not atomic_notes:
-            print("  ⏭️  Atomic Notes가 없습니다 - 스킵")
+        data = assign_stable_ids(load_artifact(json_file))
+        if not data.get("atomic_notes"):
+            print(f"  ⏭️  {json_file.name}: Atomic Notes가 없습니다 - 스킵")
             continue
+        results.append(data)
+    
+    # Vault 전체 동시 출현 관계 (Stage 2에서 생성된 경우)
+    cooccurrence = []
+    cooccurrence_file = atomic_notes_dir / "cooccurrence_relationships.json"
+    if artifact_exists(cooccurrence_file):
+        cooccurrence = load_artifact(cooccurrence_file).get("relationships", [])
+        print(f"\n📈 동시 출현 관계: {len(cooccurrence)}개")
+    
+    # 노트/엔티티/MENTIONS/관계 행으로 변환 후 UNWIND 배치 import
+    rows = build_import_rows(results, min_entity_score=MIN_ENTITY_SCORE, extra_relationships=cooccurrence)
+    print(f"\n📦 배치 import: 원본 {len(rows['sources'])}개, 노트 {len(rows['notes'])}개, 엔티티 {len(rows['entities'])}개, "
+          f"MENTIONS {len(rows['mentions'])}개, 관계 {len(rows['relationships'])}개")
+    
+    if choice == "3":
+        # 현재 Stage 결과 전체를 원하는 상태로 보고 차이만 반영
+        sync_report = sync_graph(graph, rows)
+        print("\n🔄 동기화 결과:")
+        for phase, delta in sync_report["delta"].items():
+            changes = ", ".join(f"{change} {size}" for change, size in delta.items())
+            print(f"  - {phase:<14s} {changes}")
+        print(f"  변경된 원본 노트: {len(sync_report['sources'])}개")
+        for source, summary in sorted(sync_report["sources"].items()):
+            print(f"    · {source or '(제목 없음)'}: +{summary['create']} ~{summary['update']} -{summary['delete']}")
+        seconds = sync_report["seconds"]
+        print(f"  조회 {seconds['read']:.2f}s / 비교 {seconds['plan']:.2f}s / 반영 {seconds['apply']:.2f}s")
         
-        # 각 Atomic Note 처리
-        for i, note in enumerate(atomic_notes, 1):
-            note_id = note.get("id", f"note_{i}")
-            note_title = note.get("title", "Untitled")
-            
-            print(f"\n  [{i}/{len(atomic_notes)}] {note_title}")
-            
-            # 1. Atomic Note 노드 생성
-            note_data = {
-                "id": note_id,
-                "title": note_title,
-                "content": note.get("content", ""),
-                "detailed_content": note.get("detailed_content", ""),
-                "domain": note.get("domain", "general"),
-                "confidence": note.get("confidence", "medium"),
-                "source_note": source_note.get("title", "")
-            }
-            
-            graph.create_atomic_note_node(note_data)
-            total_notes += 1
-            
-            # 2. Entity 노드 생성 및 연결
-            # Enhanced 엔티티 우선 사용
-            entities = note.get("entities_enhanced", note.get("extracted_entities", []))
-            
-            created_entities = set()
-            for entity in entities:
-                if isinstance(entity, dict):
-                    entity_name = entity.get("text", "")
-                    entity_data = {
-                        "label": entity.get("label", "CONCEPT"),
-                        "domain": note.get("domain", "general"),
-                        "confidence": entity.get("confidence", 1.0)
-                    }
-                else:
-                    entity_name = str(entity)
-                    entity_data = {"domain": note.get("domain", "general")}
-                
-                if entity_name and entity_name not in created_entities:
-                    graph.create_entity_node(entity_name, entity_data)
-                    graph.link_note_to_entity(note_id, entity_name)
-                    created_entities.add(entity_name)
-                    total_entities += 1
-            
-            # 3. Entity 간 관계 생성
-            # Enhanced 관계 우선 사용
-            relationships = note.get("relationships_enhanced", note.get("relationships", []))
-            
-            for rel in relationships:
-                from_entity = rel.get("from", "")
-                to_entity = rel.get("to", "")
-                rel_type = rel.get("type", "relates_to")
-                confidence = rel.get("confidence", 0.7)
-                
-                if from_entity and to_entity:
-                    # 엔티티가 생성되어 있는지 확인
-                    if from_entity in created_entities or to_entity in created_entities:
-                        # 필요시 엔티티 생성
-                        if from_entity not in created_entities:
-                            graph.create_entity_node(from_entity)
-                            created_entities.add(from_entity)
-                        if to_entity not in created_entities:
-                            graph.create_entity_node(to_entity)
-                            created_entities.add(to_entity)
-                        
-                        graph.create_relationship(
-                            from_entity, rel_type, to_entity, 
-                            confidence, 
-                            {"method": rel.get("method", "extracted")}
-                        )
-                        total_relationships += 1
-            
-            print(f"    ✅ 노트: 1개, 엔티티: {len(created_entities)}개, 관계: {len(relationships)}개")
-        
-        print(f"\n  💾 파일 완료: {len(atomic_notes)}개 노트 처리")
+        stats = graph.get_graph_stats()
+        print(f"\n📊 총 노드: {stats['total_nodes']}개, 총 관계: {stats['total_relationships']}개")
+        print("\n✅ Stage 3 동기화 완료!")
+        graph.close()
+        exit(0)
+    
+    # 이전 import와 결과가 같은 원본 노트는 노트/MENTIONS를 건너뜀 (원본 경로 인덱스 조회만)
+    unchanged = graph.unchanged_sources(rows["sources"])
+    if unchanged:
+        rows = skip_sources(rows, unchanged)
+        print(f"  ♻️  변경 없는 원본 {len(unchanged)}개 스킵 → 노트 {len(rows['notes'])}개, "
+              f"MENTIONS {len(rows['mentions'])}개")
+    
+    start = time.perf_counter()
+    report = import_rows(graph, rows, workers=IMPORT_WORKERS)
+    elapsed = time.perf_counter() - start
+    for phase, phase_report in report.items():
+        print(f"  - {phase:<14s} {phase_report['rows']:8d}행 {phase_report['seconds']:8.2f}s "
+              f"{phase_report['rows_per_sec']:8d} rows/sec")
+    total_rows = sum(phase_report["rows"] for phase_report in report.values())
+    print(f"  ✅ {total_rows}행 / {elapsed:.2f}s ({total_rows / max(elapsed, 1e-9):.0f} rows/sec)")
     
     # 최종 통계
     print("\n" + "=" * 60)
     print("📊 Import 통계")
     print("=" * 60)
     print(f"처리된 파일: {len(json_files)}개")
-    print(f"생성된 Atomic Notes: {total_notes}개")
-    print(f"생성된 Entities: {total_entities}개")
-    print(f"생성된 Relationships: {total_relationships}개")
+    print(f"생성된 Atomic Notes: {report['notes']['rows']}개")
+    print(f"생성된 Entities: {report['entities']['rows']}개")
+    print(f"제외된 저점수 Entities: {rows['filtered_entities']}개")
+    print(f"생성된 Relationships: {report['relationships']['rows']}개")
     
     # Graph DB 통계
     print("\n📊 Graph DB 통계:")